@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import timeit
+from typing import Callable, Sequence
+
+import jack_server
+import jack_server._lib
+from jack_server._parameter import get_params_from_jslist
+
+_benchmarks: dict[str, Callable[[str], Callable[[], object]]] = {}
+
+
+def benchmark(func: Callable[[str], Callable[[], object]]):
+    _benchmarks[func.__name__] = func
+    return func
+
+
+def _run_python(code: str) -> Callable[[], object]:
+    cmd = [sys.executable, "-c", code]
+    return lambda: subprocess.run(cmd, check=True)
+
+
+@benchmark
+def interpreter_startup(driver: str):
+    return _run_python("pass")
+
+
+@benchmark
+def import_jack_server(driver: str):
+    return _run_python("import jack_server")
+
+
+@benchmark
+def server_init(driver: str):
+    return lambda: jack_server.Server(driver=driver)
+
+
+@benchmark
+def get_driver_by_name(driver: str):
+    server = jack_server.Server(driver=driver)
+    return lambda: server._get_driver_by_name(driver)
+
+
+@benchmark
+def parameter_get(driver: str):
+    # Parameter points into server, which has to outlive the loop
+    server = jack_server.Server(driver=driver)
+    return lambda: server.driver.params["period"].value
+
+
+@benchmark
+def parameter_set(driver: str):
+    server = jack_server.Server(driver=driver)
+    return lambda: setattr(server.driver.params["period"], "value", 512)
+
+
+@benchmark
+def driver_values(driver: str):
+    server = jack_server.Server(driver=driver)
+    return lambda: [p.value for p in server.driver.params.values()]
+
+
+@benchmark
+def params_from_jslist(driver: str):
+    server = jack_server.Server(driver=driver)
+    return lambda: get_params_from_jslist(
+        jack_server._lib.jackctl_server_get_parameters(server._ptr)
+    )
+
+
+@benchmark
+def snapshot(driver: str):
+    server = jack_server.Server(driver=driver)
+    return server.snapshot
+
+
+@benchmark
+def start_stop(driver: str):
+    server = jack_server.Server(driver=driver)
+
+    def func():
+        server.start()
+        server.stop()
+
+    return func
+
+
+def run(
+    names: Sequence[str], driver: str, repeat: int, min_time: float
+) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+
+    for name in names:
+        timer = timeit.Timer(_benchmarks[name](driver))
+        number, total = timer.autorange()
+        while total < min_time:
+            number *= 2
+            total = timer.timeit(number)
+        times = [t / number for t in timer.repeat(repeat, number)]
+        results[name] = {"min": min(times), "mean": sum(times) / len(times)}
+        print(f"{name:<25} {results[name]['min'] * 1e6:12.2f} us", file=sys.stderr)
+
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    regressions: list[str] = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["min"] / baseline[name]["min"]
+        print(f"{name:<25} {ratio:8.2f}x", file=sys.stderr)
+        if ratio > 1 + threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark control-plane hot paths.",
+        epilog=f"Benchmarks: {', '.join(_benchmarks)}",
+    )
+    parser.add_argument("names", nargs="*", help="benchmarks to run, all by default")
+    parser.add_argument("-d", "--driver", default="dummy")
+    parser.add_argument(
+        "--backend", choices=jack_server._lib._backends, help="library backend"
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--compare", help="baseline JSON to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 is 20%%"
+    )
+    args = parser.parse_args(argv)
+    if unknown := set(args.names) - set(_benchmarks):
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    if args.backend:
+        jack_server.set_backend(args.backend)
+    jack_server.set_info_function(None)
+    jack_server.set_error_function(None)
+    results = run(
+        args.names or list(_benchmarks), args.driver, args.repeat, args.min_time
+    )
+    output = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "driver": args.driver,
+        "backend": jack_server.get_backend(),
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+    else:
+        print(json.dumps(output, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if regressions := compare(results, baseline, args.threshold):
+            print(f"Regressions: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
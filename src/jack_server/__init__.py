@@ -1,10 +1,95 @@
+from typing import TYPE_CHECKING, Any
+
+from jack_server._config import ServerConfig as ServerConfig
+from jack_server._discovery import list_running as list_running
 from jack_server._driver import Driver as Driver
 from jack_server._driver import SampleRate as SampleRate
+from jack_server._internal import InternalClient as InternalClient
+from jack_server._lib import get_backend as get_backend
+from jack_server._lib import set_backend as set_backend
+from jack_server._lib import set_library_path as set_library_path
+from jack_server._net import NetState as NetState
+from jack_server._net import NetStatus as NetStatus
+from jack_server._output import OutputListener as OutputListener
+from jack_server._output import add_output_listener as add_output_listener
+from jack_server._output import disable_queued_logging as disable_queued_logging
+from jack_server._output import enable_queued_logging as enable_queued_logging
+from jack_server._output import remove_output_listener as remove_output_listener
 from jack_server._output import set_error_function as set_error_function
 from jack_server._output import set_info_function as set_info_function
 from jack_server._parameter import Parameter as Parameter
+from jack_server._parameter import ParameterValueError as ParameterValueError
+from jack_server._realtime import RealtimeReport as RealtimeReport
+from jack_server._realtime import RealtimeThread as RealtimeThread
 from jack_server._server import DriverNotFoundError as DriverNotFoundError
+from jack_server._server import DriverNotSwitchedError as DriverNotSwitchedError
+from jack_server._server import (
+    InternalClientNotFoundError as InternalClientNotFoundError,
+)
+from jack_server._server import (
+    InternalClientNotLoadedError as InternalClientNotLoadedError,
+)
+from jack_server._server import (
+    InternalClientNotUnloadedError as InternalClientNotUnloadedError,
+)
 from jack_server._server import JackServerError as JackServerError
 from jack_server._server import Server as Server
+from jack_server._server import ServerAlreadyRunningError as ServerAlreadyRunningError
+from jack_server._server import ServerClosedError as ServerClosedError
+from jack_server._server import ServerNotCreatedError as ServerNotCreatedError
 from jack_server._server import ServerNotOpenedError as ServerNotOpenedError
 from jack_server._server import ServerNotStartedError as ServerNotStartedError
+from jack_server._server import ServerState as ServerState
+from jack_server._server import ServerStateError as ServerStateError
+from jack_server._server import SlaveNotAddedError as SlaveNotAddedError
+from jack_server._server import SlaveNotRemovedError as SlaveNotRemovedError
+from jack_server._stats import PhaseHook as PhaseHook
+from jack_server._stats import ServerStats as ServerStats
+from jack_server._stats import TimingHook as TimingHook
+from jack_server._stats import add_phase_hook as add_phase_hook
+from jack_server._stats import add_timing_hook as add_timing_hook
+from jack_server._stats import remove_phase_hook as remove_phase_hook
+from jack_server._stats import remove_timing_hook as remove_timing_hook
+from jack_server._supervisor import Probe as Probe
+from jack_server._supervisor import Supervisor as Supervisor
+
+if TYPE_CHECKING:
+    from jack_server._adaptive import BufferSizeController as BufferSizeController
+    from jack_server._adaptive import BufferSizeDecision as BufferSizeDecision
+    from jack_server._async import AsyncServer as AsyncServer
+    from jack_server._isolated import IsolatedServer as IsolatedServer
+    from jack_server._isolated import ServerProcessError as ServerProcessError
+    from jack_server._monitor import BufferSizeNotSetError as BufferSizeNotSetError
+    from jack_server._monitor import Monitor as Monitor
+    from jack_server._monitor import MonitorNotOpenedError as MonitorNotOpenedError
+    from jack_server._monitor import MonitorSample as MonitorSample
+    from jack_server._pool import PoolClosedError as PoolClosedError
+    from jack_server._pool import ServerPool as ServerPool
+    from jack_server._pool import SessionNotFoundError as SessionNotFoundError
+
+# Modules importing asyncio, http.server or multiprocessing are loaded on first
+# access, so that plain Server users don't pay for them at import time.
+_lazy = {
+    "BufferSizeController": "jack_server._adaptive",
+    "BufferSizeDecision": "jack_server._adaptive",
+    "AsyncServer": "jack_server._async",
+    "IsolatedServer": "jack_server._isolated",
+    "ServerProcessError": "jack_server._isolated",
+    "BufferSizeNotSetError": "jack_server._monitor",
+    "Monitor": "jack_server._monitor",
+    "MonitorNotOpenedError": "jack_server._monitor",
+    "MonitorSample": "jack_server._monitor",
+    "PoolClosedError": "jack_server._pool",
+    "ServerPool": "jack_server._pool",
+    "SessionNotFoundError": "jack_server._pool",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _lazy:
+        from importlib import import_module
+
+        value = getattr(import_module(_lazy[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+from typing import Callable, Sequence
+
+import jack_server._lib as lib
+from jack_server._config import ServerConfig, find_driver, split_argv
+from jack_server._parameter import ParameterValueError
+from jack_server._server import JackServerError, Server
+
+_usage = """\
+usage: python -m jack_server [--ready-file PATH] [--config PATH]
+                             [jackd options] -d DRIVER [driver options]
+
+Run JACK server until SIGINT or SIGTERM, like jackd.
+
+options:
+  --ready-file PATH  create file when server is started, remove on exit
+  --config PATH      load ServerConfig from TOML or JSON file, command line
+                     options override it
+
+Readiness is also reported to systemd when NOTIFY_SOCKET is set."""
+
+
+def _pop_option(argv: list[str], name: str) -> str | None:
+    # Own options go before driver options
+    driver = find_driver(argv)
+    try:
+        idx = argv.index(name, 0, len(argv) if driver is None else driver)
+    except ValueError:
+        return None
+    if idx + 1 >= len(argv):
+        raise ParameterValueError(f"{name} requires a value")
+    value = argv[idx + 1]
+    del argv[idx : idx + 2]
+    return value
+
+
+def notify(state: str) -> None:
+    # sd_notify() protocol: datagram to socket from NOTIFY_SOCKET
+    address = os.environ.get("NOTIFY_SOCKET")
+    if not address:
+        return
+    if address.startswith("@"):
+        address = "\0" + address[1:]
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        sock.connect(address)
+        sock.sendall(state.encode())
+
+
+def setup_signals() -> Callable[[], None]:
+    # Has to be called before any thread is started, so threads of JACK
+    # inherit the mask and signals are delivered to the waiting thread only.
+    try:
+        sigmask = lib.jackctl_setup_signals(0)
+        wait_signals = lib.jackctl_wait_signals
+    except AttributeError:  # pragma: no cover
+        # Library without jackctl_sigmask_t API
+        signals = {signal.SIGINT, signal.SIGTERM}
+        signal.pthread_sigmask(signal.SIG_BLOCK, signals)
+
+        def wait() -> None:
+            signal.sigwait(signals)
+
+        return wait
+
+    return lambda: wait_signals(sigmask)
+
+
+def _merge(base: ServerConfig | None, config: ServerConfig) -> ServerConfig:
+    if base is None:
+        return config
+    driver_params = base.driver_params if base.driver == config.driver else {}
+    return ServerConfig(
+        config.driver,
+        {**base.server, **config.server},
+        {**driver_params, **config.driver_params},
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(_usage)
+        return 0 if argv else 2
+
+    try:
+        ready_file = _pop_option(argv, "--ready-file")
+        config_path = _pop_option(argv, "--config")
+        base = ServerConfig.load(config_path) if config_path else None
+        if base and find_driver(argv) is None:
+            argv.extend(("-d", base.driver))
+        _, driver, _ = split_argv(argv)
+    except (ParameterValueError, OSError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    try:
+        wait = setup_signals()
+    except (RuntimeError, OSError) as exc:
+        # jackserver library couldn't be found or loaded
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    try:
+        server = Server(driver=driver)
+        config = _merge(base, ServerConfig.from_argv(argv, server=server))
+        config.apply(server)
+    except ParameterValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    except JackServerError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    try:
+        server.start()
+        if ready_file:
+            Path(ready_file).write_text(f"{os.getpid()}\n")
+        notify(f"READY=1\nMAINPID={os.getpid()}")
+        wait()
+        notify("STOPPING=1")
+    except JackServerError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        server.stop()
+        if ready_file:
+            Path(ready_file).unlink(missing_ok=True)
+
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from typing import NamedTuple
+
+from jack_server._monitor import Monitor, MonitorSample
+from jack_server._server import JackServerError
+
+logger = logging.getLogger("jack_server")
+
+
+class BufferSizeDecision(NamedTuple):
+    time: float
+    old: int
+    new: int
+    reason: str
+
+
+class BufferSizeController:
+    monitor: Monitor
+    min_size: int
+    max_size: int
+    raise_load: float
+    lower_load: float
+    lower_after: int
+    cooldown: int
+    decisions: deque[BufferSizeDecision]
+    _xruns: int | None
+    _calm: int
+    _skip: int
+
+    def __init__(
+        self,
+        monitor: Monitor,
+        *,
+        min_size: int = 64,
+        max_size: int = 2048,
+        raise_load: float = 80,
+        lower_load: float = 30,
+        lower_after: int = 30,
+        cooldown: int = 3,
+        maxlen: int = 100,
+    ) -> None:
+        if not 0 < min_size <= max_size:
+            raise ValueError(f"Invalid bounds: [{min_size}, {max_size}]")
+        if not lower_load < raise_load:
+            raise ValueError("lower_load should be less than raise_load")
+
+        self.monitor = monitor
+        self.min_size = min_size
+        self.max_size = max_size
+        self.raise_load = raise_load
+        self.lower_load = lower_load
+        self.lower_after = lower_after
+        self.cooldown = cooldown
+        self.decisions = deque(maxlen=maxlen)
+        self._xruns = None
+        self._calm = 0
+        self._skip = 0
+
+    def decide(self, sample: MonitorSample) -> tuple[int, str] | None:
+        # -> (new size, reason)
+        xruns = sample.xruns - self._xruns if self._xruns is not None else 0
+        self._xruns = sample.xruns
+        size = sample.buffer_size
+
+        # Give load readings time to settle after a change
+        if self._skip:
+            self._skip -= 1
+            return None
+
+        if xruns or sample.cpu_load >= self.raise_load:
+            self._calm = 0
+            if size * 2 > self.max_size:
+                return None
+            reason = f"{xruns} xruns" if xruns else f"load {sample.cpu_load:.1f}%"
+            return size * 2, reason
+
+        # Hysteresis: load has to stay low for a while
+        if sample.cpu_load >= self.lower_load:
+            self._calm = 0
+            return None
+        self._calm += 1
+        if self._calm < self.lower_after or size // 2 < self.min_size:
+            return None
+        self._calm = 0
+        return (
+            size // 2,
+            f"load below {self.lower_load:g}% for {self.lower_after} samples",
+        )
+
+    def _on_sample(self, sample: MonitorSample) -> None:
+        decision = self.decide(sample)
+        if decision is None:
+            return
+
+        new, reason = decision
+        old = sample.buffer_size
+        try:
+            self.monitor.set_buffer_size(new)
+        except JackServerError as exc:
+            logger.warning(
+                "Buffer size %s -> %s failed (%s): %s", old, new, reason, exc
+            )
+            return
+
+        self._skip = self.cooldown
+        self.decisions.append(BufferSizeDecision(time.time(), old, new, reason))
+        logger.info("Buffer size %s -> %s: %s", old, new, reason)
+
+    def start(self) -> None:
+        self.monitor.add_listener(self._on_sample)
+
+    def stop(self) -> None:
+        self.monitor.remove_listener(self._on_sample)
+
+    def __enter__(self) -> BufferSizeController:
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        return (
+            f"<jack_server.BufferSizeController bounds=[{self.min_size}, "
+            + f"{self.max_size}] decisions={len(self.decisions)}>"
+        )
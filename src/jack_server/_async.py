@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from jack_server._server import Server
+
+_T = TypeVar("_T")
+
+
+class AsyncServer:
+    server: Server
+    _executor: ThreadPoolExecutor
+
+    def __init__(self, server: Server) -> None:
+        self.server = server
+        # Single worker thread serializes all state transitions
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="jack_server"
+        )
+
+    async def _run(self, func: Callable[[], _T]) -> _T:
+        future = asyncio.get_running_loop().run_in_executor(self._executor, func)
+        # Call can't be interrupted once it is in JACK. If caller is cancelled,
+        # let it finish in background so server state stays consistent.
+        return await asyncio.shield(future)
+
+    async def start(self) -> None:
+        await self._run(self.server.start)
+
+    async def stop(self) -> None:
+        await self._run(self.server.stop)
+
+    async def aclose(self) -> None:
+        try:
+            await self.stop()
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> AsyncServer:
+        try:
+            await self.start()
+        except BaseException:
+            await self.aclose()
+            raise
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    def __repr__(self) -> str:
+        return f"<jack_server.AsyncServer server={self.server!r}>"
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from ctypes import POINTER, _Pointer, c_char_p, c_void_p, cast
+from importlib import import_module
+from typing import Any, List
+
+import jack_server._lib as lib
+
+# Compiled by jack_server._cffi_build, ImportError if it wasn't.
+# Objects of cffi are untyped, handles are opaque for callers anyway.
+_module = import_module("jack_server._jack_cffi")
+ffi: Any = _module.ffi
+_clib: Any = _module.lib
+
+_Handle = Any
+
+# Functions compiled in API mode are called directly: handles are cffi
+# pointers that callers only pass back, numbers and booleans are Python
+# objects already. Wrappers below convert values that callers expect as
+# ctypes objects or bytes.
+_direct = (
+    "jackctl_parameter_get_type",
+    "jackctl_parameter_get_id",
+    "jackctl_parameter_has_range_constraint",
+    "jackctl_parameter_has_enum_constraint",
+    "jackctl_parameter_get_enum_constraints_count",
+    "jackctl_parameter_constraint_is_strict",
+    "jackctl_server_open",
+    "jackctl_server_start",
+    "jackctl_server_close",
+    "jackctl_server_stop",
+    "jackctl_server_destroy",
+    "jackctl_server_switch_master",
+    "jackctl_server_add_slave",
+    "jackctl_server_remove_slave",
+    "jackctl_server_load_internal",
+    "jackctl_server_unload_internal",
+    "jackctl_setup_signals",
+    "jackctl_wait_signals",
+    "jack_client_close",
+    "jack_activate",
+    "jack_cpu_load",
+    "jack_get_buffer_size",
+    "jack_get_sample_rate",
+    "jack_set_buffer_size",
+    "jack_get_xrun_delayed_usecs",
+    "jack_port_by_name",
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _direct:
+        return getattr(_clib, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _address(obj: Any) -> int | None:
+    # Address of ctypes function pointer
+    return cast(obj, c_void_p).value
+
+
+def _string(ptr: Any) -> bytes | None:
+    return ffi.string(ptr) if ptr else None
+
+
+def _items(jslist: Any) -> List[_Handle]:
+    # jack_server._jslist.iterate_jslist() accepts list of items as is
+    items: List[_Handle] = []
+    while jslist:
+        items.append(jslist.data)
+        jslist = jslist.next
+    return items
+
+
+def _value(union: Any) -> lib.jackctl_parameter_value:
+    # Both unions have the same layout
+    buffer = ffi.buffer(ffi.addressof(union))
+    return lib.jackctl_parameter_value.from_buffer_copy(buffer)
+
+
+def _value_p(ptr: _Pointer[lib.jackctl_parameter_value]) -> Any:
+    # Points to memory of the ctypes union, no address round trip through int
+    return ffi.from_buffer("union jackctl_parameter_value *", ptr.contents)
+
+
+def jackctl_parameter_get_name(param: _Handle) -> bytes | None:
+    return _string(_clib.jackctl_parameter_get_name(param))
+
+
+def jackctl_parameter_set_value(
+    param: _Handle, value: _Pointer[lib.jackctl_parameter_value]
+) -> bool:
+    return _clib.jackctl_parameter_set_value(param, _value_p(value))
+
+
+def jackctl_parameter_get_value(param: _Handle) -> lib.jackctl_parameter_value:
+    return _value(_clib.jackctl_parameter_get_value(param))
+
+
+def jackctl_parameter_get_range_constraint(
+    param: _Handle,
+    min: _Pointer[lib.jackctl_parameter_value],
+    max: _Pointer[lib.jackctl_parameter_value],
+) -> None:
+    _clib.jackctl_parameter_get_range_constraint(param, _value_p(min), _value_p(max))
+
+
+def jackctl_parameter_get_enum_constraint_value(
+    param: _Handle, idx: int
+) -> lib.jackctl_parameter_value:
+    return _value(_clib.jackctl_parameter_get_enum_constraint_value(param, idx))
+
+
+def jackctl_parameter_get_enum_constraint_description(
+    param: _Handle, idx: int
+) -> bytes | None:
+    return _string(_clib.jackctl_parameter_get_enum_constraint_description(param, idx))
+
+
+def jackctl_driver_get_parameters(driver: _Handle) -> List[_Handle]:
+    return _items(_clib.jackctl_driver_get_parameters(driver))
+
+
+def jackctl_driver_get_name(driver: _Handle) -> bytes | None:
+    return _string(_clib.jackctl_driver_get_name(driver))
+
+
+def jackctl_internal_get_parameters(internal: _Handle) -> List[_Handle]:
+    return _items(_clib.jackctl_internal_get_parameters(internal))
+
+
+def jackctl_internal_get_name(internal: _Handle) -> bytes | None:
+    return _string(_clib.jackctl_internal_get_name(internal))
+
+
+def jackctl_server_get_parameters(server: _Handle) -> List[_Handle]:
+    return _items(_clib.jackctl_server_get_parameters(server))
+
+
+def jackctl_server_get_drivers_list(server: _Handle) -> List[_Handle]:
+    return _items(_clib.jackctl_server_get_drivers_list(server))
+
+
+def jackctl_server_get_internals_list(server: _Handle) -> List[_Handle]:
+    return _items(_clib.jackctl_server_get_internals_list(server))
+
+
+# Callbacks stay ctypes function pointers: their lifetime is already managed
+# by callers, C code receives address of the same thunk.
+
+
+def jackctl_server_create2(
+    on_device_acquire: Any, on_device_release: Any, on_device_reservation_loop: Any
+) -> Any:
+    return _clib.jackctl_server_create2(
+        ffi.cast("bool (*)(const char *)", _address(on_device_acquire)),
+        ffi.cast("void (*)(const char *)", _address(on_device_release)),
+        ffi.cast("void (*)(void)", _address(on_device_reservation_loop)),
+    )
+
+
+def jack_set_error_function(func: Any) -> None:
+    _clib.jack_set_error_function(ffi.cast("void (*)(const char *)", _address(func)))
+
+
+def jack_set_info_function(func: Any) -> None:
+    _clib.jack_set_info_function(ffi.cast("void (*)(const char *)", _address(func)))
+
+
+def jack_set_xrun_callback(client: _Handle, callback: Any, arg: int | None) -> int:
+    return _clib.jack_set_xrun_callback(
+        client, ffi.cast("JackXRunCallback", _address(callback)), ffi.NULL
+    )
+
+
+def jack_client_open(
+    name: bytes, options: int, status: Any, server_name: c_char_p
+) -> Any:
+    c_status = ffi.new("jack_status_t *")
+    # Variadic arguments have to be cdata
+    c_server_name = ffi.new("char[]", server_name.value)
+    client = _clib.jack_client_open(name, options, c_status, c_server_name)
+    # byref() object
+    status._obj.value = c_status[0]
+    return client
+
+
+def jack_get_ports(
+    client: _Handle, port_name: bytes | None, type_name: bytes | None, flags: int
+) -> _Pointer[c_char_p]:
+    ports = _clib.jack_get_ports(
+        client, port_name or ffi.NULL, type_name or ffi.NULL, flags
+    )
+    if not ports:
+        return POINTER(c_char_p)()
+    return cast(int(ffi.cast("uintptr_t", ports)), POINTER(c_char_p))
+
+
+def jack_free(ptr: c_void_p) -> None:
+    _clib.jack_free(ffi.cast("void *", ptr.value or 0))
+
+
+def jack_port_get_latency_range(port: _Handle, mode: int, range: Any) -> None:
+    c_range = ffi.new("jack_latency_range_t *")
+    _clib.jack_port_get_latency_range(port, mode, c_range)
+    # byref() object
+    range._obj.min, range._obj.max = c_range.min, c_range.max
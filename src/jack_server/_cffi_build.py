@@ -0,0 +1,141 @@
+# Builds compiled cffi backend: python -m jack_server._cffi_build
+# Requires cffi, C compiler and JACK2 development headers.
+from __future__ import annotations
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from cffi import FFI
+
+# Only functions from jack_server._lib._functions, signatures as in headers
+_cdef = """
+typedef struct _JSList JSList;
+struct _JSList {
+    void *data;
+    JSList *next;
+};
+
+typedef struct jackctl_server jackctl_server_t;
+typedef struct jackctl_driver jackctl_driver_t;
+typedef struct jackctl_internal jackctl_internal_t;
+typedef struct jackctl_parameter jackctl_parameter_t;
+typedef struct jackctl_sigmask jackctl_sigmask_t;
+typedef enum {
+    JackParamInt,
+    JackParamUInt,
+    JackParamChar,
+    JackParamString,
+    JackParamBool,
+    ...
+} jackctl_param_type_t;
+
+union jackctl_parameter_value {
+    uint32_t ui;
+    int32_t i;
+    char c;
+    char str[128];
+    bool b;
+};
+
+jackctl_param_type_t jackctl_parameter_get_type(jackctl_parameter_t *);
+const char * jackctl_parameter_get_name(jackctl_parameter_t *);
+char jackctl_parameter_get_id(jackctl_parameter_t *);
+bool jackctl_parameter_set_value(
+    jackctl_parameter_t *, const union jackctl_parameter_value *);
+union jackctl_parameter_value jackctl_parameter_get_value(jackctl_parameter_t *);
+bool jackctl_parameter_has_range_constraint(jackctl_parameter_t *);
+void jackctl_parameter_get_range_constraint(
+    jackctl_parameter_t *,
+    union jackctl_parameter_value *,
+    union jackctl_parameter_value *);
+bool jackctl_parameter_has_enum_constraint(jackctl_parameter_t *);
+uint32_t jackctl_parameter_get_enum_constraints_count(jackctl_parameter_t *);
+union jackctl_parameter_value jackctl_parameter_get_enum_constraint_value(
+    jackctl_parameter_t *, uint32_t);
+const char * jackctl_parameter_get_enum_constraint_description(
+    jackctl_parameter_t *, uint32_t);
+bool jackctl_parameter_constraint_is_strict(jackctl_parameter_t *);
+
+const JSList * jackctl_driver_get_parameters(jackctl_driver_t *);
+const char * jackctl_driver_get_name(jackctl_driver_t *);
+const JSList * jackctl_internal_get_parameters(jackctl_internal_t *);
+const char * jackctl_internal_get_name(jackctl_internal_t *);
+
+jackctl_server_t * jackctl_server_create2(
+    bool (*)(const char *), void (*)(const char *), void (*)(void));
+bool jackctl_server_open(jackctl_server_t *, jackctl_driver_t *);
+bool jackctl_server_start(jackctl_server_t *);
+bool jackctl_server_close(jackctl_server_t *);
+bool jackctl_server_stop(jackctl_server_t *);
+void jackctl_server_destroy(jackctl_server_t *);
+bool jackctl_server_switch_master(jackctl_server_t *, jackctl_driver_t *);
+bool jackctl_server_add_slave(jackctl_server_t *, jackctl_driver_t *);
+bool jackctl_server_remove_slave(jackctl_server_t *, jackctl_driver_t *);
+const JSList * jackctl_server_get_parameters(jackctl_server_t *);
+const JSList * jackctl_server_get_drivers_list(jackctl_server_t *);
+const JSList * jackctl_server_get_internals_list(jackctl_server_t *);
+bool jackctl_server_load_internal(jackctl_server_t *, jackctl_internal_t *);
+bool jackctl_server_unload_internal(jackctl_server_t *, jackctl_internal_t *);
+
+jackctl_sigmask_t * jackctl_setup_signals(unsigned int);
+void jackctl_wait_signals(jackctl_sigmask_t *);
+
+typedef struct _jack_client jack_client_t;
+enum JackOptions { JackNoStartServer, JackServerName, ... };
+typedef enum JackOptions jack_options_t;
+enum JackStatus { JackFailure, ... };
+typedef enum JackStatus jack_status_t;
+typedef uint32_t jack_nframes_t;
+typedef int (*JackXRunCallback)(void *);
+
+jack_client_t * jack_client_open(const char *, jack_options_t, jack_status_t *, ...);
+int jack_client_close(jack_client_t *);
+int jack_activate(jack_client_t *);
+float jack_cpu_load(jack_client_t *);
+jack_nframes_t jack_get_buffer_size(jack_client_t *);
+jack_nframes_t jack_get_sample_rate(jack_client_t *);
+int jack_set_buffer_size(jack_client_t *, jack_nframes_t);
+int jack_set_xrun_callback(jack_client_t *, JackXRunCallback, void *);
+float jack_get_xrun_delayed_usecs(jack_client_t *);
+const char ** jack_get_ports(
+    jack_client_t *, const char *, const char *, unsigned long);
+void jack_free(void *);
+typedef struct _jack_port jack_port_t;
+typedef struct _jack_latency_range jack_latency_range_t;
+struct _jack_latency_range {
+    jack_nframes_t min;
+    jack_nframes_t max;
+};
+enum JackLatencyCallbackMode { JackCaptureLatency, JackPlaybackLatency };
+jack_port_t * jack_port_by_name(jack_client_t *, const char *);
+void jack_port_get_latency_range(
+    jack_port_t *, enum JackLatencyCallbackMode, jack_latency_range_t *);
+void jack_set_error_function(void (*)(const char *));
+void jack_set_info_function(void (*)(const char *));
+"""
+
+ffibuilder = FFI()
+ffibuilder.cdef(_cdef)
+ffibuilder.set_source(
+    "jack_server._jack_cffi",
+    """
+    #include <jack/control.h>
+    #include <jack/jack.h>
+    """,
+    libraries=["jackserver"],
+)
+
+
+def main() -> None:
+    # C sources and objects stay in temporary directory, only extension is
+    # copied next to this module
+    with tempfile.TemporaryDirectory() as tmpdir:
+        built = ffibuilder.compile(tmpdir=tmpdir, verbose=True)
+        target = Path(__file__).parent / Path(built).name
+        shutil.copy(built, target)
+    print(f"Built {target}")
+
+
+if __name__ == "__main__":
+    main()
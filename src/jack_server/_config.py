@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Collection, Mapping, Sequence, Tuple, Union
+
+from jack_server._parameter import Parameter, ParameterValueError, ValueType
+
+if TYPE_CHECKING:
+    from jack_server._server import Server, Snapshot
+
+ConfigValue = Union[int, str, bool]
+
+# Server options of jackd: long option -> (short option, parameter name).
+# jackd parses them itself, so they don't match parameter ids.
+_jackd_options = {
+    "name": ("n", "name"),
+    "sync": ("S", "sync"),
+    "realtime": ("R", "realtime"),
+    "realtime-priority": ("P", "realtime-priority"),
+    "timeout": ("t", "client-timeout"),
+    "port-max": ("p", "port-max"),
+    "temporary": ("T", "temporary"),
+    "verbose": ("v", "verbose"),
+    "clock-source": ("c", "clock-source"),
+    "autoconnect": ("a", "self-connect-mode"),
+    "replace-registry": ("", "replace-registry"),
+}
+_jackd_params = {param: long for long, (_, param) in _jackd_options.items()}
+_jackd_short = {short: long for long, (short, _) in _jackd_options.items() if short}
+# jackd server options without argument, getopt lets them be grouped like -RS
+_jackd_flags = frozenset("RSTvr")
+
+_number = re.compile(r"-?\d+")
+_bool_values = ("1", "0", "true", "false", "yes", "no", "on", "off")
+
+# Short options of driver parameters by driver name
+_driver_option_ids: dict[str, dict[str, str]] = {}
+
+_Items = Tuple[Tuple[str, ConfigValue], ...]
+_CompiledKey = Tuple[str, _Items, _Items]
+# Configs coerced to parameter types and validated, by config contents
+_compiled: dict[_CompiledKey, Snapshot] = {}
+
+
+def _to_config_value(value: ValueType) -> ConfigValue:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _coerce(param: Parameter, value: ConfigValue) -> ValueType:
+    if param.type in (1, 2):
+        # JackParamInt, JackParamUInt. Letters that jackd itself maps to
+        # numbers, like clock source of "-c s", aren't supported.
+        if isinstance(value, str) and not _number.fullmatch(value):
+            raise ParameterValueError(
+                f"Value {value!r} for parameter {param.name!r} is not a number"
+            )
+        return int(value)
+    if param.type == 5:
+        # JackParamBool
+        if isinstance(value, str):
+            return value.lower() in ("1", "true", "yes", "on")
+        return bool(value)
+    if param.type == 4:
+        # JackParamString
+        return str(value).encode()
+    # JackParamChar
+    return str(value)
+
+
+def _get_driver_option_ids(server: Server | None, driver: str) -> dict[str, str]:
+    if driver not in _driver_option_ids and server is not None:
+        params = server.drivers[driver].params
+        _driver_option_ids[driver] = {p.id: name for name, p in params.items()}
+    return _driver_option_ids.get(driver, {})
+
+
+def _parse_options(
+    args: Sequence[str], flags: Collection[str] = ()
+) -> list[tuple[str, bool, ConfigValue]]:
+    # -> (option, is_long, value)
+    options: list[tuple[str, bool, ConfigValue]] = []
+    idx = 0
+
+    while idx < len(args):
+        arg = args[idx]
+        idx += 1
+        if arg.startswith("--"):
+            option, sep, value = arg[2:].partition("=")
+            is_long = True
+        elif arg.startswith("-") and len(arg) > 1:
+            # Split grouped flags, the last option may take a value
+            pos = 1
+            while pos < len(arg) - 1 and arg[pos] in flags:
+                options.append((arg[pos], False, True))
+                pos += 1
+            option, value = arg[pos], arg[pos + 1 :]
+            sep = "=" if value else ""
+            is_long = False
+        else:
+            raise ParameterValueError(f"Unexpected argument: {arg!r}")
+
+        if not sep:
+            # Option without value is a flag
+            if idx < len(args) and (
+                not args[idx].startswith("-") or _number.fullmatch(args[idx])
+            ):
+                value = args[idx]
+                idx += 1
+            else:
+                options.append((option, is_long, True))
+                continue
+
+        options.append(
+            (option, is_long, int(value) if _number.fullmatch(value) else value)
+        )
+
+    return options
+
+
+def find_driver(argv: Sequence[str]) -> int | None:
+    # Index of the first -d or --driver, driver options may repeat them
+    for idx, arg in enumerate(argv):
+        if arg in ("-d", "--driver") or arg.startswith("--driver="):
+            return idx
+    return None
+
+
+def split_argv(argv: Sequence[str]) -> tuple[list[str], str, list[str]]:
+    # -> (server options, driver, driver options)
+    argv = list(argv)
+    idx = find_driver(argv)
+    if idx is None:
+        raise ParameterValueError("Driver is not specified, pass -d <driver>")
+    if argv[idx].startswith("--driver="):
+        return argv[:idx], argv[idx][len("--driver=") :], argv[idx + 1 :]
+    if idx + 1 >= len(argv):
+        raise ParameterValueError(f"Driver name is missing after {argv[idx]}")
+
+    return argv[:idx], argv[idx + 1], argv[idx + 2 :]
+
+
+class ServerConfig:
+    driver: str
+    server: dict[str, ConfigValue]
+    driver_params: dict[str, ConfigValue]
+
+    def __init__(
+        self,
+        driver: str,
+        server: Mapping[str, ConfigValue] | None = None,
+        driver_params: Mapping[str, ConfigValue] | None = None,
+    ) -> None:
+        self.driver = driver
+        self.server = dict(server or {})
+        self.driver_params = dict(driver_params or {})
+
+    @classmethod
+    def from_server(cls, server: Server) -> ServerConfig:
+        snapshot = server.snapshot()
+        return cls(
+            server.driver.name,
+            {k: _to_config_value(v) for k, v in snapshot["server"].items()},
+            {k: _to_config_value(v) for k, v in snapshot["driver"].items()},
+        )
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> ServerConfig:
+        return cls(data["driver"], data.get("server"), data.get("driver_params"))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "driver": self.driver,
+            "server": dict(self.server),
+            "driver_params": dict(self.driver_params),
+        }
+
+    @classmethod
+    def from_json(cls, text: str) -> ServerConfig:
+        return cls.from_dict(json.loads(text))
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    @classmethod
+    def from_toml(cls, text: str) -> ServerConfig:
+        try:
+            import tomllib  # type: ignore
+        except ImportError:  # pragma: no cover
+            try:
+                import tomli as tomllib  # type: ignore
+            except ImportError:
+                raise ImportError(
+                    "Reading TOML requires Python 3.11 or tomli package"
+                ) from None
+        return cls.from_dict(tomllib.loads(text))  # type: ignore
+
+    def to_toml(self) -> str:
+        lines = [f"driver = {json.dumps(self.driver)}"]
+        for table, values in (
+            ("server", self.server),
+            ("driver_params", self.driver_params),
+        ):
+            lines.extend(("", f"[{table}]"))
+            for name, value in values.items():
+                # JSON literals of strings, numbers and booleans are valid TOML
+                lines.append(f"{name} = {json.dumps(value)}")
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def load(cls, path: str | Path) -> ServerConfig:
+        path = Path(path)
+        text = path.read_text()
+        if path.suffix == ".toml":
+            return cls.from_toml(text)
+        return cls.from_json(text)
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.write_text(self.to_toml() if path.suffix == ".toml" else self.to_json())
+
+    @classmethod
+    def from_argv(
+        cls, argv: Sequence[str], *, server: Server | None = None
+    ) -> ServerConfig:
+        server_args, driver, driver_args = split_argv(argv)
+        config = cls(driver)
+
+        for option, is_long, value in _parse_options(server_args, _jackd_flags):
+            if (option == "r" and not is_long) or option == "no-realtime":
+                config.server["realtime"] = False
+                continue
+            long = option if is_long else _jackd_short.get(option, "")
+            if long not in _jackd_options:
+                raise ParameterValueError(f"Unknown jackd option: {option!r}")
+            config.server[_jackd_options[long][1]] = value
+
+        ids: dict[str, str] | None = None
+        for option, is_long, value in _parse_options(driver_args):
+            if not is_long:
+                if ids is None:
+                    ids = _get_driver_option_ids(server, config.driver)
+                if option not in ids:
+                    raise ParameterValueError(
+                        f"Unknown {config.driver} option: {option!r}"
+                        + ("" if ids else ", pass server to resolve short options")
+                    )
+                option = ids[option]
+                if (
+                    server is not None
+                    and server.drivers[config.driver].params[option].type == 5
+                    and value is not True
+                    and str(value).lower() not in _bool_values
+                ):
+                    # JackParamBool. Driver options take an optional argument,
+                    # so grouped flags like -Hs would be a value of -H.
+                    raise ParameterValueError(
+                        f"Invalid value {value!r} for {config.driver} flag "
+                        + f"{option!r}, grouped short options are not supported"
+                    )
+            config.driver_params[option] = value
+
+        return config
+
+    def to_argv(self) -> list[str]:
+        argv: list[str] = []
+
+        for name, value in self.server.items():
+            if name not in _jackd_params:
+                raise ParameterValueError(f"Parameter has no jackd option: {name!r}")
+            if value is False:
+                # jackd server flags are off by default, except realtime
+                if name == "realtime":
+                    argv.append("--no-realtime")
+                continue
+            argv.extend(_format_option(_jackd_params[name], value))
+
+        argv.extend(("-d", self.driver))
+        for name, value in self.driver_params.items():
+            argv.extend(_format_option(name, value))
+
+        return argv
+
+    def _key(self) -> _CompiledKey:
+        return (
+            self.driver,
+            tuple(sorted(self.server.items())),
+            tuple(sorted(self.driver_params.items())),
+        )
+
+    def compile(self, server: Server) -> Snapshot:
+        key = self._key()
+        if key in _compiled:
+            return _compiled[key]
+
+        compiled: Snapshot = {}
+        for scope, params, values in (
+            ("server", server.params, self.server),
+            ("driver", server.drivers[self.driver].params, self.driver_params),
+        ):
+            compiled[scope] = {}
+            for name, value in values.items():
+                if name not in params:
+                    raise ParameterValueError(f"Unknown {scope} parameter: {name!r}")
+                param = params[name]
+                compiled[scope][name] = native = _coerce(param, value)
+                param.validate(native)
+
+        _compiled[key] = compiled
+        return compiled
+
+    def apply(self, server: Server) -> Snapshot:
+        compiled = self.compile(server)
+        if server.driver.name != self.driver:
+            server.switch_driver(self.driver)
+        return server.apply(compiled)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ServerConfig) and self._key() == other._key()
+
+    def __repr__(self) -> str:
+        return (
+            f"<jack_server.ServerConfig driver={self.driver} "
+            + f"server={self.server!r} driver_params={self.driver_params!r}>"
+        )
+
+
+def _format_option(name: str, value: ConfigValue) -> list[str]:
+    if value is True:
+        return [f"--{name}"]
+    if value is False:
+        # Driver flags take optional argument, it has to be attached
+        return [f"--{name}=false"]
+    return [f"--{name}", str(value)]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+import re
+import socket
+import stat
+
+# Directories where JACK keeps server sockets and POSIX semaphores.
+# Depends on build, /dev/shm is used on Linux by default.
+_dirs = ["/dev/shm", "/tmp"]
+
+
+def _get_uid() -> int:
+    return os.getuid() if hasattr(os, "getuid") else 0
+
+
+def _socket_pattern(uid: int) -> re.Pattern[str]:
+    # Request socket of server is "jack_<name>_<uid>_0"
+    return re.compile(rf"jack_(.+)_{uid}_0")
+
+
+def _has_semaphores(directory: str, name: str, uid: int) -> bool:
+    # Each client of server has "sem.jack_sem.<uid>_<name>_<client>".
+    # Client notification sockets have the same pattern as server sockets,
+    # semaphores tell them apart.
+    prefix = f"sem.jack_sem.{uid}_{name}_"
+    try:
+        return any(entry.startswith(prefix) for entry in os.listdir(directory))
+    except OSError:
+        return False
+
+
+def _is_listening(path: str) -> bool:
+    # Socket file is left behind when server crashes
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return False
+    except OSError:
+        return False
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(0.1)
+        sock.connect(path)
+    except OSError:
+        return False
+    finally:
+        sock.close()
+    return True
+
+
+def list_running() -> list[str]:
+    uid = _get_uid()
+    pattern = _socket_pattern(uid)
+    names: list[str] = []
+
+    for directory in _dirs:
+        try:
+            entries = os.listdir(directory)
+        except OSError:
+            continue
+
+        for entry in entries:
+            match = pattern.fullmatch(entry)
+            if not match:
+                continue
+            name = match.group(1)
+            if (
+                name not in names
+                and _has_semaphores(directory, name, uid)
+                and _is_listening(os.path.join(directory, entry))
+            ):
+                names.append(name)
+
+    return sorted(names)
+
+
+def is_running(name: str) -> bool:
+    uid = _get_uid()
+
+    for directory in _dirs:
+        path = os.path.join(directory, f"jack_{name}_{uid}_0")
+        if _has_semaphores(directory, name, uid) and _is_listening(path):
+            return True
+    return False
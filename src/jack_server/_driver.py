@@ -1,29 +1,43 @@
 from __future__ import annotations
 
 from ctypes import _Pointer
-from typing import Literal, cast
+from typing import ContextManager, Literal, cast
 
 import jack_server._lib as lib
-from jack_server._parameter import Parameter, get_params_from_jslist
+from jack_server._jslist import iterate_jslist
+from jack_server._parameter import Parameter, _no_lock, get_params_from_jslist
 
 SampleRate = Literal[44100, 48000]
 
 
 class Driver:
-    params: dict[str, Parameter]
-    _ptr: _Pointer[lib.jackctl_driver_t]
+    __slots__ = ("_ptr", "_name", "_params", "_lock")
 
-    def __init__(self, ptr: _Pointer[lib.jackctl_driver_t]) -> None:
+    _ptr: _Pointer[lib.jackctl_driver_t]
+    _name: str
+    _params: dict[str, Parameter] | None
+    _lock: ContextManager[object]
+
+    def __init__(
+        self,
+        ptr: _Pointer[lib.jackctl_driver_t],
+        lock: ContextManager[object] = _no_lock,
+    ) -> None:
         self._ptr = ptr
-        self._init_params()
+        self._name = cast(bytes, lib.jackctl_driver_get_name(self._ptr)).decode()
+        self._params = None
+        self._lock = lock
 
-    def _init_params(self) -> None:
-        params_jslist = lib.jackctl_driver_get_parameters(self._ptr)
-        self.params = get_params_from_jslist(params_jslist)
+    @property
+    def params(self) -> dict[str, Parameter]:
+        if self._params is None:
+            params_jslist = lib.jackctl_driver_get_parameters(self._ptr)
+            self._params = get_params_from_jslist(params_jslist, self._lock)
+        return self._params
 
     @property
     def name(self) -> str:
-        return cast(bytes, lib.jackctl_driver_get_name(self._ptr)).decode()
+        return self._name
 
     @property
     def device(self) -> str:  # pragma: no cover
@@ -61,3 +75,15 @@ class Driver:
 
     def __repr__(self) -> str:
         return f"<jack_server.Driver name={self.name}>"
+
+
+def get_drivers_from_jslist(
+    jslist: _Pointer[lib.JSList], lock: ContextManager[object] = _no_lock
+) -> dict[str, Driver]:
+    drivers: dict[str, Driver] = {}
+
+    for ptr in iterate_jslist(jslist, lib.jackctl_driver_t_p):
+        driver = Driver(ptr, lock)
+        drivers[driver.name] = driver
+
+    return drivers
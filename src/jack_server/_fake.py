@@ -0,0 +1,622 @@
+from __future__ import annotations
+
+import itertools
+import os
+import signal
+import threading
+import time
+from ctypes import POINTER, _Pointer, c_char_p, c_void_p, cast, pointer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import jack_server._lib as lib
+from jack_server._parameter import ValueType, _value_fields
+
+# Pure-Python implementation of functions from jack_server._lib.
+#
+# Handles passed to and from the library are pointers to opaque integer
+# addresses that are never dereferenced, JSList nodes are real ctypes memory.
+
+_ParamSpec = Tuple[str, str, int, ValueType, Optional[Tuple[ValueType, ValueType]]]
+
+# name, id, type, default, range
+_server_params: list[_ParamSpec] = [
+    ("name", "n", 4, os.environ.get("JACK_DEFAULT_SERVER", "default").encode(), None),
+    ("sync", "S", 5, False, None),
+    ("temporary", "T", 5, False, None),
+    ("verbose", "v", 5, False, None),
+    ("client-timeout", "t", 1, 500, None),
+    ("clock-source", "c", 2, 0, None),
+    ("port-max", "p", 2, 2048, None),
+    ("replace-registry", "r", 5, False, None),
+    ("realtime", "R", 5, True, None),
+    ("realtime-priority", "P", 1, 10, None),
+    ("self-connect-mode", "a", 3, b" ", None),
+]
+_drivers: dict[str, list[_ParamSpec]] = {
+    "dummy": [
+        ("capture", "C", 2, 2, None),
+        ("playback", "P", 2, 2, None),
+        ("rate", "r", 2, 48000, None),
+        ("monitor", "m", 5, False, None),
+        ("period", "p", 2, 1024, None),
+        ("wait", "w", 2, 21333, None),
+    ],
+    "alsa": [
+        ("device", "d", 4, b"hw:0", None),
+        ("rate", "r", 2, 48000, None),
+        ("period", "p", 2, 1024, None),
+        ("nperiods", "n", 2, 2, (2, 32)),
+        ("hwmon", "H", 5, False, None),
+        ("duplex", "D", 5, True, None),
+        ("inchannels", "i", 2, 0, None),
+        ("outchannels", "o", 2, 0, None),
+    ],
+    "net": [
+        ("multicast-ip", "a", 4, b"225.3.19.154", None),
+        ("udp-net-port", "p", 1, 19000, None),
+        ("mtu", "M", 1, 1500, None),
+        ("input-ports", "C", 1, 2, None),
+        ("output-ports", "P", 1, 2, None),
+        ("client-name", "n", 4, b"fake", None),
+        ("latency", "l", 2, 5, (0, 10)),
+    ],
+    "loopback": [("channels", "c", 1, 8, None)],
+}
+_internals: dict[str, list[_ParamSpec]] = {
+    "netmanager": [
+        ("multicast-ip", "a", 4, b"225.3.19.154", None),
+        ("udp-net-port", "p", 1, 19000, None),
+        ("auto-connect", "c", 5, False, None),
+        ("auto-save", "s", 5, False, None),
+    ],
+    "profiler": [("cpu-load", "c", 5, False, None)],
+}
+# Enum constraints are strict
+_enums: dict[str, dict[ValueType, bytes]] = {
+    "self-connect-mode": {
+        b" ": b"Don't restrict self connect requests",
+        b"E": b"Fail self connect requests to external ports only",
+        b"e": b"Ignore self connect requests to external ports only",
+        b"A": b"Fail all self connect requests",
+        b"a": b"Ignore all self connect requests",
+    },
+}
+
+_addresses = itertools.count(0x10000, 0x10)
+_objects: dict[int, Any] = {}
+_lock = threading.RLock()
+
+
+class _Handle:
+    address: int
+
+    def __init__(self) -> None:
+        with _lock:
+            self.address = next(_addresses)
+            _objects[self.address] = self
+
+    def release(self) -> None:
+        _objects.pop(self.address, None)
+
+
+class _Param(_Handle):
+    def __init__(self, spec: _ParamSpec) -> None:
+        super().__init__()
+        self.name, self.id, self.type, self.value, self.range = spec
+        self.enum = _enums.get(self.name)
+
+
+class _WithParams(_Handle):
+    def __init__(self, name: str, specs: Iterable[_ParamSpec]) -> None:
+        super().__init__()
+        self.name = name
+        self.params = [_Param(spec) for spec in specs]
+        self.params_list = _jslist(self.params)
+
+    def get(self, name: str) -> ValueType | None:
+        for param in self.params:
+            if param.name == name:
+                return param.value
+        return None
+
+    def release(self) -> None:
+        for param in self.params:
+            param.release()
+        super().release()
+
+
+class _Server(_WithParams):
+    def __init__(self) -> None:
+        super().__init__("server", _server_params)
+        self.drivers = [_WithParams(n, s) for n, s in _drivers.items()]
+        self.internals = [_WithParams(n, s) for n, s in _internals.items()]
+        self.drivers_list = _jslist(self.drivers)
+        self.internals_list = _jslist(self.internals)
+        self.driver: _WithParams | None = None
+        self.slaves: list[_WithParams] = []
+        self.loaded: list[_WithParams] = []
+        self.clients: list[_Client] = []
+        self.ports: dict[bytes, _Port] = {}
+        self.opened = self.started = False
+        self.buffer_size = self.sample_rate = 0
+        self.xrun_delay = 0.0
+
+    @property
+    def server_name(self) -> bytes:
+        return self.get("name")  # type: ignore
+
+    def release(self) -> None:
+        for obj in (*self.drivers, *self.internals, *self.ports.values()):
+            obj.release()
+        super().release()
+
+
+class _Client(_Handle):
+    def __init__(self, server: _Server, name: bytes) -> None:
+        super().__init__()
+        self.server = server
+        self.name = name
+        self.xrun_callback: Any = None
+        self.xrun_arg: Any = None
+
+
+class _Port(_Handle):
+    def __init__(self, server: _Server, name: bytes) -> None:
+        super().__init__()
+        self.server = server
+        self.name = name
+
+
+class FakeBackend:
+    delays: dict[str, float]
+    failures: dict[str, int]
+    cpu_load: float
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.delays = {}
+        self.failures = {}
+        self.cpu_load = 5.0
+
+    def set_delay(self, function: str, seconds: float) -> None:
+        self.delays[function] = seconds
+
+    def fail(self, function: str, times: int = 1) -> None:
+        # times=-1 fails every call
+        self.failures[function] = times
+
+    def _check(self, function: str) -> bool:
+        if delay := self.delays.get(function):
+            time.sleep(delay)
+        with _lock:
+            times = self.failures.get(function, 0)
+            if not times:
+                return True
+            if times > 0:
+                self.failures[function] = times - 1
+        _emit("error", f"Injected failure: {function}")
+        return False
+
+    @property
+    def servers(self) -> list[str]:
+        return [
+            s.server_name.decode()
+            for s in _objects.values()
+            if isinstance(s, _Server) and s.opened
+        ]
+
+    def inject_xruns(
+        self, count: int = 1, *, delay: float = 0.001, server: str | None = None
+    ) -> None:
+        for obj in list(_objects.values()):
+            if not isinstance(obj, _Server) or not obj.started:
+                continue
+            if server is not None and obj.server_name != server.encode():
+                continue
+            for _ in range(count):
+                obj.xrun_delay = delay
+                _emit("error", f"Fake driver xrun of {delay * 1e6:.0f} usecs")
+                for client in obj.clients:
+                    if client.xrun_callback:
+                        client.xrun_callback(client.xrun_arg)
+
+
+fake_backend = FakeBackend()
+_print_functions: dict[str, Any] = {}
+
+
+def _emit(stream: str, message: str) -> None:
+    if callback := _print_functions.get(stream):
+        callback(message.encode())
+
+
+def _jslist(objects: list[Any]) -> _Pointer[lib.JSList]:
+    head = lib.JSList_p()
+    for obj in reversed(objects):
+        node = lib.JSList()
+        node.data = obj.address
+        node.next = head
+        head = pointer(node)
+    return head
+
+
+def _get(ptr: Any) -> Any:
+    return _objects[cast(ptr, c_void_p).value]  # type: ignore
+
+
+def _handle(obj: _Handle | None, type: Any) -> Any:
+    return cast(c_void_p(obj.address if obj else None), type)
+
+
+def _union(param: _Param, value: ValueType) -> lib.jackctl_parameter_value:
+    union = lib.jackctl_parameter_value()
+    setattr(union, _value_fields[param.type], value)
+    return union
+
+
+# Parameters
+
+
+def jackctl_parameter_get_type(param: Any) -> int:
+    return _get(param).type
+
+
+def jackctl_parameter_get_name(param: Any) -> bytes:
+    return _get(param).name.encode()
+
+
+def jackctl_parameter_get_id(param: Any) -> bytes:
+    return _get(param).id.encode()
+
+
+def jackctl_parameter_set_value(param: Any, value: Any) -> bool:
+    if not fake_backend._check("jackctl_parameter_set_value"):
+        return False
+    obj: _Param = _get(param)
+    obj.value = getattr(value.contents, _value_fields[obj.type])
+    return True
+
+
+def jackctl_parameter_get_value(param: Any) -> lib.jackctl_parameter_value:
+    obj: _Param = _get(param)
+    return _union(obj, obj.value)
+
+
+def jackctl_parameter_has_range_constraint(param: Any) -> bool:
+    return _get(param).range is not None
+
+
+def jackctl_parameter_get_range_constraint(param: Any, min_: Any, max_: Any) -> None:
+    obj: _Param = _get(param)
+    assert obj.range
+    field = _value_fields[obj.type]
+    setattr(min_.contents, field, obj.range[0])
+    setattr(max_.contents, field, obj.range[1])
+
+
+def jackctl_parameter_has_enum_constraint(param: Any) -> bool:
+    return _get(param).enum is not None
+
+
+def jackctl_parameter_get_enum_constraints_count(param: Any) -> int:
+    return len(_get(param).enum)
+
+
+def jackctl_parameter_get_enum_constraint_value(
+    param: Any, index: int
+) -> lib.jackctl_parameter_value:
+    obj: _Param = _get(param)
+    assert obj.enum is not None
+    return _union(obj, list(obj.enum)[index])
+
+
+def jackctl_parameter_get_enum_constraint_description(param: Any, index: int) -> bytes:
+    return list(_get(param).enum.values())[index]
+
+
+def jackctl_parameter_constraint_is_strict(param: Any) -> bool:
+    return _get(param).enum is not None
+
+
+# Drivers and internal clients
+
+
+def jackctl_driver_get_parameters(driver: Any) -> Any:
+    return _get(driver).params_list
+
+
+def jackctl_driver_get_name(driver: Any) -> bytes:
+    return _get(driver).name.encode()
+
+
+jackctl_internal_get_parameters = jackctl_driver_get_parameters
+jackctl_internal_get_name = jackctl_driver_get_name
+
+
+# Server
+
+
+def jackctl_server_create2(
+    on_device_acquire: Any, on_device_release: Any, on_device_reservation_loop: Any
+) -> Any:
+    if not fake_backend._check("jackctl_server_create2"):
+        return lib.jackctl_server_t_p()
+    return _handle(_Server(), lib.jackctl_server_t_p)
+
+
+def jackctl_server_destroy(server: Any) -> None:
+    _get(server).release()
+
+
+def jackctl_server_get_parameters(server: Any) -> Any:
+    return _get(server).params_list
+
+
+def jackctl_server_get_drivers_list(server: Any) -> Any:
+    return _get(server).drivers_list
+
+
+def jackctl_server_get_internals_list(server: Any) -> Any:
+    return _get(server).internals_list
+
+
+def jackctl_server_open(server: Any, driver: Any) -> bool:
+    obj: _Server = _get(server)
+    if obj.opened or not fake_backend._check("jackctl_server_open"):
+        return False
+
+    with _lock:
+        if obj.server_name.decode() in fake_backend.servers:
+            _emit("error", f"server `{obj.server_name.decode()}' already active")
+            return False
+        obj.opened = True
+
+    obj.driver = _get(driver)
+    obj.buffer_size = obj.driver.get("period") or 1024  # type: ignore
+    obj.sample_rate = obj.driver.get("rate") or 48000  # type: ignore
+    _emit("info", f"Fake driver {obj.driver.name} opened")  # type: ignore
+    if not obj.get("realtime"):
+        _emit("error", "Fake server runs without realtime scheduling")
+    return True
+
+
+def jackctl_server_close(server: Any) -> bool:
+    obj: _Server = _get(server)
+    if not obj.opened:
+        return False
+    obj.opened = False
+    obj.driver = None
+    obj.slaves.clear()
+    obj.loaded.clear()
+    obj.clients.clear()
+    return fake_backend._check("jackctl_server_close")
+
+
+def jackctl_server_start(server: Any) -> bool:
+    obj: _Server = _get(server)
+    if not obj.opened or obj.started or not fake_backend._check("jackctl_server_start"):
+        return False
+    obj.started = True
+    _emit("info", "Fake server started")
+    return True
+
+
+def jackctl_server_stop(server: Any) -> bool:
+    obj: _Server = _get(server)
+    if not obj.started:
+        return False
+    obj.started = False
+    return fake_backend._check("jackctl_server_stop")
+
+
+def jackctl_server_switch_master(server: Any, driver: Any) -> bool:
+    obj: _Server = _get(server)
+    if not obj.opened or not fake_backend._check("jackctl_server_switch_master"):
+        return False
+    obj.driver = _get(driver)
+    obj.buffer_size = obj.driver.get("period") or obj.buffer_size  # type: ignore
+    return True
+
+
+def jackctl_server_add_slave(server: Any, driver: Any) -> bool:
+    obj: _Server = _get(server)
+    slave = _get(driver)
+    # JACK doesn't attach slaves to running engine
+    if not obj.opened or obj.started or slave in obj.slaves:
+        return False
+    if not fake_backend._check("jackctl_server_add_slave"):
+        return False
+    obj.slaves.append(slave)
+    return True
+
+
+def jackctl_server_remove_slave(server: Any, driver: Any) -> bool:
+    obj: _Server = _get(server)
+    slave = _get(driver)
+    if obj.started or slave not in obj.slaves:
+        return False
+    if not fake_backend._check("jackctl_server_remove_slave"):
+        return False
+    obj.slaves.remove(slave)
+    return True
+
+
+def jackctl_server_load_internal(server: Any, internal: Any) -> bool:
+    obj: _Server = _get(server)
+    client = _get(internal)
+    # Internal clients are loaded into opened engine, running or not
+    if not obj.opened or client in obj.loaded:
+        return False
+    if not fake_backend._check("jackctl_server_load_internal"):
+        return False
+    obj.loaded.append(client)
+    if client.name == "netmanager":
+        ip, port = client.get("multicast-ip").decode(), client.get("udp-net-port")
+        _emit("info", f"Fake NetManager listening on {ip}:{port}")
+    return True
+
+
+def jackctl_server_unload_internal(server: Any, internal: Any) -> bool:
+    obj: _Server = _get(server)
+    client = _get(internal)
+    if client not in obj.loaded:
+        return False
+    if not fake_backend._check("jackctl_server_unload_internal"):
+        return False
+    obj.loaded.remove(client)
+    return True
+
+
+_sigmask: set[signal.Signals] = {signal.SIGINT, signal.SIGTERM}
+
+
+def jackctl_setup_signals(flags: int) -> int:
+    signal.pthread_sigmask(signal.SIG_BLOCK, _sigmask)
+    return 1
+
+
+def jackctl_wait_signals(sigmask: Any) -> None:
+    signal.sigwait(_sigmask)
+
+
+# Client API
+
+JackFailure = 0x01
+JackServerFailed = 0x20
+
+
+def jack_client_open(
+    name: bytes, options: int, status: Any, server_name: c_char_p
+) -> Any:
+    for obj in list(_objects.values()):
+        if (
+            isinstance(obj, _Server)
+            and obj.started
+            and obj.server_name == server_name.value
+            and fake_backend._check("jack_client_open")
+        ):
+            client = _Client(obj, name)
+            obj.clients.append(client)
+            return _handle(client, lib.jack_client_t_p)
+
+    status._obj.value = JackFailure | JackServerFailed
+    return lib.jack_client_t_p()
+
+
+def jack_client_close(client: Any) -> int:
+    obj: _Client = _get(client)
+    if obj in obj.server.clients:
+        obj.server.clients.remove(obj)
+    obj.release()
+    return 0
+
+
+def jack_activate(client: Any) -> int:
+    return 0
+
+
+def jack_cpu_load(client: Any) -> float:
+    return fake_backend.cpu_load
+
+
+def jack_get_buffer_size(client: Any) -> int:
+    return _get(client).server.buffer_size
+
+
+def jack_get_sample_rate(client: Any) -> int:
+    return _get(client).server.sample_rate
+
+
+def jack_set_buffer_size(client: Any, frames: int) -> int:
+    if not fake_backend._check("jack_set_buffer_size"):
+        return 1
+    _get(client).server.buffer_size = frames
+    return 0
+
+
+def jack_set_xrun_callback(client: Any, callback: Any, arg: Any) -> int:
+    obj: _Client = _get(client)
+    obj.xrun_callback, obj.xrun_arg = callback, arg
+    return 0
+
+
+def jack_get_xrun_delayed_usecs(client: Any) -> float:
+    return _get(client).server.xrun_delay * 1e6
+
+
+_port_arrays: Dict[int, Any] = {}
+
+
+JackPortIsInput = 0x1
+JackPortIsOutput = 0x2
+JackCaptureLatency = 0
+
+
+def _system_ports(server: _Server, flags: int) -> List[bytes]:
+    names: List[bytes] = []
+    if server.driver:
+        # Capture ports are outputs of the system client, playback ports inputs
+        for direction, flag in (
+            ("capture", JackPortIsOutput),
+            ("playback", JackPortIsInput),
+        ):
+            if flags & (JackPortIsInput | JackPortIsOutput) not in (0, flag):
+                continue
+            count = server.driver.get(direction) or 0
+            names.extend(
+                f"system:{direction}_{i + 1}".encode() for i in range(count)  # type: ignore
+            )
+    return names
+
+
+def jack_get_ports(client: Any, port_name: Any, type_name: Any, flags: int) -> Any:
+    names = _system_ports(_get(client).server, flags)
+    if not names:
+        return POINTER(c_char_p)()
+
+    array = (c_char_p * (len(names) + 1))(*names)
+    address = cast(array, c_void_p).value
+    assert address
+    _port_arrays[address] = array
+    return cast(array, POINTER(c_char_p))
+
+
+def jack_free(ptr: Any) -> None:
+    _port_arrays.pop(cast(ptr, c_void_p).value, None)  # type: ignore
+
+
+def jack_port_by_name(client: Any, name: bytes) -> Any:
+    server: _Server = _get(client).server
+    if name not in _system_ports(server, 0):
+        return lib.jack_port_t_p()
+    if name not in server.ports:
+        server.ports[name] = _Port(server, name)
+    return _handle(server.ports[name], lib.jack_port_t_p)
+
+
+def jack_port_get_latency_range(port: Any, mode: int, range: Any) -> None:
+    obj: _Port = _get(port)
+    server = obj.server
+    is_capture = obj.name.startswith(b"system:capture_")
+    if is_capture != (mode == JackCaptureLatency):
+        latency = 0
+    elif is_capture:
+        latency = server.buffer_size
+    else:
+        # Playback goes through the whole buffer of the driver
+        nperiods = server.driver.get("nperiods") if server.driver else None
+        latency = server.buffer_size * (nperiods or 1)
+    range._obj.min = range._obj.max = latency
+
+
+# Output
+
+
+def jack_set_error_function(callback: Any) -> None:
+    _print_functions["error"] = callback
+
+
+def jack_set_info_function(callback: Any) -> None:
+    _print_functions["info"] = callback
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from ctypes import _Pointer
+from typing import ContextManager, cast
+
+import jack_server._lib as lib
+from jack_server._jslist import iterate_jslist
+from jack_server._parameter import Parameter, _no_lock, get_params_from_jslist
+
+
+class InternalClient:
+    __slots__ = ("_ptr", "_name", "_params", "_lock", "loaded")
+
+    _ptr: _Pointer[lib.jackctl_internal_t]
+    _name: str
+    _params: dict[str, Parameter] | None
+    _lock: ContextManager[object]
+    loaded: bool
+
+    def __init__(
+        self,
+        ptr: _Pointer[lib.jackctl_internal_t],
+        lock: ContextManager[object] = _no_lock,
+    ) -> None:
+        self._ptr = ptr
+        self._name = cast(bytes, lib.jackctl_internal_get_name(self._ptr)).decode()
+        self._params = None
+        self._lock = lock
+        self.loaded = False
+
+    @property
+    def params(self) -> dict[str, Parameter]:
+        if self._params is None:
+            params_jslist = lib.jackctl_internal_get_parameters(self._ptr)
+            self._params = get_params_from_jslist(params_jslist, self._lock)
+        return self._params
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def __repr__(self) -> str:
+        return f"<jack_server.InternalClient name={self.name} loaded={self.loaded}>"
+
+
+def get_internals_from_jslist(
+    jslist: _Pointer[lib.JSList], lock: ContextManager[object] = _no_lock
+) -> dict[str, InternalClient]:
+    internals: dict[str, InternalClient] = {}
+
+    for ptr in iterate_jslist(jslist, lib.jackctl_internal_t_p):
+        internal = InternalClient(ptr, lock)
+        internals[internal.name] = internal
+
+    return internals
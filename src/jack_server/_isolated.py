@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any, Callable, Iterable, Mapping
+
+import jack_server._lib as lib
+from jack_server._output import set_error_function, set_info_function
+from jack_server._parameter import ValueType
+from jack_server._realtime import RealtimeReport
+from jack_server._server import JackServerError, Server, Snapshot
+
+# Server methods that can be called through the proxy
+_methods = {
+    "start",
+    "stop",
+    "prepare",
+    "activate",
+    "validate",
+    "snapshot",
+    "apply",
+    "switch_driver",
+    "reconfigure",
+    "load_internal",
+    "unload_internal",
+    "add_slave",
+    "remove_slave",
+    "reconfigure_slave",
+    "tune_realtime",
+}
+# Attributes of Server and Driver that can be read and written
+_attributes = {
+    "server": {"name", "sync", "realtime", "realtime_priority"},
+    "driver": {"name", "device", "rate", "period", "nperiods"},
+}
+
+
+class ServerProcessError(JackServerError):
+    pass
+
+
+def _get_params(server: Server, scope: str):
+    return server.params if scope == "server" else server.driver.params
+
+
+def _handle(server: Server, op: str, args: tuple[Any, ...], kwargs: Any) -> Any:
+    if op in _methods:
+        result = getattr(server, op)(*args, **kwargs)
+        # Drivers and internal clients live in child process
+        return result if op in ("snapshot", "apply", "tune_realtime") else None
+
+    if op == "get" or op == "set":
+        scope, name, *value = args
+        if name not in _attributes[scope]:
+            raise AttributeError(name)
+        target = server if scope == "server" else server.driver
+        return getattr(target, name) if op == "get" else setattr(target, name, *value)
+
+    if op == "param_names":
+        return list(_get_params(server, args[0]))
+    if op == "get_param":
+        return _get_params(server, args[0])[args[1]].value
+    if op == "set_param":
+        _get_params(server, args[0])[args[1]].value = args[2]
+        return None
+
+    raise ValueError(f"Unknown operation: {op}")
+
+
+def _serve(
+    conn: Connection, log_conn: Connection, kwargs: dict[str, Any], backend: str
+) -> None:
+    log_lock = threading.Lock()
+
+    def forward(stream: str) -> Callable[[str], None]:
+        def func(message: str) -> None:
+            with log_lock:
+                log_conn.send((stream, message))
+
+        return func
+
+    try:
+        lib.set_backend(backend)
+        set_info_function(forward("info"))
+        set_error_function(forward("error"))
+        server = Server(**kwargs)
+    except Exception as exc:
+        conn.send(("error", exc))
+        return
+    conn.send(("ok", None))
+
+    while True:
+        try:
+            op, args, op_kwargs = conn.recv()
+        except EOFError:
+            op, args, op_kwargs = "close", (), {}
+
+        if op == "close":
+            server.close()
+            conn.send(("ok", None))
+            return
+
+        try:
+            conn.send(("ok", _handle(server, op, args, op_kwargs)))
+        except Exception as exc:
+            conn.send(("error", exc))
+
+
+class _ParameterProxy:
+    __slots__ = ("_server", "_scope", "_name")
+
+    _server: IsolatedServer
+    _scope: str
+    _name: str
+
+    def __init__(self, server: IsolatedServer, scope: str, name: str) -> None:
+        self._server = server
+        self._scope = scope
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def value(self) -> ValueType:
+        return self._server._call("get_param", self._scope, self._name)
+
+    @value.setter
+    def value(self, val: ValueType) -> None:
+        self._server._call("set_param", self._scope, self._name, val)
+
+    def __repr__(self) -> str:
+        return f"<jack_server.Parameter name={self.name!r} value={self.value!r}>"
+
+
+def _get_param_proxies(
+    server: IsolatedServer, scope: str
+) -> dict[str, _ParameterProxy]:
+    return {
+        name: _ParameterProxy(server, scope, name)
+        for name in server._call("param_names", scope)
+    }
+
+
+class _AttributeProxy:
+    _scope: str
+
+    def __init__(self, server: IsolatedServer) -> None:
+        object.__setattr__(self, "_server", server)
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in _attributes[self._scope]:
+            raise AttributeError(name)
+        return self._server._call("get", self._scope, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in _attributes[self._scope]:
+            raise AttributeError(name)
+        self._server._call("set", self._scope, name, value)
+
+
+class _DriverProxy(_AttributeProxy):
+    _scope = "driver"
+    _server: IsolatedServer
+
+    @property
+    def params(self) -> dict[str, _ParameterProxy]:
+        return _get_param_proxies(self._server, "driver")
+
+    def __repr__(self) -> str:
+        return f"<jack_server.Driver name={self.name}>"
+
+
+class IsolatedServer(_AttributeProxy):
+    _scope = "server"
+    _kwargs: dict[str, Any]
+    _on_info: Callable[[str], None] | None
+    _on_error: Callable[[str], None] | None
+    _timeout: float
+    _process: BaseProcess | None
+    _conn: Connection | None
+    _lock: threading.Lock
+    _config: tuple[str, Snapshot] | None
+    _internals: dict[str, Mapping[str, ValueType] | None]
+    _slaves: dict[str, dict[str, Any]]
+    _started: bool
+
+    def __init__(
+        self,
+        *,
+        on_info: Callable[[str], None] | None = None,
+        on_error: Callable[[str], None] | None = None,
+        timeout: float = 30,
+        **kwargs: Any,
+    ) -> None:
+        set_ = object.__setattr__
+        set_(self, "_server", self)
+        set_(self, "_kwargs", kwargs)
+        set_(self, "_on_info", on_info)
+        set_(self, "_on_error", on_error)
+        set_(self, "_timeout", timeout)
+        set_(self, "_process", None)
+        set_(self, "_conn", None)
+        set_(self, "_lock", threading.Lock())
+        set_(self, "_config", None)
+        set_(self, "_internals", {})
+        set_(self, "_slaves", {})
+        set_(self, "_started", False)
+        self._spawn()
+
+    def _spawn(self) -> None:
+        # Don't fork: child shouldn't inherit JACK state or threads of the host
+        ctx = multiprocessing.get_context("spawn")
+        conn, child_conn = ctx.Pipe()
+        log_conn, child_log_conn = ctx.Pipe(duplex=False)
+        process = ctx.Process(
+            target=_serve,
+            args=(child_conn, child_log_conn, self._kwargs, lib.get_backend()),
+            name="jack_server",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        child_log_conn.close()
+
+        threading.Thread(target=self._read_logs, args=(log_conn,), daemon=True).start()
+        object.__setattr__(self, "_process", process)
+        object.__setattr__(self, "_conn", conn)
+        with self._lock:
+            self._receive()
+
+    def _read_logs(self, log_conn: Connection) -> None:
+        logger = logging.getLogger("jack_server")
+
+        while True:
+            try:
+                stream, message = log_conn.recv()
+            except (EOFError, OSError):
+                return
+
+            callback = self._on_info if stream == "info" else self._on_error
+            if callback:
+                callback(message)
+            else:
+                logger.log(logging.INFO if stream == "info" else logging.ERROR, message)
+
+    def _receive(self) -> Any:
+        assert self._conn
+        try:
+            if not self._conn.poll(self._timeout):
+                # Hung child can't be trusted anymore
+                self._kill()
+                raise ServerProcessError(
+                    f"Server process didn't respond in {self._timeout}s, killed it"
+                )
+            status, result = self._conn.recv()
+        except (EOFError, OSError):
+            raise ServerProcessError("Server process died") from None
+
+        if status == "error":
+            raise result
+        return result
+
+    def _call(self, op: str, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            if not self._conn:
+                raise ServerProcessError("Server process is closed")
+            try:
+                self._conn.send((op, args, kwargs))
+            except OSError:
+                raise ServerProcessError("Server process died") from None
+            return self._receive()
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid if self._process else None
+
+    @property
+    def driver(self) -> _DriverProxy:
+        return _DriverProxy(self)
+
+    @property
+    def params(self) -> dict[str, _ParameterProxy]:
+        return _get_param_proxies(self, "server")
+
+    def start(self) -> None:
+        self.prepare()
+        self.activate()
+
+    def prepare(self, *, open: bool = True) -> None:
+        self._call("prepare", open=open)
+
+    def activate(self) -> None:
+        self._call("activate")
+        config = (self._call("get", "driver", "name"), self._call("snapshot"))
+        object.__setattr__(self, "_config", config)
+        object.__setattr__(self, "_started", True)
+
+    def stop(self) -> None:
+        self._call("stop")
+        object.__setattr__(self, "_started", False)
+
+    def validate(self) -> None:
+        self._call("validate")
+
+    def snapshot(self) -> Snapshot:
+        return self._call("snapshot")
+
+    def apply(self, values: Mapping[str, Mapping[str, ValueType]]) -> Snapshot:
+        return self._call("apply", values)
+
+    def switch_driver(self, driver: str, **kwargs: Any) -> None:
+        self._call("switch_driver", driver, **kwargs)
+
+    def reconfigure(self, **kwargs: Any) -> None:
+        self._call("reconfigure", **kwargs)
+
+    # Internal clients and slaves are remembered to restore them on restart
+
+    def load_internal(
+        self, name: str, params: Mapping[str, ValueType] | None = None
+    ) -> None:
+        self._call("load_internal", name, params)
+        self._internals[name] = {**(self._internals.get(name) or {}), **(params or {})}
+
+    def unload_internal(self, name: str) -> None:
+        self._call("unload_internal", name)
+        self._internals.pop(name, None)
+
+    def add_slave(self, driver: str, **kwargs: Any) -> None:
+        self._call("add_slave", driver, **kwargs)
+        self._slaves[driver] = kwargs
+
+    def remove_slave(self, driver: str) -> None:
+        self._call("remove_slave", driver)
+        self._slaves.pop(driver, None)
+
+    def reconfigure_slave(self, driver: str, **kwargs: Any) -> None:
+        self._call("reconfigure_slave", driver, **kwargs)
+        self._slaves[driver] = {**self._slaves.get(driver, {}), **kwargs}
+
+    def tune_realtime(
+        self, *, cpus: Iterable[int] | None = None, mlock: bool = False
+    ) -> RealtimeReport:
+        # JACK threads live in child process, so tuning happens there
+        return self._call("tune_realtime", cpus=cpus, mlock=mlock)
+
+    def restart(self) -> None:
+        # Replace server process, restoring configuration it was started with,
+        # slaves and internal clients
+        self._terminate()
+        self._spawn()
+
+        if self._config:
+            driver, snapshot = self._config
+            if driver != self._kwargs["driver"]:
+                self._call("switch_driver", driver)
+            self._call("apply", snapshot)
+        for driver, kwargs in self._slaves.items():
+            self._call("add_slave", driver, **kwargs)
+        for name, params in self._internals.items():
+            self._call("load_internal", name, params)
+        if self._started:
+            self._call("start")
+
+    def _kill(self) -> None:
+        # Called with lock held
+        conn, process = self._conn, self._process
+        object.__setattr__(self, "_conn", None)
+        object.__setattr__(self, "_process", None)
+        if conn:
+            conn.close()
+        if process:
+            process.kill()
+            process.join()
+
+    def _terminate(self, timeout: float = 5) -> None:
+        with self._lock:
+            conn, process = self._conn, self._process
+            object.__setattr__(self, "_conn", None)
+            object.__setattr__(self, "_process", None)
+
+        if conn:
+            try:
+                conn.send(("close", (), {}))
+                if conn.poll(timeout):
+                    conn.recv()
+            except (EOFError, OSError):
+                pass
+            conn.close()
+
+        if process:
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+    def close(self) -> None:
+        self._terminate()
+        object.__setattr__(self, "_started", False)
+
+    def __enter__(self) -> IsolatedServer:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<jack_server.IsolatedServer pid={self.pid} started={self._started}>"
@@ -11,7 +11,16 @@ if TYPE_CHECKING:
     _T = TypeVar("_T", bound=_CanCastTo)
 
 
-def iterate_jslist(ptr: _Pointer[lib.JSList], type: type[_T]) -> Iterable[_T]:
+def iterate_jslist(
+    ptr: _Pointer[lib.JSList] | list[_T], type: type[_T]
+) -> Iterable[_T]:
+    if isinstance(ptr, list):
+        # cffi backend walks the list itself
+        return ptr
+    return _iterate(ptr, type)
+
+
+def _iterate(ptr: _Pointer[lib.JSList], type: type[_T]) -> Iterable[_T]:
     cur_ptr = ptr
 
     while cur_ptr:
@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+import os
+import warnings
 from ctypes import (
     CDLL,
     CFUNCTYPE,
@@ -8,17 +12,29 @@ from ctypes import (
     c_bool,
     c_char,
     c_char_p,
+    c_float,
     c_int,
     c_uint,
+    c_uint32,
+    c_ulong,
     c_void_p,
 )
 from ctypes.util import find_library
-from typing import TYPE_CHECKING
+from importlib import import_module
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from ctypes import _CData
 
 _lib_names = ("libjackserver", "jackserver", "libjackserver64")
+_library_path_env = "JACK_SERVER_LIBRARY"
+_library_path: str | None = None
+_cdll: CDLL | None = None
+
+_backends = ("ctypes", "cffi", "fake")
+_backend_env = "JACK_SERVER_BACKEND"
+_backend: str | None = None
 
 
 def get_library_name():
@@ -29,12 +45,106 @@ def get_library_name():
     raise RuntimeError("Couldn't find jackserver library")
 
 
-lib = CDLL(get_library_name())
+def _get_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home, "jack_server", "library_path")
+
+
+def _read_cached_library_name() -> str | None:
+    try:
+        return _get_cache_path().read_text().strip() or None
+    except OSError:
+        return None
+
+
+def _write_cached_library_name(name: str) -> None:
+    path = _get_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name)
+    except OSError:  # pragma: no cover
+        pass
+
+
+def set_library_path(path: str | None) -> None:
+    global _library_path
+
+    if _cdll is not None:
+        raise RuntimeError("jackserver library is already loaded")
+    if _backend == "cffi":
+        raise RuntimeError("cffi backend is linked to jackserver library on build")
+    _library_path = path
+
+
+def _open_library() -> CDLL:
+    if path := _library_path or os.environ.get(_library_path_env):
+        return CDLL(path)
+
+    if cached_name := _read_cached_library_name():
+        try:
+            return CDLL(cached_name)
+        except OSError:
+            pass
+
+    name = get_library_name()
+    cdll = CDLL(name)
+    _write_cached_library_name(name)
+    return cdll
+
+
+def load_library() -> CDLL:
+    global _cdll
+
+    if _cdll is None:
+        _cdll = _open_library()
+    return _cdll
+
+
+def cffi_available() -> bool:
+    # Compiled module is optional, see jack_server._cffi_build. Import fails
+    # when it wasn't built or linked library is missing.
+    try:
+        import_module("jack_server._jack_cffi")
+    except (ImportError, OSError):
+        return False
+    return True
+
+
+def get_backend() -> str:
+    global _backend
+
+    if _backend is None:
+        # Compiled backend is opt-in: it isn't faster unless benchmarks on the
+        # target machine show it, see benchmarks/bench.py --compare
+        name = os.environ.get(_backend_env) or "ctypes"
+        if name == "cffi" and not cffi_available():
+            warnings.warn("cffi backend is not available, falling back to ctypes")
+            name = "ctypes"
+        set_backend(name)
+    assert _backend
+    return _backend
+
+
+def set_backend(name: str) -> None:
+    global _backend
+
+    if name not in _backends:
+        raise ValueError(
+            f"Unknown backend: {name!r}, available: {', '.join(_backends)}"
+        )
+    if name == "cffi" and not cffi_available():
+        raise ValueError(
+            "cffi backend is not compiled, run: python -m jack_server._cffi_build"
+        )
+    # Functions of previous backend are cached in module globals
+    for func_name in _functions:
+        globals().pop(func_name, None)
+    _backend = name
 
 
 class JSList(Structure):
-    data: "_CData"
-    next: "_Pointer[JSList]"
+    data: _CData
+    next: _Pointer[JSList]
 
 
 JSList_p = POINTER(JSList)
@@ -47,14 +157,6 @@ class jackctl_parameter_t(Structure):
 
 jackctl_parameter_t_p = POINTER(jackctl_parameter_t)
 
-jackctl_parameter_get_type = lib.jackctl_parameter_get_type
-jackctl_parameter_get_type.argtypes = [jackctl_parameter_t_p]
-jackctl_parameter_get_type.restype = c_uint
-
-jackctl_parameter_get_name = lib.jackctl_parameter_get_name
-jackctl_parameter_get_name.argtypes = [jackctl_parameter_t_p]
-jackctl_parameter_get_name.restype = c_char_p
-
 
 class jackctl_parameter_value(Union):
     _fields_ = [
@@ -67,24 +169,13 @@ class jackctl_parameter_value(Union):
 
     i: int
     ui: int
-    c: str
+    c: bytes
     ss: bytes
     b: bool
 
 
 jackctl_parameter_value_p = POINTER(jackctl_parameter_value)
 
-jackctl_parameter_set_value = lib.jackctl_parameter_set_value
-jackctl_parameter_set_value.argtypes = [
-    jackctl_parameter_t_p,
-    jackctl_parameter_value_p,
-]
-jackctl_parameter_set_value.restype = c_bool
-
-jackctl_parameter_get_value = lib.jackctl_parameter_get_value
-jackctl_parameter_get_value.argtypes = [jackctl_parameter_t_p]
-jackctl_parameter_get_value.restype = jackctl_parameter_value
-
 
 class jackctl_driver_t(Structure):
     pass
@@ -92,13 +183,12 @@ class jackctl_driver_t(Structure):
 
 jackctl_driver_t_p = POINTER(jackctl_driver_t)
 
-jackctl_driver_get_parameters = lib.jackctl_driver_get_parameters
-jackctl_driver_get_parameters.argtypes = [jackctl_driver_t_p]
-jackctl_driver_get_parameters.restype = JSList_p
 
-jackctl_driver_get_name = lib.jackctl_driver_get_name
-jackctl_driver_get_name.argtypes = [jackctl_driver_t_p]
-jackctl_driver_get_name.restype = c_char_p
+class jackctl_internal_t(Structure):
+    pass
+
+
+jackctl_internal_t_p = POINTER(jackctl_internal_t)
 
 
 class jackctl_server_t(Structure):
@@ -107,53 +197,155 @@ class jackctl_server_t(Structure):
 
 jackctl_server_t_p = POINTER(jackctl_server_t)
 
-OnDeviceAcquire = CFUNCTYPE(c_bool, c_char_p)
-OnDeviceRelease = CFUNCTYPE(None, c_char_p)
-OnDeviceReservationLoop = CFUNCTYPE(None)
 
-jackctl_server_create2 = lib.jackctl_server_create2
-jackctl_server_create2.argtypes = [
-    OnDeviceAcquire,
-    OnDeviceRelease,
-    OnDeviceReservationLoop,
-]
-jackctl_server_create2.restype = jackctl_server_t_p
+class jack_client_t(Structure):
+    pass
 
-jackctl_server_open = lib.jackctl_server_open
-jackctl_server_open.argtypes = [jackctl_server_t_p, jackctl_driver_t_p]
-jackctl_server_open.restype = c_bool
 
-jackctl_server_start = lib.jackctl_server_start
-jackctl_server_start.argtypes = [jackctl_server_t_p]
-jackctl_server_start.restype = c_bool
+jack_client_t_p = POINTER(jack_client_t)
 
-jackctl_server_close = lib.jackctl_server_close
-jackctl_server_close.argtypes = [jackctl_server_t_p]
-jackctl_server_close.restype = c_bool
 
-jackctl_server_stop = lib.jackctl_server_stop
-jackctl_server_stop.argtypes = [jackctl_server_t_p]
-jackctl_server_stop.restype = c_bool
+class jack_port_t(Structure):
+    pass
 
-jackctl_server_destroy = lib.jackctl_server_destroy
-jackctl_server_destroy.argtypes = [jackctl_server_t_p]
-jackctl_server_destroy.restype = c_void_p
 
-jackctl_server_get_parameters = lib.jackctl_server_get_parameters
-jackctl_server_get_parameters.argtypes = [jackctl_server_t_p]
-jackctl_server_get_parameters.restype = JSList_p
+jack_port_t_p = POINTER(jack_port_t)
 
-jackctl_server_get_drivers_list = lib.jackctl_server_get_drivers_list
-jackctl_server_get_drivers_list.argtypes = [jackctl_server_t_p]
-jackctl_server_get_drivers_list.restype = JSList_p
 
+class jack_latency_range_t(Structure):
+    _fields_ = [("min", c_uint32), ("max", c_uint32)]
 
-PrintFunction = CFUNCTYPE(None, c_char_p)
 
-jack_set_error_function = lib.jack_set_error_function
-jack_set_error_function.argtypes = [PrintFunction]
-jack_set_error_function.restype = None
+OnDeviceAcquire = CFUNCTYPE(c_bool, c_char_p)
+OnDeviceRelease = CFUNCTYPE(None, c_char_p)
+OnDeviceReservationLoop = CFUNCTYPE(None)
 
-jack_set_info_function = lib.jack_set_info_function
-jack_set_info_function.argtypes = [PrintFunction]
-jack_set_info_function.restype = None
+PrintFunction = CFUNCTYPE(None, c_char_p)
+XRunCallback = CFUNCTYPE(c_int, c_void_p)
+
+# Functions are bound on first access, so importing this module doesn't
+# require jackserver library to be installed.
+_functions: dict[str, tuple[list[Any], Any]] = {
+    "jackctl_parameter_get_type": ([jackctl_parameter_t_p], c_uint),
+    "jackctl_parameter_get_name": ([jackctl_parameter_t_p], c_char_p),
+    "jackctl_parameter_get_id": ([jackctl_parameter_t_p], c_char),
+    "jackctl_parameter_set_value": (
+        [jackctl_parameter_t_p, jackctl_parameter_value_p],
+        c_bool,
+    ),
+    "jackctl_parameter_get_value": ([jackctl_parameter_t_p], jackctl_parameter_value),
+    "jackctl_parameter_has_range_constraint": ([jackctl_parameter_t_p], c_bool),
+    "jackctl_parameter_get_range_constraint": (
+        [
+            jackctl_parameter_t_p,
+            jackctl_parameter_value_p,
+            jackctl_parameter_value_p,
+        ],
+        None,
+    ),
+    "jackctl_parameter_has_enum_constraint": ([jackctl_parameter_t_p], c_bool),
+    "jackctl_parameter_get_enum_constraints_count": (
+        [jackctl_parameter_t_p],
+        c_uint32,
+    ),
+    "jackctl_parameter_get_enum_constraint_value": (
+        [jackctl_parameter_t_p, c_uint32],
+        jackctl_parameter_value,
+    ),
+    "jackctl_parameter_get_enum_constraint_description": (
+        [jackctl_parameter_t_p, c_uint32],
+        c_char_p,
+    ),
+    "jackctl_parameter_constraint_is_strict": ([jackctl_parameter_t_p], c_bool),
+    "jackctl_driver_get_parameters": ([jackctl_driver_t_p], JSList_p),
+    "jackctl_driver_get_name": ([jackctl_driver_t_p], c_char_p),
+    "jackctl_internal_get_parameters": ([jackctl_internal_t_p], JSList_p),
+    "jackctl_internal_get_name": ([jackctl_internal_t_p], c_char_p),
+    "jackctl_server_create2": (
+        [OnDeviceAcquire, OnDeviceRelease, OnDeviceReservationLoop],
+        jackctl_server_t_p,
+    ),
+    "jackctl_server_open": ([jackctl_server_t_p, jackctl_driver_t_p], c_bool),
+    "jackctl_server_start": ([jackctl_server_t_p], c_bool),
+    "jackctl_server_close": ([jackctl_server_t_p], c_bool),
+    "jackctl_server_stop": ([jackctl_server_t_p], c_bool),
+    "jackctl_server_destroy": ([jackctl_server_t_p], c_void_p),
+    "jackctl_server_switch_master": (
+        [jackctl_server_t_p, jackctl_driver_t_p],
+        c_bool,
+    ),
+    "jackctl_server_add_slave": ([jackctl_server_t_p, jackctl_driver_t_p], c_bool),
+    "jackctl_server_remove_slave": (
+        [jackctl_server_t_p, jackctl_driver_t_p],
+        c_bool,
+    ),
+    "jackctl_server_get_parameters": ([jackctl_server_t_p], JSList_p),
+    "jackctl_server_get_drivers_list": ([jackctl_server_t_p], JSList_p),
+    "jackctl_server_get_internals_list": ([jackctl_server_t_p], JSList_p),
+    "jackctl_server_load_internal": (
+        [jackctl_server_t_p, jackctl_internal_t_p],
+        c_bool,
+    ),
+    "jackctl_server_unload_internal": (
+        [jackctl_server_t_p, jackctl_internal_t_p],
+        c_bool,
+    ),
+    # Newer API with opaque jackctl_sigmask_t *, older one returned sigset_t
+    "jackctl_setup_signals": ([c_uint], c_void_p),
+    "jackctl_wait_signals": ([c_void_p], None),
+    # Client API, libjackserver exports it for clients in server process.
+    # jack_client_open() is variadic. It's only called with JackServerName,
+    # so server name is declared as fixed argument: ctypes can't describe
+    # variadic functions, and leaving it undeclared skips type conversion.
+    "jack_client_open": (
+        [c_char_p, c_int, POINTER(c_int), c_char_p],
+        jack_client_t_p,
+    ),
+    "jack_client_close": ([jack_client_t_p], c_int),
+    "jack_activate": ([jack_client_t_p], c_int),
+    "jack_cpu_load": ([jack_client_t_p], c_float),
+    "jack_get_buffer_size": ([jack_client_t_p], c_uint32),
+    "jack_get_sample_rate": ([jack_client_t_p], c_uint32),
+    "jack_set_buffer_size": ([jack_client_t_p, c_uint32], c_int),
+    "jack_set_xrun_callback": ([jack_client_t_p, XRunCallback, c_void_p], c_int),
+    "jack_get_xrun_delayed_usecs": ([jack_client_t_p], c_float),
+    "jack_get_ports": (
+        [jack_client_t_p, c_char_p, c_char_p, c_ulong],
+        POINTER(c_char_p),
+    ),
+    "jack_free": ([c_void_p], None),
+    "jack_port_by_name": ([jack_client_t_p, c_char_p], jack_port_t_p),
+    "jack_port_get_latency_range": (
+        [jack_port_t_p, c_int, POINTER(jack_latency_range_t)],
+        None,
+    ),
+    "jack_set_error_function": ([PrintFunction], None),
+    "jack_set_info_function": ([PrintFunction], None),
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name == "lib":
+        return load_library()
+
+    try:
+        argtypes, restype = _functions[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    backend = get_backend()
+    if backend == "fake":
+        from jack_server import _fake
+
+        func = getattr(_fake, name)
+    elif backend == "cffi":
+        from jack_server import _cffi
+
+        func = getattr(_cffi, name)
+    else:
+        func = getattr(load_library(), name)
+        func.argtypes = argtypes
+        func.restype = restype
+
+    globals()[name] = func
+    return func
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from ctypes import _Pointer, byref, c_char_p, c_int, c_void_p, cast
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+import jack_server._lib as lib
+from jack_server._server import JackServerError, Server
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# From <jack/types.h>
+JackNoStartServer = 0x01
+JackServerName = 0x04
+JackPortIsInput = 0x1
+JackPortIsOutput = 0x2
+JackPortIsPhysical = 0x4
+JackCaptureLatency = 0
+JackPlaybackLatency = 1
+
+
+class MonitorNotOpenedError(JackServerError):
+    pass
+
+
+class BufferSizeNotSetError(JackServerError):
+    pass
+
+
+class MonitorSample(NamedTuple):
+    time: float
+    cpu_load: float
+    xruns: int
+    max_xrun_delay: float
+    buffer_size: int
+    sample_rate: int
+    latency: float
+    clients: int
+
+
+_metrics = (
+    ("cpu_load", "gauge", "DSP load in percent", "cpu_load"),
+    ("xruns_total", "counter", "Xruns since monitor start", "xruns"),
+    (
+        "max_xrun_delay_seconds",
+        "gauge",
+        "Longest xrun delay since previous sample",
+        "max_xrun_delay",
+    ),
+    ("buffer_size_frames", "gauge", "Frames per period", "buffer_size"),
+    ("sample_rate_hertz", "gauge", "Sample rate", "sample_rate"),
+    ("latency_seconds", "gauge", "Duration of a period", "latency"),
+    ("clients", "gauge", "Clients with ports", "clients"),
+)
+
+
+def _escape_label(value: str) -> str:
+    # Prometheus text format escapes backslash, double quote and line feed
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+SampleListener = Callable[["MonitorSample"], None]
+
+
+class Monitor:
+    server: Server
+    interval: float
+    samples: deque[MonitorSample]
+    xruns: int
+    _client: _Pointer[lib.jack_client_t] | None
+    _xrun_callback: Any
+    _max_xrun_delay: float
+    _lock: threading.Lock
+    _stopping: threading.Event
+    _thread: threading.Thread | None
+    _http: ThreadingHTTPServer | None
+    _listeners: list[SampleListener]
+
+    def __init__(
+        self, server: Server, *, interval: float = 1, maxlen: int = 3600
+    ) -> None:
+        self.server = server
+        self.interval = interval
+        self.samples = deque(maxlen=maxlen)
+        self.xruns = 0
+        self._client = None
+        self._xrun_callback = lib.XRunCallback(self._on_xrun)
+        self._max_xrun_delay = 0
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._http = None
+        self._listeners = []
+
+    def _on_xrun(self, arg: object) -> int:
+        # Called from JACK notification thread, not the realtime one
+        delay = lib.jack_get_xrun_delayed_usecs(self._client) / 1e6
+        with self._lock:
+            self.xruns += 1
+            self._max_xrun_delay = max(self._max_xrun_delay, delay)
+        return 0
+
+    def _open(self) -> None:
+        status = c_int()
+        client = lib.jack_client_open(
+            b"jack_server-monitor",
+            JackNoStartServer | JackServerName,
+            byref(status),
+            c_char_p(self.server.name.encode()),
+        )
+        if not client:
+            raise MonitorNotOpenedError(
+                f"Monitor client couldn't be opened, status: {status.value:#x}"
+            )
+        self._client = client
+        lib.jack_set_xrun_callback(client, self._xrun_callback, None)
+        lib.jack_activate(client)
+
+    def _close(self) -> None:
+        if self._client:
+            lib.jack_client_close(self._client)
+            self._client = None
+
+    def _get_ports(self, flags: int = 0) -> list[bytes]:
+        ports = lib.jack_get_ports(self._client, None, None, flags)
+        if not ports:
+            return []
+
+        names: list[bytes] = []
+        idx = 0
+        while ports[idx]:
+            names.append(ports[idx])
+            idx += 1
+        lib.jack_free(cast(ports, c_void_p))
+        return names
+
+    def _count_clients(self) -> int:
+        return len({name.partition(b":")[0] for name in self._get_ports()})
+
+    def _get_max_latency(self, flags: int, mode: int) -> int | None:
+        latency: int | None = None
+        range = lib.jack_latency_range_t()
+        for name in self._get_ports(JackPortIsPhysical | flags):
+            port = lib.jack_port_by_name(self._client, name)
+            if port:
+                lib.jack_port_get_latency_range(port, mode, byref(range))
+                latency = max(latency or 0, range.max)
+        return latency
+
+    def get_round_trip_latency(self) -> int | None:
+        # Frames from physical capture to physical playback ports, as JACK
+        # reports them for the running driver
+        if not self._client:
+            raise MonitorNotOpenedError("Monitor is not started")
+
+        capture = self._get_max_latency(JackPortIsOutput, JackCaptureLatency)
+        playback = self._get_max_latency(JackPortIsInput, JackPlaybackLatency)
+        if capture is None or playback is None:
+            return None
+        return capture + playback
+
+    def sample(self) -> MonitorSample:
+        if not self._client:
+            raise MonitorNotOpenedError("Monitor is not started")
+
+        buffer_size = lib.jack_get_buffer_size(self._client)
+        sample_rate = lib.jack_get_sample_rate(self._client)
+        with self._lock:
+            xruns, max_xrun_delay = self.xruns, self._max_xrun_delay
+            self._max_xrun_delay = 0
+
+        sample = MonitorSample(
+            time=time.time(),
+            cpu_load=lib.jack_cpu_load(self._client),
+            xruns=xruns,
+            max_xrun_delay=max_xrun_delay,
+            buffer_size=buffer_size,
+            sample_rate=sample_rate,
+            latency=buffer_size / sample_rate if sample_rate else 0,
+            clients=self._count_clients(),
+        )
+        self.samples.append(sample)
+        for listener in self._listeners:
+            listener(sample)
+        return sample
+
+    def add_listener(self, listener: SampleListener) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: SampleListener) -> None:
+        self._listeners.remove(listener)
+
+    def set_buffer_size(self, frames: int) -> None:
+        # Engine is reconfigured at runtime, without reopening the driver
+        if not self._client:
+            raise MonitorNotOpenedError("Monitor is not started")
+        if lib.jack_set_buffer_size(self._client, frames):
+            raise BufferSizeNotSetError(f"Buffer size couldn't be set to {frames}")
+
+    @property
+    def latest(self) -> MonitorSample | None:
+        return self.samples[-1] if self.samples else None
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        if self._thread:
+            return
+
+        self._open()
+        self._stopping.clear()
+        self.sample()
+        self._thread = threading.Thread(
+            target=self._run, name="jack_server-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._http:
+            self._http.shutdown()
+            self._http.server_close()
+            self._http = None
+
+        if self._thread:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+        self._close()
+
+    def render_prometheus(self) -> str:
+        sample = self.latest
+        labels = f'{{server="{_escape_label(self.server.name)}"}}'
+        lines: list[str] = []
+
+        for name, type_, help_, field in _metrics:
+            lines.append(f"# HELP jack_server_{name} {help_}")
+            lines.append(f"# TYPE jack_server_{name} {type_}")
+            if sample:
+                lines.append(f"jack_server_{name}{labels} {getattr(sample, field)}")
+
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9400) -> tuple[str, int]:
+        # Imported here, http.server is slow to import and rarely needed
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        monitor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = monitor.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._http = ThreadingHTTPServer((host, port), Handler)
+        self._http.daemon_threads = True
+        threading.Thread(
+            target=self._http.serve_forever, name="jack_server-metrics", daemon=True
+        ).start()
+        return self._http.server_address[:2]  # type: ignore
+
+    def __enter__(self) -> Monitor:
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        return (
+            f"<jack_server.Monitor server={self.server.name!r} "
+            + f"samples={len(self.samples)}>"
+        )
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import ipaddress
+from typing import Literal
+
+from jack_server._output import add_output_listener, remove_output_listener
+from jack_server._parameter import ParameterValueError
+
+DEFAULT_MULTICAST_IP = "225.3.19.154"
+DEFAULT_PORT = 19000
+
+NetState = Literal["stopped", "waiting", "connecting", "connected"]
+
+# Substrings of NetJACK info and error messages mapped to connection events
+_events = (
+    ("listening on", "waiting"),
+    ("waiting for a master", "waiting"),
+    ("sending parameters to", "connecting"),
+    ("initializing connection with", "connecting"),
+    ("new netmaster started", "connected"),
+    ("netdriver started", "connected"),
+    ("exiting netmaster", "disconnected"),
+    ("connection lost", "disconnected"),
+    ("restarting driver", "disconnected"),
+)
+
+
+def validate_net_params(multicast_ip: str, port: int) -> None:
+    try:
+        address = ipaddress.ip_address(multicast_ip)
+    except ValueError:
+        raise ParameterValueError(f"Invalid IP address: {multicast_ip!r}") from None
+    if not address.is_multicast:
+        raise ParameterValueError(f"Not a multicast address: {multicast_ip!r}")
+
+    if not 0 < port < 65536:
+        raise ParameterValueError(f"Invalid UDP port: {port!r}")
+
+
+class NetStatus:
+    state: NetState
+    connections: int
+
+    def __init__(self) -> None:
+        self.state = "stopped"
+        self.connections = 0
+
+    def feed(self, level: int, message: str) -> None:
+        lowered = message.lower()
+
+        for marker, event in _events:
+            if marker not in lowered:
+                continue
+
+            if event == "connected":
+                self.connections += 1
+                self.state = "connected"
+            elif event == "disconnected":
+                self.connections = max(self.connections - 1, 0)
+                self.state = "connected" if self.connections else "waiting"
+            elif not self.connections:
+                self.state = event  # type: ignore
+            return
+
+    def attach(self) -> None:
+        add_output_listener(self.feed)
+
+    def detach(self) -> None:
+        remove_output_listener(self.feed)
+
+    def __repr__(self) -> str:
+        return (
+            f"<jack_server.NetStatus state={self.state} "
+            + f"connections={self.connections}>"
+        )
@@ -1,40 +1,224 @@
 from __future__ import annotations
 
+import logging
+import sys
+import threading
+import time
+from collections import deque
 from functools import wraps
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, Deque, Tuple
 
 import jack_server._lib as lib
 
 if TYPE_CHECKING:
     from ctypes import _FuncPointer
 
-_dont_garbage_collect: list[object] = []
+# Only current thunks are kept alive, replaced ones are released
+_callbacks: dict[str, _FuncPointer] = {}
+# Thunks replaced by queued logging, reinstalled when it is disabled
+_previous_callbacks: dict[str, _FuncPointer] = {}
+
+OutputListener = Callable[[int, str], None]
+_listeners: list[OutputListener] = []
+
+
+def add_output_listener(listener: OutputListener) -> None:
+    _listeners.append(listener)
+    # Listeners need output to go through Python. Keep JACK's default
+    # behaviour of printing to stdout and stderr.
+    if "info" not in _callbacks:
+        set_info_function(_print_info)
+    if "error" not in _callbacks:
+        set_error_function(_print_error)
+
+
+def remove_output_listener(listener: OutputListener) -> None:
+    _listeners.remove(listener)
+
+
+def _print_info(message: str) -> None:
+    print(message, file=sys.stdout, flush=True)
+
+
+def _print_error(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def _dispatch(level: int, text: str) -> None:
+    for listener in _listeners:
+        listener(level, text)
 
 
 def _wrap_error_or_info_callback(
-    callback: Callable[[str], None] | None,
+    callback: Callable[[str], None] | None, level: int
 ) -> _FuncPointer:
+    # Without queued logging listeners are called right in JACK thread
     if callback:
 
         @wraps(callback)
         def wrapped_callback(  # pyright: ignore[reportRedeclaration]
             message: bytes,
         ) -> None:
-            callback(message.decode())
+            text = message.decode(errors="replace")
+            callback(text)
+            if _listeners:
+                _dispatch(_classify(level, text), text)
 
     else:
 
         def wrapped_callback(message: bytes) -> None:
-            pass
+            if _listeners:
+                text = message.decode(errors="replace")
+                _dispatch(_classify(level, text), text)
 
-    c_callback = lib.PrintFunction(wrapped_callback)
-    _dont_garbage_collect.append(c_callback)
-    return c_callback
+    return lib.PrintFunction(wrapped_callback)
+
+
+def _set_info_thunk(c_callback: _FuncPointer) -> None:
+    lib.jack_set_info_function(c_callback)
+    _callbacks["info"] = c_callback
+
+
+def _set_error_thunk(c_callback: _FuncPointer) -> None:
+    lib.jack_set_error_function(c_callback)
+    _callbacks["error"] = c_callback
 
 
 def set_info_function(callback: Callable[[str], None] | None) -> None:
-    lib.jack_set_info_function(_wrap_error_or_info_callback(callback))
+    _set_info_thunk(_wrap_error_or_info_callback(callback, logging.INFO))
 
 
 def set_error_function(callback: Callable[[str], None] | None) -> None:
-    lib.jack_set_error_function(_wrap_error_or_info_callback(callback))
+    _set_error_thunk(_wrap_error_or_info_callback(callback, logging.ERROR))
+
+
+def _classify(level: int, message: str) -> int:
+    lowered = message.lower()
+    if "xrun" in lowered or "warning" in lowered:
+        return logging.WARNING
+    return level
+
+
+class _LogQueue:
+    logger: logging.Logger
+    rate_limit: int
+    interval: float
+    _buffer: Deque[Tuple[int, bytes]]
+    _received: int
+    _consumed: int
+    _dropped: int
+    _stop: threading.Event
+    _thread: threading.Thread
+
+    def __init__(
+        self, logger: logging.Logger, maxlen: int, rate_limit: int, interval: float
+    ) -> None:
+        self.logger = logger
+        self.rate_limit = rate_limit
+        self.interval = interval
+        self._buffer = deque(maxlen=maxlen)
+        self._received = 0
+        self._consumed = 0
+        self._dropped = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="jack_server-logging", daemon=True
+        )
+
+    # These are called from JACK threads: only copy the message
+    def put_info(self, message: bytes) -> None:
+        self._buffer.append((logging.INFO, message))
+        self._received += 1
+
+    def put_error(self, message: bytes) -> None:
+        self._buffer.append((logging.ERROR, message))
+        self._received += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        window_start = time.monotonic()
+        emitted = suppressed = 0
+
+        while True:
+            stopping = self._stop.wait(self.interval)
+
+            while self._buffer:
+                level, message = self._buffer.popleft()
+                self._consumed += 1
+                text = message.decode(errors="replace")
+                level = _classify(level, text)
+
+                # Listeners see every message, rate limit applies to logging only
+                _dispatch(level, text)
+
+                if emitted < self.rate_limit:
+                    self.logger.log(level, text)
+                    emitted += 1
+                else:
+                    suppressed += 1
+
+            now = time.monotonic()
+            if stopping or now - window_start >= 1:
+                # Deque silently discards oldest messages when full
+                total_dropped = self._received - self._consumed - len(self._buffer)
+                dropped = max(total_dropped - self._dropped, 0)
+                self._dropped += dropped
+                if suppressed or dropped:
+                    self.logger.warning(
+                        "Suppressed %s JACK messages, dropped %s on buffer overflow",
+                        suppressed,
+                        dropped,
+                    )
+                window_start = now
+                emitted = suppressed = 0
+
+            if stopping:
+                return
+
+
+_log_queue: _LogQueue | None = None
+
+
+def enable_queued_logging(
+    logger: logging.Logger | None = None,
+    *,
+    maxlen: int = 1024,
+    rate_limit: int = 100,
+    interval: float = 0.1,
+) -> None:
+    global _log_queue
+
+    disable_queued_logging()
+    _previous_callbacks.update(_callbacks)
+    queue = _LogQueue(
+        logger or logging.getLogger("jack_server"), maxlen, rate_limit, interval
+    )
+    queue.start()
+    _set_info_thunk(lib.PrintFunction(queue.put_info))
+    _set_error_thunk(lib.PrintFunction(queue.put_error))
+    _log_queue = queue
+
+
+def disable_queued_logging() -> None:
+    global _log_queue
+
+    if _log_queue is None:
+        return
+
+    # Without previously set functions, print like JACK does by default
+    if info := _previous_callbacks.pop("info", None):
+        _set_info_thunk(info)
+    else:
+        set_info_function(_print_info)
+    if error := _previous_callbacks.pop("error", None):
+        _set_error_thunk(error)
+    else:
+        set_error_function(_print_error)
+    _log_queue.stop()
+    _log_queue = None
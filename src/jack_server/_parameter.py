@@ -1,52 +1,77 @@
 from __future__ import annotations
 
+from contextlib import nullcontext
 from ctypes import _Pointer, pointer
-from typing import Literal, Union, cast
+from typing import ContextManager, Dict, Literal, Mapping, Optional, Tuple, Union, cast
 
 import jack_server._lib as lib
 from jack_server._jslist import iterate_jslist
 
 ValueType = Union[int, str, bytes, bool]
 
+# JackParamInt, JackParamUInt, JackParamChar, JackParamString, JackParamBool
+_value_fields = {1: "i", 2: "ui", 3: "c", 4: "ss", 5: "b"}
+
+_Constraints = Tuple[
+    Optional[Tuple[ValueType, ValueType]], Optional[Dict[ValueType, str]], bool
+]
+
+
+# Parameters that don't belong to a server are written without locking
+_no_lock: ContextManager[object] = nullcontext()
+
+
+class ParameterValueError(ValueError):
+    pass
+
 
 class Parameter:
+    __slots__ = ("_ptr", "_name", "type", "_constraints", "_lock")
+
     _ptr: _Pointer[lib.jackctl_parameter_t]
+    _name: str
     type: Literal[1, 2, 3, 4, 5]
-
-    def __init__(self, ptr: _Pointer[lib.jackctl_parameter_t]) -> None:
+    _constraints: _Constraints | None
+    _lock: ContextManager[object]
+
+    def __init__(
+        self,
+        ptr: _Pointer[lib.jackctl_parameter_t],
+        lock: ContextManager[object] = _no_lock,
+    ) -> None:
+        # Lock of the owning server, so that writes don't race with its
+        # lifecycle operations
+        self._lock = lock
         self._ptr = ptr
+        self._name = cast(bytes, lib.jackctl_parameter_get_name(self._ptr)).decode()
         self.type = lib.jackctl_parameter_get_type(self._ptr)
+        self._constraints = None
 
     @property
     def name(self) -> str:
-        return cast(bytes, lib.jackctl_parameter_get_name(self._ptr)).decode()
+        return self._name
 
     @property
-    def value(self) -> ValueType:  # pragma: no cover
-        val = cast(
-            lib.jackctl_parameter_value, lib.jackctl_parameter_get_value(self._ptr)
-        )
+    def id(self) -> str:
+        # Short command line option, like "r" for "rate"
+        return cast(bytes, lib.jackctl_parameter_get_id(self._ptr)).decode()
 
-        if self.type == 1:
-            # JackParamInt
-            return val.i
-        elif self.type == 2:
-            # JackParamUInt
-            return val.ui
-        elif self.type == 3:
-            # JackParamChar
-            return val.c
-        elif self.type == 4:
-            # JackParamString
-            return val.ss
-        elif self.type == 5:
-            # JackParamBool
-            return val.b
-        else:
-            raise NotImplementedError
+    def _read(self, val: lib.jackctl_parameter_value) -> ValueType:
+        try:
+            field = _value_fields[self.type]
+        except KeyError:
+            raise NotImplementedError from None
+
+        return getattr(val, field)
+
+    @property
+    def value(self) -> ValueType:  # pragma: no cover
+        return self._read(lib.jackctl_parameter_get_value(self._ptr))
 
     @value.setter
     def value(self, val: ValueType) -> None:  # pragma: no cover
+        self.validate(val)
+        val = self._normalize(val)
         val_obj = lib.jackctl_parameter_value()
 
         if self.type == 1:
@@ -57,7 +82,7 @@ class Parameter:
             val_obj.ui = int(val)
         elif self.type == 3:
             # JackParamChar
-            assert isinstance(val, str) and len(val) == 1
+            assert isinstance(val, bytes) and len(val) == 1
             val_obj.c = val
         elif self.type == 4:
             # JackParamString
@@ -69,17 +94,109 @@ class Parameter:
         else:
             raise NotImplementedError
 
-        lib.jackctl_parameter_set_value(self._ptr, pointer(val_obj))
+        with self._lock:
+            set_ = lib.jackctl_parameter_set_value(self._ptr, pointer(val_obj))
+        if not set_:
+            raise ParameterValueError(
+                f"JACK rejected value {val!r} for parameter {self.name!r}"
+            )
+
+    def _get_constraints(self) -> _Constraints:
+        # Constraints are defined along with parameter and don't change later
+        if self._constraints is not None:
+            return self._constraints
+
+        range_: tuple[ValueType, ValueType] | None = None
+        enum: dict[ValueType, str] | None = None
+
+        if lib.jackctl_parameter_has_range_constraint(self._ptr):
+            min_obj = lib.jackctl_parameter_value()
+            max_obj = lib.jackctl_parameter_value()
+            lib.jackctl_parameter_get_range_constraint(
+                self._ptr, pointer(min_obj), pointer(max_obj)
+            )
+            range_ = (self._read(min_obj), self._read(max_obj))
+
+        if lib.jackctl_parameter_has_enum_constraint(self._ptr):
+            enum = {}
+            for idx in range(
+                lib.jackctl_parameter_get_enum_constraints_count(self._ptr)
+            ):
+                val = lib.jackctl_parameter_get_enum_constraint_value(self._ptr, idx)
+                descr = lib.jackctl_parameter_get_enum_constraint_description(
+                    self._ptr, idx
+                )
+                enum[self._read(val)] = cast(bytes, descr).decode()
+
+        strict = bool(lib.jackctl_parameter_constraint_is_strict(self._ptr))
+        self._constraints = (range_, enum, strict)
+        return self._constraints
+
+    @property
+    def range(self) -> tuple[ValueType, ValueType] | None:
+        return self._get_constraints()[0]
+
+    @property
+    def enum(self) -> dict[ValueType, str] | None:
+        return self._get_constraints()[1]
+
+    @property
+    def is_strict(self) -> bool:
+        return self._get_constraints()[2]
+
+    def _normalize(self, val: ValueType) -> ValueType:
+        if self.type == 3 and isinstance(val, str):
+            # JackParamChar values are read as bytes, but may be set as str
+            return val.encode()
+        return val
+
+    def validate(self, val: ValueType) -> None:
+        range_, enum, strict = self._get_constraints()
+        val = self._normalize(val)
+
+        if range_ is not None:
+            min_, max_ = range_
+            if not min_ <= val <= max_:  # type: ignore
+                raise ParameterValueError(
+                    f"Value {val!r} for parameter {self.name!r} is out of range "
+                    + f"[{min_!r}, {max_!r}]"
+                )
+
+        if enum is not None and strict and val not in enum:
+            raise ParameterValueError(
+                f"Value {val!r} for parameter {self.name!r} is not one of "
+                + ", ".join(repr(v) for v in enum)
+            )
 
     def __repr__(self) -> str:
         return f"<jack_server.Parameter name={self.name!r} value={self.value!r}>"
 
 
-def get_params_from_jslist(jslist: _Pointer[lib.JSList]) -> dict[str, Parameter]:
+def get_params_from_jslist(
+    jslist: _Pointer[lib.JSList], lock: ContextManager[object] = _no_lock
+) -> dict[str, Parameter]:
     params: dict[str, Parameter] = {}
 
     for ptr in iterate_jslist(jslist, lib.jackctl_parameter_t_p):
-        param = Parameter(ptr)
+        param = Parameter(ptr, lock)
         params[param.name] = param
 
     return params
+
+
+def snapshot_params(params: Mapping[str, Parameter]) -> dict[str, ValueType]:
+    return {name: param.value for name, param in params.items()}
+
+
+def apply_params(
+    params: Mapping[str, Parameter], values: Mapping[str, ValueType]
+) -> list[str]:
+    changed: list[str] = []
+
+    for name, value in values.items():
+        param = params[name]
+        if param.value != param._normalize(value):
+            param.value = value
+            changed.append(name)
+
+    return changed
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+from typing import Callable, Generic, TypeVar
+
+from jack_server._isolated import IsolatedServer
+from jack_server._server import JackServerError, Server
+
+_S = TypeVar("_S", Server, IsolatedServer)
+
+logger = logging.getLogger("jack_server")
+
+
+class SessionNotFoundError(JackServerError):
+    pass
+
+
+class PoolClosedError(JackServerError):
+    pass
+
+
+class ServerPool(Generic[_S]):
+    factory: Callable[[str], _S]
+    size: int
+    prefix: str
+    open: bool
+    sessions: dict[str, _S]
+    _ready: list[_S]
+    _pending: dict[str, threading.Event]
+    _lock: threading.Lock
+    _counter: itertools.count[int]
+    _refill_thread: threading.Thread | None
+    _closed: bool
+
+    def __init__(
+        self,
+        factory: Callable[[str], _S],
+        size: int = 1,
+        *,
+        prefix: str = "jack_server",
+        open: bool = True,
+    ) -> None:
+        self.factory = factory
+        self.size = size
+        self.prefix = prefix
+        self.open = open
+        self.sessions = {}
+        self._ready = []
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._refill_thread = None
+        self._closed = False
+
+    def _prepare(self) -> _S:
+        server = self.factory(f"{self.prefix}-{next(self._counter)}")
+        try:
+            server.prepare(open=self.open)
+        except BaseException:
+            _dispose(server)
+            raise
+        return server
+
+    def fill(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed or len(self._ready) >= self.size:
+                    return
+            server = self._prepare()
+            with self._lock:
+                if self._closed:
+                    _dispose(server)
+                    return
+                self._ready.append(server)
+
+    def _refill(self) -> None:
+        try:
+            self.fill()
+        except Exception:
+            logger.exception("Server pool couldn't be refilled")
+
+    def _refill_in_background(self) -> None:
+        with self._lock:
+            if self._refill_thread and self._refill_thread.is_alive():
+                return
+            self._refill_thread = threading.Thread(
+                target=self._refill, name="jack_server-pool", daemon=True
+            )
+            self._refill_thread.start()
+
+    @property
+    def ready(self) -> int:
+        return len(self._ready)
+
+    def acquire(self, session: str) -> _S:
+        server: _S | None = None
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise PoolClosedError("Server pool is closed")
+                if session in self.sessions:
+                    return self.sessions[session]
+                # Session is reserved, so concurrent calls wait for this one
+                pending = self._pending.get(session)
+                if pending is None:
+                    pending = self._pending[session] = threading.Event()
+                    server = self._ready.pop(0) if self._ready else None
+                    break
+            # Activation in another thread could fail, check again
+            pending.wait()
+
+        try:
+            # Pool is exhausted: pay full cost now rather than fail
+            if server is None:
+                server = self._prepare()
+            server.activate()
+        except BaseException:
+            with self._lock:
+                del self._pending[session]
+            pending.set()
+            if server is not None:
+                _dispose(server)
+            raise
+
+        with self._lock:
+            del self._pending[session]
+            closed = self._closed
+            if not closed:
+                self.sessions[session] = server
+        pending.set()
+
+        if closed:
+            _dispose(server)
+            raise PoolClosedError("Server pool is closed")
+        self._refill_in_background()
+        return server
+
+    def release(self, session: str) -> None:
+        with self._lock:
+            try:
+                server = self.sessions.pop(session)
+            except KeyError:
+                raise SessionNotFoundError(f"Session not found: {session}") from None
+        _dispose(server)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            servers = [*self._ready, *self.sessions.values()]
+            self._ready.clear()
+            self.sessions.clear()
+            thread = self._refill_thread
+
+        if thread:
+            thread.join()
+        for server in servers:
+            _dispose(server)
+
+    def __enter__(self) -> ServerPool[_S]:
+        self.fill()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"<jack_server.ServerPool ready={self.ready} "
+            + f"sessions={len(self.sessions)}>"
+        )
+
+
+def _dispose(server: Server | IsolatedServer) -> None:
+    server.close()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import ctypes
+import os
+import sys
+import threading
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+if TYPE_CHECKING:
+    from jack_server._server import Server
+
+# From <sys/mman.h>
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+
+_policies = {0: "other", 1: "fifo", 2: "rr", 3: "batch", 5: "idle"}
+
+
+class RealtimeThread(NamedTuple):
+    tid: int
+    name: str
+    policy: str
+    priority: int
+    cpus: frozenset[int] | None
+
+
+class RealtimeReport(NamedTuple):
+    threads: list[RealtimeThread]
+    rtprio_limit: int | None
+    memlock_limit: int | None
+    locked: bool
+    problems: list[str]
+
+    @property
+    def realtime(self) -> bool:
+        return any(t.policy in ("fifo", "rr") for t in self.threads)
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+
+def _read_thread(tid: int) -> RealtimeThread:
+    try:
+        with open(f"/proc/self/task/{tid}/comm") as f:
+            name = f.read().strip()
+    except OSError:
+        name = ""
+    try:
+        policy = _policies.get(os.sched_getscheduler(tid), "unknown")
+        priority = os.sched_getparam(tid).sched_priority
+    except OSError:
+        policy, priority = "unknown", 0
+    try:
+        cpus = frozenset(os.sched_getaffinity(tid))
+    except OSError:
+        cpus = None
+    return RealtimeThread(tid, name, policy, priority, cpus)
+
+
+def get_task_ids() -> set[int]:
+    try:
+        return {int(tid) for tid in os.listdir("/proc/self/task")}
+    except OSError:
+        return set()
+
+
+def get_new_thread_ids(before: set[int]) -> set[int]:
+    # Threads that appeared since the snapshot and weren't started by Python
+    python_ids = {t.native_id for t in threading.enumerate() if t.native_id}
+    return get_task_ids() - before - python_ids
+
+
+def get_jack_thread_ids(server: Server) -> list[int]:
+    # Threads that JACK started while opening and starting the server, other
+    # native threads of the process (numpy, other libraries) are left alone
+    return sorted(server._threads & get_task_ids())
+
+
+def _get_limit(name: str) -> int | None:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        return None
+
+    if not hasattr(resource, name):
+        return None
+    soft, _ = resource.getrlimit(getattr(resource, name))
+    return -1 if soft == resource.RLIM_INFINITY else soft
+
+
+def _mlockall() -> str | None:
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.mlockall(MCL_CURRENT | MCL_FUTURE) == 0:
+        return None
+    return os.strerror(ctypes.get_errno())
+
+
+def tune_realtime(
+    server: Server, *, cpus: Iterable[int] | None = None, mlock: bool = False
+) -> RealtimeReport:
+    problems: list[str] = []
+    if not sys.platform.startswith("linux"):
+        problems.append("Realtime tuning is supported only on Linux")
+        return RealtimeReport([], None, None, False, problems)
+
+    if not server.realtime:
+        problems.append("Realtime is disabled for server, set realtime=True")
+    if not server._started:
+        problems.append("Server is not started, JACK threads don't exist yet")
+
+    priority = server.realtime_priority
+    rtprio_limit = _get_limit("RLIMIT_RTPRIO")
+    if rtprio_limit is not None and rtprio_limit != -1 and rtprio_limit < priority:
+        if os.geteuid() != 0:
+            problems.append(
+                f"RLIMIT_RTPRIO is {rtprio_limit}, lower than realtime priority "
+                + f"{priority}: add user to audio group or raise rtprio "
+                + "in /etc/security/limits.conf"
+            )
+
+    tids = get_jack_thread_ids(server)
+    if cpus is not None:
+        cpu_set = set(cpus)
+        for tid in tids:
+            try:
+                os.sched_setaffinity(tid, cpu_set)
+            except OSError as exc:
+                problems.append(f"Couldn't pin thread {tid}: {exc.strerror}")
+
+    memlock_limit = _get_limit("RLIMIT_MEMLOCK")
+    locked = False
+    if mlock:
+        if error := _mlockall():
+            problems.append(
+                f"mlockall failed: {error}, RLIMIT_MEMLOCK is {memlock_limit}: "
+                + "set memlock to unlimited in /etc/security/limits.conf"
+            )
+        else:
+            locked = True
+
+    report = RealtimeReport(
+        [_read_thread(tid) for tid in tids],
+        rtprio_limit,
+        memlock_limit,
+        locked,
+        problems,
+    )
+    if server.realtime and server._started and not report.realtime:
+        problems.append("No JACK thread got realtime scheduling policy")
+    return report
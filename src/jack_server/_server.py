@@ -1,18 +1,57 @@
 from __future__ import annotations
 
+import threading
+from contextlib import contextmanager
 from ctypes import _Pointer
-from typing import Callable, cast
+from functools import wraps
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Literal,
+    Mapping,
+    TypeVar,
+    cast,
+)
 
 import jack_server._lib as lib
-from jack_server._driver import Driver, SampleRate
-from jack_server._jslist import iterate_jslist
-from jack_server._parameter import Parameter, get_params_from_jslist
+from jack_server import _discovery
+from jack_server._config import ServerConfig
+from jack_server._driver import Driver, SampleRate, get_drivers_from_jslist
+from jack_server._internal import InternalClient, get_internals_from_jslist
+from jack_server._net import (
+    DEFAULT_MULTICAST_IP,
+    DEFAULT_PORT,
+    NetStatus,
+    validate_net_params,
+)
+from jack_server._parameter import (
+    Parameter,
+    ParameterValueError,
+    ValueType,
+    apply_params,
+    get_params_from_jslist,
+    snapshot_params,
+)
+from jack_server._realtime import (
+    RealtimeReport,
+    get_new_thread_ids,
+    get_task_ids,
+    tune_realtime,
+)
+from jack_server._stats import ServerStats
 
 
 class JackServerError(RuntimeError):
     pass
 
 
+class ServerNotCreatedError(JackServerError):
+    pass
+
+
 class ServerNotStartedError(JackServerError):
     pass
 
@@ -25,21 +64,111 @@ class DriverNotFoundError(JackServerError):
     pass
 
 
+Snapshot = Dict[str, Dict[str, ValueType]]
+
+
+class DriverNotSwitchedError(JackServerError):
+    pass
+
+
+class SlaveNotAddedError(JackServerError):
+    pass
+
+
+class SlaveNotRemovedError(JackServerError):
+    pass
+
+
+class ServerAlreadyRunningError(JackServerError):
+    pass
+
+
+class ServerStateError(JackServerError):
+    pass
+
+
+class ServerClosedError(ServerStateError):
+    pass
+
+
+class InternalClientNotFoundError(JackServerError):
+    pass
+
+
+class InternalClientNotLoadedError(JackServerError):
+    pass
+
+
+class InternalClientNotUnloadedError(JackServerError):
+    pass
+
+
 class SetByJack:
     pass
 
 
 SetByJack_: SetByJack = SetByJack()
 
+ServerState = Literal["created", "configured", "opened", "started", "closed"]
+
+# Configured is validated, but not opened. Server is closed for good.
+_transitions: dict[ServerState, tuple[ServerState, ...]] = {
+    "created": ("configured", "closed"),
+    "configured": ("opened", "closed"),
+    "opened": ("started", "configured"),
+    "started": ("opened",),
+    "closed": (),
+}
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _locked(func: _F) -> _F:
+    # Calls from different threads are serialized per server
+    @wraps(func)
+    def wrapper(self: Server, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            if self._state == "closed":
+                raise ServerClosedError("Server is closed")
+            return func(self, *args, **kwargs)
+
+    return cast(_F, wrapper)
+
+
+def _configure_driver(
+    driver: Driver,
+    *,
+    device: str | SetByJack = SetByJack_,
+    rate: SampleRate | SetByJack = SetByJack_,
+    period: int | SetByJack = SetByJack_,
+    nperiods: int | SetByJack = SetByJack_,
+) -> None:
+    if not isinstance(device, SetByJack):
+        driver.device = device  # pragma: no cover (does not work with dummy driver)
+    if not isinstance(rate, SetByJack):
+        driver.rate = rate
+    if not isinstance(period, SetByJack):
+        driver.period = period
+    if not isinstance(
+        nperiods, SetByJack
+    ):  # pragma: no cover (works only with alsa driver)
+        driver.nperiods = nperiods
+
 
 class Server:
     driver: Driver
     params: dict[str, Parameter]
+    _drivers: dict[str, Driver] | None
+    _internals: dict[str, InternalClient] | None
+    _internals_to_load: list[InternalClient]
+    _slaves: list[Driver]
+    _threads: set[int]
     _ptr: _Pointer[lib.jackctl_server_t]
-    _created: bool
-    _opened: bool
-    _started: bool
+    _state: ServerState
+    _lock: threading.RLock
     _dont_garbage_collect: list[object]
+    stats: ServerStats
+    net_status: NetStatus | None
 
     def __init__(
         self,
@@ -47,20 +176,29 @@ class Server:
         name: str | SetByJack = SetByJack_,
         sync: bool | SetByJack = SetByJack_,
         realtime: bool | SetByJack = SetByJack_,  # TODO: Add docs
+        realtime_priority: int | SetByJack = SetByJack_,
         driver: str,
         device: str | SetByJack = SetByJack_,
         rate: SampleRate | SetByJack = SetByJack_,
         period: int | SetByJack = SetByJack_,
         nperiods: int | SetByJack = SetByJack_,
     ) -> None:
-        self._created = False
-        self._opened = False
-        self._started = False
+        # Nothing to destroy until library object is created
+        self._state = "closed"
+        self._lock = threading.RLock()
         self._dont_garbage_collect = []
+        self._drivers = None
+        self._internals = None
+        self._internals_to_load = []
+        self._slaves = []
+        self._threads = set()
+        self.stats = ServerStats()
+        self.net_status = None
 
         self._create()
         self._init_params()
-        self.driver = self._get_driver_by_name(driver)
+        with self.stats.measure(self, "get_driver"):
+            self.driver = self._get_driver_by_name(driver)
 
         if not isinstance(name, SetByJack):
             self.name = name
@@ -68,18 +206,11 @@ class Server:
             self.sync = sync
         if not isinstance(realtime, SetByJack):
             self.realtime = realtime
-        if not isinstance(device, SetByJack):
-            self.driver.device = (
-                device  # pragma: no cover (does not work with dummy driver)
-            )
-        if not isinstance(rate, SetByJack):
-            self.driver.rate = rate
-        if not isinstance(period, SetByJack):
-            self.driver.period = period
-        if not isinstance(
-            nperiods, SetByJack
-        ):  # pragma: no cover (works only with alsa driver)
-            self.driver.nperiods = nperiods
+        if not isinstance(realtime_priority, SetByJack):
+            self.realtime_priority = realtime_priority
+        _configure_driver(
+            self.driver, device=device, rate=rate, period=period, nperiods=nperiods
+        )
 
     def _create(
         self,
@@ -103,63 +234,465 @@ class Server:
         args = (c_on_device_acquire, c_on_device_release, c_on_device_reservation_loop)
         self._dont_garbage_collect.extend(args)
 
-        self._ptr = lib.jackctl_server_create2(*args)
-        self._created = True
+        with self.stats.measure(self, "create"):
+            self._ptr = lib.jackctl_server_create2(*args)
+        if not self._ptr:
+            raise ServerNotCreatedError("Server couldn't be created")
+        self._state = "created"
+
+    def _set_state(self, state: ServerState) -> None:
+        if state not in _transitions[self._state]:
+            raise ServerStateError(f"Invalid transition: {self._state} -> {state}")
+        self._state = state
+
+    @property
+    def state(self) -> ServerState:
+        return self._state
+
+    # Flags of previous versions, derived from state
+
+    @property
+    def _created(self) -> bool:
+        return self._state != "closed"
+
+    @property
+    def _opened(self) -> bool:
+        return self._state in ("opened", "started")
+
+    @property
+    def _started(self) -> bool:
+        return self._state == "started"
 
     def _open(self) -> None:
-        self._opened = lib.jackctl_server_open(self._ptr, self.driver._ptr)
-        if not self._opened:
+        tasks = get_task_ids()
+        with self.stats.measure(self, "open"):
+            opened = lib.jackctl_server_open(self._ptr, self.driver._ptr)
+        self._threads |= get_new_thread_ids(tasks)
+        if not opened:
             raise ServerNotOpenedError("Server couldn't be opened")
+        if self._state == "created":
+            self._set_state("configured")
+        self._set_state("opened")
 
     def _start(self) -> None:
-        self._started = lib.jackctl_server_start(self._ptr)
-        if not self._started:
+        tasks = get_task_ids()
+        with self.stats.measure(self, "start"):
+            started = lib.jackctl_server_start(self._ptr)
+        self._threads |= get_new_thread_ids(tasks)
+        if not started:
             raise ServerNotStartedError("Server couldn't be started")
+        self._set_state("started")
 
     def _close(self) -> None:
         if self._opened:
-            lib.jackctl_server_close(self._ptr)
-            self._opened = False
+            with self.stats.measure(self, "close"):
+                lib.jackctl_server_close(self._ptr)
+            self._set_state("configured")
+            self._threads.clear()
+
+            # Internal clients are closed along with the engine
+            for internal in (self._internals or {}).values():
+                internal.loaded = False
 
     def _stop(self) -> None:
         if self._started:
-            lib.jackctl_server_stop(self._ptr)
-            self._started = False
+            with self.stats.measure(self, "stop"):
+                lib.jackctl_server_stop(self._ptr)
+            self._set_state("opened")
 
     def _destroy(self) -> None:
+        if self.net_status:
+            self.net_status.detach()
+            self.net_status = None
+
         if self._created:
-            lib.jackctl_server_destroy(self._ptr)
-            self._created = False
+            with self.stats.measure(self, "destroy"):
+                lib.jackctl_server_destroy(self._ptr)
+            self._set_state("closed")
+
+    def validate(self) -> None:
+        errors: list[str] = []
+
+        for params in (
+            self.params,
+            self.driver.params,
+            *(slave.params for slave in self._slaves),
+        ):
+            for param in params.values():
+                try:
+                    param.validate(param.value)
+                except ParameterValueError as exc:
+                    errors.append(str(exc))
+
+        if errors:
+            raise ParameterValueError("\n".join(errors))
+
+    @_locked
+    def prepare(self, *, open: bool = True) -> None:
+        self.validate()
+        if self._state == "created":
+            self._set_state("configured")
+        if open and not self._opened:
+            if _discovery.is_running(self.name):
+                raise ServerAlreadyRunningError(
+                    f"Server with name {self.name!r} is already running"
+                )
+            self._open()
+            # Slaves can be attached only to opened, but not running engine
+            for slave in self._slaves:
+                self._add_slave(slave)
+
+    @_locked
+    def activate(self) -> None:
+        if not self._opened:
+            self.prepare()
+        if not self._started:
+            self._start()
 
+        for internal in self._internals_to_load:
+            self._load_internal(internal)
+
+    @_locked
     def start(self) -> None:
-        self._open()
-        self._start()
+        self.prepare()
+        self.activate()
 
     def stop(self) -> None:
-        self._stop()
-        self._close()
+        with self._lock:
+            self._stop()
+            self._close()
+
+    def close(self) -> None:
+        # Deterministic alternative to __del__, server can't be used after it
+        with self._lock:
+            self._stop()
+            self._close()
+            self._destroy()
+
+    def __enter__(self) -> Server:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
 
     def __del__(self) -> None:
-        self._destroy()
+        self.close()
 
     def _init_params(self) -> None:
-        jslist = lib.jackctl_server_get_parameters(self._ptr)
-        self.params = get_params_from_jslist(jslist)
+        with self.stats.measure(self, "init_params"):
+            jslist = lib.jackctl_server_get_parameters(self._ptr)
+            self.params = get_params_from_jslist(jslist, self._lock)
+
+    @property
+    def drivers(self) -> dict[str, Driver]:
+        if self._drivers is None:
+            jslist = lib.jackctl_server_get_drivers_list(self._ptr)
+            self._drivers = get_drivers_from_jslist(jslist, self._lock)
+        return self._drivers
 
     def _get_driver_by_name(self, name: str) -> Driver:
-        jslist = lib.jackctl_server_get_drivers_list(self._ptr)
-        for ptr in iterate_jslist(jslist, lib.jackctl_driver_t_p):
-            driver = Driver(ptr)
-            if driver.name == name:
-                return driver
+        try:
+            return self.drivers[name]
+        except KeyError:
+            raise DriverNotFoundError(f"Driver not found: {name}") from None
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> Server:
+        server = cls(driver=config.driver)
+        config.apply(server)
+        return server
+
+    @classmethod
+    def net_master(
+        cls,
+        *,
+        multicast_ip: str = DEFAULT_MULTICAST_IP,
+        port: int = DEFAULT_PORT,
+        auto_connect: bool | SetByJack = SetByJack_,
+        name: str | SetByJack = SetByJack_,
+        sync: bool | SetByJack = SetByJack_,
+        realtime: bool | SetByJack = SetByJack_,
+        driver: str,
+        device: str | SetByJack = SetByJack_,
+        rate: SampleRate | SetByJack = SetByJack_,
+        period: int | SetByJack = SetByJack_,
+        nperiods: int | SetByJack = SetByJack_,
+    ) -> Server:
+        validate_net_params(multicast_ip, port)
+        server = cls(
+            name=name,
+            sync=sync,
+            realtime=realtime,
+            driver=driver,
+            device=device,
+            rate=rate,
+            period=period,
+            nperiods=nperiods,
+        )
+
+        params: dict[str, ValueType] = {
+            "multicast-ip": multicast_ip.encode(),
+            "udp-net-port": port,
+        }
+        if not isinstance(auto_connect, SetByJack):
+            params["auto-connect"] = auto_connect
+        server.load_internal("netmanager", params)
+
+        server.net_status = NetStatus()
+        server.net_status.attach()
+        return server
+
+    @classmethod
+    def net_slave(
+        cls,
+        *,
+        multicast_ip: str = DEFAULT_MULTICAST_IP,
+        port: int = DEFAULT_PORT,
+        latency: int | SetByJack = SetByJack_,
+        client_name: str | SetByJack = SetByJack_,
+        name: str | SetByJack = SetByJack_,
+        sync: bool | SetByJack = SetByJack_,
+        realtime: bool | SetByJack = SetByJack_,
+    ) -> Server:
+        validate_net_params(multicast_ip, port)
+        server = cls(name=name, sync=sync, realtime=realtime, driver="net")
+
+        params: dict[str, ValueType] = {
+            "multicast-ip": multicast_ip.encode(),
+            "udp-net-port": port,
+        }
+        if not isinstance(latency, SetByJack):
+            params["latency"] = latency
+        if not isinstance(client_name, SetByJack):
+            params["client-name"] = client_name.encode()
+        server.apply({"driver": params})
+
+        server.net_status = NetStatus()
+        server.net_status.attach()
+        return server
+
+    @property
+    def internals(self) -> dict[str, InternalClient]:
+        if self._internals is None:
+            jslist = lib.jackctl_server_get_internals_list(self._ptr)
+            self._internals = get_internals_from_jslist(jslist, self._lock)
+        return self._internals
+
+    def _get_internal_by_name(self, name: str) -> InternalClient:
+        try:
+            return self.internals[name]
+        except KeyError:
+            raise InternalClientNotFoundError(
+                f"Internal client not found: {name}"
+            ) from None
+
+    @_locked
+    def load_internal(
+        self, name: str, params: Mapping[str, ValueType] | None = None
+    ) -> InternalClient:
+        internal = self._get_internal_by_name(name)
+        if params:
+            apply_params(internal.params, params)
+
+        # Client is loaded on every start until it is unloaded explicitly
+        if self._started:
+            self._load_internal(internal)
+        if internal not in self._internals_to_load:
+            self._internals_to_load.append(internal)
+
+        return internal
+
+    def _load_internal(self, internal: InternalClient) -> None:
+        if not internal.loaded:
+            if not lib.jackctl_server_load_internal(self._ptr, internal._ptr):
+                raise InternalClientNotLoadedError(
+                    f"Internal client couldn't be loaded: {internal.name}"
+                )
+            internal.loaded = True
+
+    @_locked
+    def unload_internal(self, name: str) -> None:
+        internal = self._get_internal_by_name(name)
+        if internal in self._internals_to_load:
+            self._internals_to_load.remove(internal)
+
+        if internal.loaded:
+            if not lib.jackctl_server_unload_internal(self._ptr, internal._ptr):
+                raise InternalClientNotUnloadedError(
+                    f"Internal client couldn't be unloaded: {name}"
+                )
+            internal.loaded = False
+
+    @property
+    def slaves(self) -> list[Driver]:
+        return list(self._slaves)
+
+    @contextmanager
+    def _engine_stopped(self) -> Generator[None, None, None]:
+        if not self._started:
+            yield
+            return
+
+        self._stop()
+        try:
+            yield
+        except BaseException as exc:
+            # Engine is restarted with previous configuration, original error
+            # stays in the chain if restart fails too
+            try:
+                self._start()
+            except JackServerError as restart_exc:
+                raise restart_exc from exc
+            raise
+        self._start()
+
+    def _add_slave(self, driver: Driver) -> None:
+        if not lib.jackctl_server_add_slave(self._ptr, driver._ptr):
+            raise SlaveNotAddedError(f"Slave driver couldn't be added: {driver.name}")
+
+    def _remove_slave(self, driver: Driver) -> None:
+        if not lib.jackctl_server_remove_slave(self._ptr, driver._ptr):
+            raise SlaveNotRemovedError(
+                f"Slave driver couldn't be removed: {driver.name}"
+            )
+
+    @_locked
+    def add_slave(
+        self,
+        driver: str,
+        *,
+        device: str | SetByJack = SetByJack_,
+        rate: SampleRate | SetByJack = SetByJack_,
+        period: int | SetByJack = SetByJack_,
+        nperiods: int | SetByJack = SetByJack_,
+    ) -> Driver:
+        slave = self._get_driver_by_name(driver)
+        if slave is self.driver or slave in self._slaves:
+            raise SlaveNotAddedError(f"Driver is already in use: {driver}")
+
+        _configure_driver(
+            slave, device=device, rate=rate, period=period, nperiods=nperiods
+        )
+
+        if self._opened:
+            # Tracked as soon as JACK has it, even if engine restart fails
+            with self._engine_stopped():
+                self._add_slave(slave)
+                self._slaves.append(slave)
+        else:
+            self._slaves.append(slave)
+        return slave
+
+    @_locked
+    def remove_slave(self, driver: str) -> None:
+        slave = self._get_driver_by_name(driver)
+        if slave not in self._slaves:
+            raise SlaveNotRemovedError(f"Driver is not a slave: {driver}")
+
+        if self._opened:
+            with self._engine_stopped():
+                self._remove_slave(slave)
+                self._slaves.remove(slave)
+        else:
+            self._slaves.remove(slave)
+
+    @_locked
+    def reconfigure_slave(
+        self,
+        driver: str,
+        *,
+        device: str | SetByJack = SetByJack_,
+        rate: SampleRate | SetByJack = SetByJack_,
+        period: int | SetByJack = SetByJack_,
+        nperiods: int | SetByJack = SetByJack_,
+    ) -> None:
+        slave = self._get_driver_by_name(driver)
+        if slave not in self._slaves:
+            raise SlaveNotAddedError(f"Driver is not a slave: {driver}")
+
+        if not self._opened:
+            _configure_driver(
+                slave, device=device, rate=rate, period=period, nperiods=nperiods
+            )
+            return
+
+        # Slave picks up new parameters only when it is added again
+        with self._engine_stopped():
+            self._remove_slave(slave)
+            _configure_driver(
+                slave, device=device, rate=rate, period=period, nperiods=nperiods
+            )
+            self._add_slave(slave)
+
+    @_locked
+    def switch_driver(
+        self,
+        driver: str,
+        *,
+        device: str | SetByJack = SetByJack_,
+        rate: SampleRate | SetByJack = SetByJack_,
+        period: int | SetByJack = SetByJack_,
+        nperiods: int | SetByJack = SetByJack_,
+    ) -> None:
+        new_driver = self._get_driver_by_name(driver)
+        if new_driver in self._slaves:
+            raise DriverNotSwitchedError(f"Driver is used as slave: {driver}")
+        previous = snapshot_params(new_driver.params)
+        _configure_driver(
+            new_driver, device=device, rate=rate, period=period, nperiods=nperiods
+        )
+
+        if self._opened and not lib.jackctl_server_switch_master(
+            self._ptr, new_driver._ptr
+        ):
+            apply_params(new_driver.params, previous)
+            raise DriverNotSwitchedError(f"Driver couldn't be switched to {driver}")
 
-        raise DriverNotFoundError(f"Driver not found: {name}")
+        self.driver = new_driver
+
+    def reconfigure(
+        self,
+        *,
+        device: str | SetByJack = SetByJack_,
+        rate: SampleRate | SetByJack = SetByJack_,
+        period: int | SetByJack = SetByJack_,
+        nperiods: int | SetByJack = SetByJack_,
+    ) -> None:
+        self.switch_driver(
+            self.driver.name, device=device, rate=rate, period=period, nperiods=nperiods
+        )
+
+    @_locked
+    def snapshot(self) -> Snapshot:
+        return {
+            "server": snapshot_params(self.params),
+            "driver": snapshot_params(self.driver.params),
+        }
+
+    @_locked
+    def apply(self, values: Mapping[str, Mapping[str, ValueType]]) -> Snapshot:
+        if unknown := set(values) - {"server", "driver"}:
+            raise KeyError(f"Unknown parameter scopes: {', '.join(sorted(unknown))}")
+
+        changed: Snapshot = {}
+
+        for scope, params in (("server", self.params), ("driver", self.driver.params)):
+            if scope_values := values.get(scope):
+                names = apply_params(params, scope_values)
+                changed[scope] = {name: scope_values[name] for name in names}
+
+        return changed
+
+    @staticmethod
+    def is_running(name: str) -> bool:
+        return _discovery.is_running(name)
 
     @property
     def name(self) -> str:
         return cast(bytes, self.params["name"].value).decode()
 
     @name.setter
+    @_locked
     def name(self, __value: str) -> None:
         self.params["name"].value = __value.encode()
 
@@ -168,6 +701,7 @@ class Server:
         return cast(bool, self.params["sync"].value)
 
     @sync.setter
+    @_locked
     def sync(self, __value: bool) -> None:
         self.params["sync"].value = __value
 
@@ -176,8 +710,23 @@ class Server:
         return cast(bool, self.params["realtime"].value)
 
     @realtime.setter
+    @_locked
     def realtime(self, __value: bool) -> None:
         self.params["realtime"].value = __value
 
+    @property
+    def realtime_priority(self) -> int:
+        return cast(int, self.params["realtime-priority"].value)
+
+    @realtime_priority.setter
+    @_locked
+    def realtime_priority(self, __value: int) -> None:
+        self.params["realtime-priority"].value = __value
+
+    def tune_realtime(
+        self, *, cpus: Iterable[int] | None = None, mlock: bool = False
+    ) -> RealtimeReport:
+        return tune_realtime(self, cpus=cpus, mlock=mlock)
+
     def __repr__(self) -> str:
         return f"<jack_server.Server driver={self.driver.name} started={self._started}>"
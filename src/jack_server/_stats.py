@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import time
+from contextlib import ExitStack, contextmanager
+from typing import TYPE_CHECKING, Callable, ContextManager, Generator
+
+if TYPE_CHECKING:
+    from jack_server._server import Server
+
+TimingHook = Callable[["Server", str, float], None]
+PhaseHook = Callable[["Server", str], ContextManager[object]]
+
+_timing_hooks: list[TimingHook] = []
+_phase_hooks: list[PhaseHook] = []
+
+
+def add_timing_hook(hook: TimingHook) -> None:
+    _timing_hooks.append(hook)
+
+
+def remove_timing_hook(hook: TimingHook) -> None:
+    _timing_hooks.remove(hook)
+
+
+def add_phase_hook(hook: PhaseHook) -> None:
+    _phase_hooks.append(hook)
+
+
+def remove_phase_hook(hook: PhaseHook) -> None:
+    _phase_hooks.remove(hook)
+
+
+class ServerStats:
+    __slots__ = ("last", "total", "count")
+
+    last: dict[str, float]
+    total: dict[str, float]
+    count: dict[str, int]
+
+    def __init__(self) -> None:
+        self.last = {}
+        self.total = {}
+        self.count = {}
+
+    def record(self, phase: str, duration: float) -> None:
+        self.last[phase] = duration
+        self.total[phase] = self.total.get(phase, 0) + duration
+        self.count[phase] = self.count.get(phase, 0) + 1
+
+    @contextmanager
+    def measure(self, server: Server, phase: str) -> Generator[None, None, None]:
+        with ExitStack() as stack:
+            for hook in _phase_hooks:
+                stack.enter_context(hook(server, phase))
+
+            begin = time.perf_counter()
+            try:
+                yield
+            finally:
+                duration = time.perf_counter() - begin
+                self.record(phase, duration)
+                for hook in _timing_hooks:
+                    hook(server, phase, duration)
+
+    def __repr__(self) -> str:
+        timings = " ".join(f"{k}={v * 1000:.3f}ms" for k, v in self.last.items())
+        return f"<jack_server.ServerStats {timings}>"
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Iterable
+
+from jack_server._output import add_output_listener, remove_output_listener
+from jack_server._server import JackServerError, Server
+
+Probe = Callable[[Server], bool]
+
+# Substrings of JACK error messages that mean the server stopped processing
+_failure_markers = (
+    "read error",
+    "write error",
+    "driver is not running",
+    "poll time out",
+    "cannot start driver",
+)
+
+logger = logging.getLogger("jack_server")
+
+
+class Supervisor:
+    server: Server
+    probe: Probe | None
+    interval: float
+    min_backoff: float
+    max_backoff: float
+    failure_markers: tuple[str, ...]
+    restart_count: int
+    recovery_times: list[float]
+    last_failure: str | None
+    _failure: threading.Event
+    _stopping: threading.Event
+    _thread: threading.Thread | None
+
+    def __init__(
+        self,
+        server: Server,
+        *,
+        probe: Probe | None = None,
+        interval: float = 1,
+        min_backoff: float = 0.1,
+        max_backoff: float = 30,
+        failure_markers: Iterable[str] = _failure_markers,
+    ) -> None:
+        self.server = server
+        self.probe = probe
+        self.interval = interval
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.failure_markers = tuple(m.lower() for m in failure_markers)
+        self.restart_count = 0
+        self.recovery_times = []
+        self.last_failure = None
+        self._failure = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    @property
+    def last_recovery_time(self) -> float | None:
+        return self.recovery_times[-1] if self.recovery_times else None
+
+    def notify_failure(self, reason: str) -> None:
+        self.last_failure = reason
+        self._failure.set()
+
+    def _on_output(self, level: int, message: str) -> None:
+        if level < logging.ERROR:
+            return
+        lowered = message.lower()
+        if any(marker in lowered for marker in self.failure_markers):
+            self.notify_failure(message)
+
+    def _is_healthy(self) -> bool:
+        if self._failure.is_set():
+            return False
+        if not self.server._started:
+            self.last_failure = "Server is not started"
+            return False
+        if self.probe and not self.probe(self.server):
+            self.last_failure = "Probe failed"
+            return False
+        return True
+
+    def _recover(self) -> None:
+        detected = time.monotonic()
+        backoff = self.min_backoff
+        logger.warning("Server failure: %s, restarting", self.last_failure)
+
+        while not self._stopping.is_set():
+            self._failure.clear()
+            try:
+                # Server and driver stay created, only engine is reopened
+                self.server.stop()
+                self.server.start()
+            except JackServerError as exc:
+                logger.warning("Restart failed: %s, retrying in %ss", exc, backoff)
+                if self._stopping.wait(backoff):
+                    return
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            self.restart_count += 1
+            self.recovery_times.append(time.monotonic() - detected)
+            logger.info("Server recovered in %.3fs", self.recovery_times[-1])
+            return
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            if not self._is_healthy():
+                self._recover()
+            self._failure.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread:
+            return
+
+        self.server.start()
+        add_output_listener(self._on_output)
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="jack_server-supervisor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self._thread:
+            return
+
+        self._stopping.set()
+        self._failure.set()
+        self._thread.join()
+        self._thread = None
+        self._failure.clear()
+        remove_output_listener(self._on_output)
+        self.server.stop()
+
+    def __enter__(self) -> Supervisor:
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        return (
+            f"<jack_server.Supervisor server={self.server!r} "
+            + f"restarts={self.restart_count}>"
+        )
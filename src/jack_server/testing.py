@@ -0,0 +1,3 @@
+# Helpers for testing code that uses jack_server without JACK
+from jack_server._fake import FakeBackend as FakeBackend
+from jack_server._fake import fake_backend as fake_backend
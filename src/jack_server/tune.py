@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import sys
+import time
+from typing import Iterable, NamedTuple, Sequence
+
+from jack_server._config import ConfigValue, ServerConfig, _to_config_value
+from jack_server._monitor import Monitor
+from jack_server._output import set_error_function
+from jack_server._parameter import ValueType
+from jack_server._server import JackServerError, Server
+
+# Substrings of JACK error messages that indicate an xrun
+_xrun_markers = ("xrun", "was not finished")
+
+
+class TrialResult(NamedTuple):
+    params: dict[str, ValueType]
+    started: bool
+    open_time: float | None
+    start_time: float | None
+    latency: float
+    buffer_size: int | None
+    sample_rate: int | None
+    xruns: int
+    error: str | None
+
+    @property
+    def stable(self) -> bool:
+        return self.started and not self.xruns
+
+
+def iter_grid(
+    rates: Iterable[int], periods: Iterable[int], nperiods: Iterable[int | None]
+) -> Iterable[dict[str, ValueType]]:
+    for rate, period, nperiods_ in itertools.product(rates, periods, nperiods):
+        params: dict[str, ValueType] = {"rate": rate, "period": period}
+        if nperiods_ is not None:
+            params["nperiods"] = nperiods_
+        yield params
+
+
+def get_latency(params: dict[str, ValueType]) -> float:
+    # Nominal round-trip latency: playback buffer plus one capture period
+    rate, period = int(params["rate"]), int(params["period"])
+    nperiods = int(params.get("nperiods", 1))
+    return period * (nperiods + 1) / rate
+
+
+def measure_latency(
+    monitor: Monitor, params: dict[str, ValueType]
+) -> tuple[float, int, int]:
+    # -> (latency, buffer_size, sample_rate) achieved by the running server.
+    # Drivers may round requested values, so the grid is only a fallback
+    # for drivers without physical ports.
+    sample = monitor.sample()
+    frames = monitor.get_round_trip_latency()
+    if frames is None:
+        frames = sample.buffer_size * (int(params.get("nperiods", 1)) + 1)
+    return frames / sample.sample_rate, sample.buffer_size, sample.sample_rate
+
+
+def run_trial(
+    server: Server, params: dict[str, ValueType], window: float
+) -> TrialResult:
+    xruns = 0
+
+    def on_error(message: str) -> None:
+        nonlocal xruns
+        if any(marker in message.lower() for marker in _xrun_markers):
+            xruns += 1
+
+    set_error_function(on_error)
+    server.stats.last.clear()
+    latency, buffer_size, sample_rate = get_latency(params), None, None
+
+    try:
+        server.apply({"driver": params})
+        server.start()
+        with Monitor(server) as monitor:
+            time.sleep(window)
+            latency, buffer_size, sample_rate = measure_latency(monitor, params)
+    except (JackServerError, ValueError) as exc:
+        error: str | None = str(exc)
+    else:
+        error = None
+    finally:
+        server.stop()
+        set_error_function(None)
+
+    return TrialResult(
+        params=params,
+        started=error is None,
+        open_time=server.stats.last.get("open"),
+        start_time=server.stats.last.get("start"),
+        latency=latency,
+        buffer_size=buffer_size,
+        sample_rate=sample_rate,
+        xruns=xruns,
+        error=error,
+    )
+
+
+def recommend(results: Iterable[TrialResult]) -> TrialResult | None:
+    stable = [r for r in results if r.stable]
+    if not stable:
+        return None
+    return min(
+        stable, key=lambda r: (r.latency, (r.open_time or 0) + (r.start_time or 0))
+    )
+
+
+def tune(
+    *,
+    driver: str,
+    device: str | None = None,
+    rates: Sequence[int],
+    periods: Sequence[int],
+    nperiods: Sequence[int],
+    window: float,
+) -> list[TrialResult]:
+    server = Server(driver=driver)
+    if device is not None:  # pragma: no cover (does not work with dummy driver)
+        server.driver.device = device
+
+    nperiods_: Sequence[int | None] = (
+        nperiods if "nperiods" in server.driver.params else (None,)
+    )
+    return [
+        run_trial(server, params, window)
+        for params in iter_grid(rates, periods, nperiods_)
+    ]
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",")]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m jack_server.tune",
+        description="Find the lowest-latency stable driver configuration.",
+    )
+    parser.add_argument("-d", "--driver", default="dummy")
+    parser.add_argument("--device")
+    parser.add_argument("--rates", type=_int_list, default=[44100, 48000])
+    parser.add_argument("--periods", type=_int_list, default=[64, 128, 256, 512, 1024])
+    parser.add_argument("--nperiods", type=_int_list, default=[2, 3])
+    parser.add_argument(
+        "--window", type=float, default=5, help="seconds to watch for xruns"
+    )
+    parser.add_argument("-o", "--output", help="save recommended profile to file")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = tune(
+        driver=args.driver,
+        device=args.device,
+        rates=args.rates,
+        periods=args.periods,
+        nperiods=args.nperiods,
+        window=args.window,
+    )
+    best = recommend(results)
+
+    if args.json:
+        output = {
+            "results": [r._asdict() for r in results],
+            "recommended": best._asdict() if best else None,
+        }
+        print(json.dumps(output, indent=2))
+    else:
+        for r in results:
+            status = "ok" if r.stable else f"xruns={r.xruns}" if r.started else "failed"
+            print(
+                f"{r.params} latency={r.latency * 1000:.2f}ms "
+                + f"buffer={r.buffer_size} rate={r.sample_rate} "
+                + f"open={(r.open_time or 0) * 1000:.1f}ms "
+                + f"start={(r.start_time or 0) * 1000:.1f}ms {status}"
+            )
+        print(f"recommended: {best.params if best else None}")
+
+    if best is None:
+        return 1
+
+    if args.output:
+        driver_params: dict[str, ConfigValue] = {
+            name: _to_config_value(value) for name, value in best.params.items()
+        }
+        if args.device is not None:  # pragma: no cover
+            driver_params["device"] = args.device
+        ServerConfig(args.driver, {}, driver_params).save(args.output)
+
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
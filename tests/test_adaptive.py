@@ -0,0 +1,61 @@
+from unittest.mock import Mock
+
+import pytest
+
+from jack_server import BufferSizeController, BufferSizeNotSetError
+from jack_server._monitor import MonitorSample
+
+
+def _sample(buffer_size: int, cpu_load: float = 50, xruns: int = 0):
+    return MonitorSample(0, cpu_load, xruns, 0, buffer_size, 48000, 0, 1)
+
+
+@pytest.fixture
+def controller():
+    return BufferSizeController(
+        Mock(), min_size=128, max_size=512, lower_after=2, cooldown=1
+    )
+
+
+def test_raise_on_xruns(controller: BufferSizeController):
+    assert controller.decide(_sample(256)) is None
+    assert controller.decide(_sample(256, xruns=2)) == (512, "2 xruns")
+    # Upper bound
+    assert controller.decide(_sample(512, xruns=3)) is None
+
+
+def test_raise_on_load(controller: BufferSizeController):
+    decision = controller.decide(_sample(256, cpu_load=90))
+    assert decision and decision[0] == 512
+
+
+def test_lower_with_hysteresis(controller: BufferSizeController):
+    assert controller.decide(_sample(256, cpu_load=10)) is None
+    assert controller.decide(_sample(256, cpu_load=50)) is None
+    assert controller.decide(_sample(256, cpu_load=10)) is None
+    decision = controller.decide(_sample(256, cpu_load=10))
+    assert decision and decision[0] == 128
+    # Lower bound
+    for _ in range(3):
+        assert controller.decide(_sample(128, cpu_load=10)) is None
+
+
+def test_apply_decision(controller: BufferSizeController):
+    controller._on_sample(_sample(256, cpu_load=90))
+    controller.monitor.set_buffer_size.assert_called_once_with(512)  # type: ignore
+    assert [(d.old, d.new) for d in controller.decisions] == [(256, 512)]
+
+    # Cooldown after change
+    controller._on_sample(_sample(512, cpu_load=0, xruns=1))
+    assert len(controller.decisions) == 1
+
+
+def test_failed_decision(controller: BufferSizeController):
+    controller.monitor.set_buffer_size.side_effect = BufferSizeNotSetError  # type: ignore
+    controller._on_sample(_sample(256, cpu_load=90))
+    assert not controller.decisions
+
+
+def test_invalid_bounds():
+    with pytest.raises(ValueError):
+        BufferSizeController(Mock(), min_size=512, max_size=256)
@@ -0,0 +1,24 @@
+import asyncio
+
+from jack_server import AsyncServer, Server
+
+
+def test_async_server(server: Server):
+    async def main():
+        async with AsyncServer(server) as async_server:
+            assert async_server.server._started
+        assert not server._started
+
+    asyncio.run(main())
+
+
+def test_async_server_cancelled_start(server: Server):
+    async def main():
+        async_server = AsyncServer(server)
+        task = asyncio.ensure_future(async_server.start())
+        await asyncio.sleep(0)
+        task.cancel()
+        await async_server.aclose()
+        assert not server._started
+
+    asyncio.run(main())
@@ -0,0 +1,158 @@
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from jack_server import ParameterValueError, Server, ServerConfig
+
+
+def test_from_argv():
+    config = ServerConfig.from_argv(
+        ["-n", "myserver", "-S", "-r", "--port-max", "256", "-d", "alsa"]
+        + ["--device", "hw:1", "--rate=48000", "--hwmon"]
+    )
+    assert config.driver == "alsa"
+    assert config.server == {
+        "name": "myserver",
+        "sync": True,
+        "realtime": False,
+        "port-max": 256,
+    }
+    assert config.driver_params == {"device": "hw:1", "rate": 48000, "hwmon": True}
+
+
+def test_argv_roundtrip():
+    config = ServerConfig(
+        "dummy", {"name": "myserver", "realtime": False}, {"rate": 48000}
+    )
+    argv = config.to_argv()
+    assert argv == ["--name", "myserver", "--no-realtime", "-d", "dummy"] + [
+        "--rate",
+        "48000",
+    ]
+    assert ServerConfig.from_argv(argv) == config
+
+
+def test_split_at_first_driver():
+    config = ServerConfig.from_argv(["-n", "a", "--driver=net", "--latency", "5"])
+    assert config.driver == "net"
+    assert config.driver_params == {"latency": 5}
+    config = ServerConfig.from_argv(["-d", "alsa", "--driver", "x"])
+    assert config.driver == "alsa"
+    assert config.driver_params == {"driver": "x"}
+
+
+def test_driver_false_roundtrip(server: Server, driver: str):
+    config = ServerConfig(driver, driver_params={"monitor": False, "period": 256})
+    argv = config.to_argv()
+    assert argv == ["-d", driver, "--monitor=false", "--period", "256"]
+    compiled = ServerConfig.from_argv(argv).compile(server)
+    assert compiled["driver"] == {"monitor": False, "period": 256}
+    config = ServerConfig(driver, driver_params={"monitor": True})
+    assert config.to_argv() == ["-d", driver, "--monitor"]
+
+    config = ServerConfig(driver, {"sync": False, "realtime": False})
+    assert config.to_argv() == ["--no-realtime", "-d", driver]
+
+
+def test_clock_source_letter(server: Server, driver: str):
+    config = ServerConfig.from_argv(["-c", "s", "-d", driver])
+    with pytest.raises(ParameterValueError, match="not a number"):
+        config.compile(server)
+
+
+def test_coerce(server: Server, driver: str):
+    config = ServerConfig(
+        driver, {"sync": "yes", "verbose": "off", "self-connect-mode": "A"}
+    )
+    assert config.compile(server)["server"] == {
+        "sync": True,
+        "verbose": False,
+        "self-connect-mode": "A",
+    }
+
+
+@pytest.mark.parametrize(
+    "argv",
+    (
+        ["-n", "myserver"],
+        ["-X", "-d", "dummy"],
+        ["-d", "notcached", "-r", "1"],
+        ["-n", "a", "b", "-d", "dummy"],
+        ["-n", "a", "--driver"],
+    ),
+)
+def test_from_argv_invalid(argv: List[str]):
+    with pytest.raises(ParameterValueError):
+        ServerConfig.from_argv(argv)
+
+
+@pytest.mark.parametrize("suffix", (".json", ".toml"))
+def test_save_load(tmp_path: Path, suffix: str):
+    if suffix == ".toml" and sys.version_info < (3, 11):  # pragma: no cover
+        pytest.importorskip("tomli")
+
+    config = ServerConfig("dummy", {"name": 'a "b"', "sync": True}, {"period": 256})
+    path = tmp_path / f"profile{suffix}"
+    config.save(path)
+    assert ServerConfig.load(path) == config
+
+
+def test_tune_profile():
+    profile = '{"driver": "dummy", "server": {}, "driver_params": {"period": 256}}'
+    assert ServerConfig.from_json(profile).driver_params == {"period": 256}
+
+
+def test_from_config(driver: str):
+    config = ServerConfig(driver, {"name": "configured", "sync": True}, {"period": 256})
+    server = Server.from_config(config)
+    try:
+        assert server.name == "configured"
+        assert server.driver.period == 256
+        assert config.compile(server) is config.compile(server)
+        assert ServerConfig.from_server(server).server["name"] == "configured"
+    finally:
+        server.stop()
+
+
+def test_compile_invalid(server: Server, driver: str):
+    with pytest.raises(ParameterValueError):
+        ServerConfig(driver, {"not-existing": 1}).compile(server)
+
+
+def test_to_argv_unknown_option():
+    with pytest.raises(ParameterValueError):
+        ServerConfig("dummy", {"client-timeout": 500, "not-existing": 1}).to_argv()
+
+
+def test_apply_switches_driver(server: Server):
+    ServerConfig("net").apply(server)
+    assert server.driver.name == "net"
+
+
+def test_short_driver_options(server: Server, driver: str):
+    config = ServerConfig.from_argv(["-d", driver, "-p", "256"], server=server)
+    assert config.driver_params == {"period": 256}
+
+
+def test_grouped_flags():
+    config = ServerConfig.from_argv(["-RSv", "-Tn", "a", "-d", "dummy"])
+    assert config.server == {
+        "realtime": True,
+        "sync": True,
+        "verbose": True,
+        "temporary": True,
+        "name": "a",
+    }
+
+
+def test_grouped_driver_flags(server: Server, driver: str):
+    params = server.drivers[driver].params
+    flag = next(p for p in params.values() if p.type == 5)
+    argv = ["-d", driver, f"-{flag.id}{flag.id}"]
+    with pytest.raises(ParameterValueError, match="grouped"):
+        ServerConfig.from_argv(argv, server=server)
+    argv = ["-d", driver, f"-{flag.id}", f"-{flag.id}off"]
+    config = ServerConfig.from_argv(argv, server=server)
+    assert config.driver_params == {flag.name: "off"}
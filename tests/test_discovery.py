@@ -0,0 +1,58 @@
+import os
+import socket
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import jack_server._discovery
+from jack_server import Server, ServerAlreadyRunningError, list_running
+
+
+@pytest.fixture
+def registry(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(jack_server._discovery, "_dirs", [str(tmp_path)])
+    return tmp_path
+
+
+def _fake_server(directory: Path, name: str) -> socket.socket:
+    uid = os.getuid()
+    (directory / f"sem.jack_sem.{uid}_{name}_system").touch()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(directory / f"jack_{name}_{uid}_0"))
+    sock.listen()
+    return sock
+
+
+@pytest.fixture
+def running(registry: Path) -> Iterator[str]:
+    sock = _fake_server(registry, "my_server")
+    yield "my_server"
+    sock.close()
+
+
+def test_list_running(running: str):
+    assert list_running() == [running]
+    assert Server.is_running(running)
+    assert not Server.is_running("other")
+
+
+def test_stale_socket(registry: Path):
+    _fake_server(registry, "crashed").close()
+    assert list_running() == []
+    assert not Server.is_running("crashed")
+
+
+def test_client_socket_ignored(registry: Path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(registry / f"jack_client_{os.getuid()}_0"))
+    sock.listen()
+    assert list_running() == []
+    sock.close()
+
+
+def test_start_fails_fast(server: Server, running: str):
+    server.name = running
+    with pytest.raises(ServerAlreadyRunningError):
+        server.start()
+    assert not server._opened
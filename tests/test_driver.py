@@ -1,3 +1,5 @@
+import threading
+
 import pytest
 
 from jack_server import Server
@@ -10,3 +12,36 @@ from tests.conftest import check_property
 def test_driver_properties(driver: str, name: str, value: str, param_value: str):
     server = Server(driver=driver)
     check_property(server.driver, name, value, param_value)
+
+
+def test_drivers_registry(driver: str):
+    server = Server(driver=driver)
+    assert server.drivers[driver] is server.driver
+    assert server._get_driver_by_name(driver) is server.driver
+    assert all(
+        d._params is None for d in server.drivers.values() if d is not server.driver
+    )
+
+
+def test_driver_setter_waits_for_server_lock(server: Server):
+    done = threading.Event()
+
+    def set_period():
+        server.driver.period = 256
+        done.set()
+
+    with server._lock:
+        thread = threading.Thread(target=set_period)
+        thread.start()
+        # Writer is blocked while another thread holds the server lock
+        assert not done.wait(0.1)
+        assert server.driver.period == 1024
+    thread.join()
+    assert server.driver.period == 256
+
+
+def test_parameter_lock_is_shared(server: Server):
+    assert server.params["name"]._lock is server._lock
+    assert server.driver.params["period"]._lock is server._lock
+    internal = next(iter(server.internals.values()))
+    assert all(p._lock is server._lock for p in internal.params.values())
@@ -0,0 +1,305 @@
+import gc
+import signal
+import threading
+from ctypes import byref, c_char_p, c_int
+from typing import Callable, Iterator, List, Type
+
+import pytest
+
+import jack_server
+import jack_server._lib
+from jack_server import (
+    InternalClientNotLoadedError,
+    Monitor,
+    MonitorNotOpenedError,
+    ParameterValueError,
+    Server,
+    ServerNotCreatedError,
+    ServerNotOpenedError,
+    ServerNotStartedError,
+    SlaveNotAddedError,
+    SlaveNotRemovedError,
+    _fake,
+    get_backend,
+    set_backend,
+    set_error_function,
+    set_info_function,
+)
+from jack_server.testing import FakeBackend, fake_backend
+
+
+@pytest.fixture
+def fake() -> Iterator[None]:
+    previous = get_backend()
+    set_backend("fake")
+    yield
+    # Servers of fake backend have to be destroyed with it
+    gc.collect()
+    fake_backend.reset()
+    set_backend(previous)
+
+
+def test_not_in_package_namespace():
+    assert not hasattr(jack_server, "fake_backend")
+    assert isinstance(fake_backend, FakeBackend)
+
+
+def test_set_backend_unknown():
+    with pytest.raises(ValueError, match="Unknown backend"):
+        set_backend("unknown")
+
+
+def test_set_backend_clears_functions(fake: None):
+    func = jack_server._lib.jackctl_server_start
+    set_backend("fake")
+    assert "jackctl_server_start" not in vars(jack_server._lib)
+    assert jack_server._lib.jackctl_server_start is func
+
+
+@pytest.mark.usefixtures("fake")
+def test_params():
+    server = Server(driver="alsa", name="fake", device="hw:1", nperiods=3)
+    assert server.name == "fake"
+    assert server.driver.device == "hw:1"
+    assert server.driver.params["nperiods"].range == (2, 32)
+    assert server.params["self-connect-mode"].is_strict
+
+
+@pytest.mark.usefixtures("fake")
+def test_many_servers():
+    servers = [Server(driver="dummy", name=f"fake-{i}") for i in range(1000)]
+    for server in servers:
+        server.start()
+    assert len(fake_backend.servers) == 1000
+    for server in servers:
+        server.stop()
+    assert not fake_backend.servers
+
+
+@pytest.mark.usefixtures("fake")
+def test_name_conflict():
+    first = Server(driver="dummy", name="fake")
+    first.start()
+    with pytest.raises(ServerNotOpenedError):
+        Server(driver="dummy", name="fake").start()
+    first.stop()
+
+
+@pytest.mark.usefixtures("fake")
+def test_failure_injection():
+    fake_backend.fail("jackctl_server_create2")
+    with pytest.raises(ServerNotCreatedError):
+        Server(driver="dummy")
+
+    server = Server(driver="dummy")
+    fake_backend.fail("jackctl_server_open", times=2)
+    for _ in range(2):
+        with pytest.raises(ServerNotOpenedError):
+            server.start()
+    server.start()
+    server.stop()
+
+
+@pytest.mark.usefixtures("fake")
+def test_latency_injection():
+    fake_backend.set_delay("jackctl_server_open", 0.05)
+    server = Server(driver="dummy")
+    server.start()
+    assert server.stats.last["open"] >= 0.05
+    server.stop()
+
+
+@pytest.mark.usefixtures("fake")
+def test_xrun_injection():
+    server = Server(driver="dummy", name="fake")
+    server.start()
+    with Monitor(server) as monitor:
+        fake_backend.inject_xruns(3, delay=0.002, server="fake")
+        sample = monitor.sample()
+    server.stop()
+    assert sample.xruns == 3
+    assert sample.max_xrun_delay == pytest.approx(0.002)
+
+
+@pytest.mark.usefixtures("fake")
+def test_xrun_injection_other_server():
+    server = Server(driver="dummy", name="fake")
+    server.start()
+    with Monitor(server) as monitor:
+        fake_backend.inject_xruns(3, server="other")
+        sample = monitor.sample()
+    server.stop()
+    assert sample.xruns == 0
+
+
+@pytest.mark.usefixtures("fake")
+def test_load_internal_opened():
+    server = Server(driver="dummy")
+    server._open()
+    internal = server.internals["netmanager"]
+    assert _fake.jackctl_server_load_internal(server._ptr, internal._ptr)
+    # Already loaded
+    assert not _fake.jackctl_server_load_internal(server._ptr, internal._ptr)
+    assert _fake.jackctl_server_unload_internal(server._ptr, internal._ptr)
+    assert not _fake.jackctl_server_unload_internal(server._ptr, internal._ptr)
+    server.stop()
+    assert not _fake.jackctl_server_load_internal(server._ptr, internal._ptr)
+
+
+@pytest.mark.usefixtures("fake")
+def test_lifecycle_guards():
+    server = Server(driver="dummy")
+    assert not _fake.jackctl_server_close(server._ptr)
+    assert not _fake.jackctl_server_start(server._ptr)
+    assert not _fake.jackctl_server_stop(server._ptr)
+    assert not _fake.jackctl_server_switch_master(server._ptr, server.driver._ptr)
+    slave = server.drivers["loopback"]
+    assert not _fake.jackctl_server_add_slave(server._ptr, slave._ptr)
+    assert not _fake.jackctl_server_remove_slave(server._ptr, slave._ptr)
+
+
+def _set_period(server: Server) -> None:
+    server.driver.period = 256
+
+
+def _load_internal(server: Server) -> None:
+    server.start()
+    server.load_internal("netmanager")
+
+
+@pytest.mark.usefixtures("fake")
+@pytest.mark.parametrize(
+    ("function", "call", "error"),
+    (
+        ("jackctl_parameter_set_value", _set_period, ParameterValueError),
+        ("jackctl_server_start", Server.start, ServerNotStartedError),
+        ("jackctl_server_load_internal", _load_internal, InternalClientNotLoadedError),
+    ),
+)
+def test_failure_injection_calls(
+    function: str, call: Callable[[Server], object], error: Type[Exception]
+):
+    server = Server(driver="dummy")
+    server._open()
+    fake_backend.fail(function)
+    with pytest.raises(error):
+        call(server)
+    server.stop()
+
+
+@pytest.mark.usefixtures("fake")
+def test_add_slave_failed():
+    server = Server(driver="dummy")
+    server._open()
+    fake_backend.fail("jackctl_server_add_slave")
+    with pytest.raises(SlaveNotAddedError):
+        server.add_slave("loopback")
+    server.stop()
+
+
+@pytest.mark.usefixtures("fake")
+def test_remove_slave_failed():
+    server = Server(driver="dummy")
+    server._open()
+    slave = server.add_slave("loopback")
+    assert not _fake.jackctl_server_add_slave(server._ptr, slave._ptr)
+    fake_backend.fail("jackctl_server_remove_slave")
+    with pytest.raises(SlaveNotRemovedError):
+        server.remove_slave("loopback")
+    server.start()
+    # JACK doesn't detach slaves from running engine
+    assert not _fake.jackctl_server_remove_slave(server._ptr, slave._ptr)
+    server.stop()
+
+
+@pytest.mark.usefixtures("fake")
+def test_unload_internal_failed():
+    server = Server(driver="dummy")
+    server.start()
+    server.load_internal("netmanager")
+    fake_backend.fail("jackctl_server_unload_internal")
+    internal = server.internals["netmanager"]
+    assert not _fake.jackctl_server_unload_internal(server._ptr, internal._ptr)
+    server.stop()
+
+
+@pytest.mark.usefixtures("fake")
+def test_switch_master_failed():
+    server = Server(driver="dummy")
+    server.start()
+    fake_backend.fail("jackctl_server_switch_master")
+    assert not _fake.jackctl_server_switch_master(server._ptr, server.driver._ptr)
+    server.stop()
+
+
+@pytest.mark.usefixtures("fake")
+def test_client_not_opened():
+    server = Server(driver="dummy", name="fake")
+    with pytest.raises(MonitorNotOpenedError, match="0x21"):
+        Monitor(server).start()
+
+
+@pytest.mark.usefixtures("fake")
+def test_client_without_ports():
+    server = Server(driver="net", name="fake")
+    server.start()
+    with Monitor(server) as monitor:
+        assert monitor.sample().clients == 0
+        fake_backend.fail("jack_set_buffer_size")
+        assert _fake.jack_set_buffer_size(monitor._client, 256) == 1
+    server.stop()
+
+
+def test_signals():
+    received = threading.Event()
+
+    def wait():
+        # Signals are blocked only in this thread
+        sigmask = _fake.jackctl_setup_signals(0)
+        signal.pthread_kill(threading.get_ident(), signal.SIGTERM)
+        _fake.jackctl_wait_signals(sigmask)
+        received.set()
+
+    thread = threading.Thread(target=wait)
+    thread.start()
+    thread.join(5)
+    assert received.is_set()
+
+
+def test_client_open_status():
+    status = c_int()
+    client = _fake.jack_client_open(b"client", 0, byref(status), c_char_p(b"nope"))
+    assert not client
+    assert status.value == _fake.JackFailure | _fake.JackServerFailed
+
+
+@pytest.mark.usefixtures("fake")
+def test_output():
+    errors: List[str] = []
+    infos: List[str] = []
+    set_error_function(errors.append)
+    set_info_function(infos.append)
+    try:
+        server = Server(driver="dummy", realtime=False)
+        server.start()
+        server.stop()
+    finally:
+        set_error_function(None)
+        set_info_function(None)
+    assert errors == ["Fake server runs without realtime scheduling"]
+    assert infos == ["Fake driver dummy opened", "Fake server started"]
+
+
+@pytest.mark.usefixtures("fake")
+def test_runtime_changes():
+    server = Server(driver="dummy", name="fake")
+    assert server.params["name"].id == "n"
+    server.start()
+    server.add_slave("loopback")
+    server.remove_slave("loopback")
+    server.switch_driver("alsa", period=256)
+    with Monitor(server) as monitor:
+        assert monitor.sample().buffer_size == 256
+        monitor.set_buffer_size(512)
+        assert monitor.sample().buffer_size == 512
+    server.stop()
@@ -0,0 +1,67 @@
+import pytest
+
+import jack_server._server
+from jack_server import (
+    InternalClientNotFoundError,
+    InternalClientNotLoadedError,
+    InternalClientNotUnloadedError,
+    Server,
+)
+from tests.test_server import returns_false
+
+
+def test_internals_registry(server: Server):
+    assert all(
+        name == internal.name and internal._params is None
+        for name, internal in server.internals.items()
+    )
+
+
+def test_load_unload_internal(server: Server):
+    server.start()
+    internal = server.load_internal("profiler")
+    assert internal.loaded
+    assert server.load_internal("profiler") is internal
+    server.unload_internal("profiler")
+    assert not internal.loaded
+
+
+def test_internal_unloaded_on_stop(server: Server):
+    server.start()
+    internal = server.load_internal("profiler")
+    server.stop()
+    assert not internal.loaded
+
+
+def test_internal_not_found(server: Server):
+    with pytest.raises(InternalClientNotFoundError):
+        server.load_internal("not_existing_client")
+
+
+def test_internal_not_loaded(server: Server, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        jack_server._server.lib, "jackctl_server_load_internal", returns_false
+    )
+    server.start()
+    with pytest.raises(InternalClientNotLoadedError):
+        server.load_internal("profiler")
+
+
+def test_internal_not_unloaded(server: Server, monkeypatch: pytest.MonkeyPatch):
+    server.start()
+    server.load_internal("profiler")
+    monkeypatch.setattr(
+        jack_server._server.lib, "jackctl_server_unload_internal", returns_false
+    )
+    with pytest.raises(InternalClientNotUnloadedError):
+        server.unload_internal("profiler")
+
+
+def test_internal_loaded_on_start(server: Server):
+    internal = server.load_internal("profiler")
+    assert not internal.loaded
+    server.start()
+    assert internal.loaded
+    server.stop()
+    server.start()
+    assert internal.loaded
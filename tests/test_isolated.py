@@ -0,0 +1,92 @@
+import os
+import signal
+from typing import Iterator
+from unittest.mock import Mock
+
+import pytest
+
+from jack_server import IsolatedServer, ServerProcessError
+
+
+@pytest.fixture
+def isolated(driver: str) -> Iterator[IsolatedServer]:
+    with IsolatedServer(driver=driver, period=1024, sync=True) as server:
+        yield server
+
+
+def test_start_stop(isolated: IsolatedServer):
+    isolated.start()
+    assert isolated.is_alive
+    isolated.stop()
+
+
+def test_params(isolated: IsolatedServer):
+    isolated.name = "isolatedserver"
+    assert isolated.name == "isolatedserver"
+    isolated.driver.period = 512
+    assert isolated.driver.params["period"].value == 512
+    assert isolated.params["sync"].value is True
+    assert isolated.snapshot()["driver"]["period"] == 512
+
+
+def test_unknown_attribute(isolated: IsolatedServer):
+    with pytest.raises(AttributeError):
+        isolated.not_existing_attribute
+    with pytest.raises(AttributeError):
+        isolated.driver.not_existing_attribute = 1
+
+
+def test_restart_after_crash(isolated: IsolatedServer):
+    isolated.driver.period = 512
+    isolated.start()
+    pid = isolated.pid
+    assert pid
+    os.kill(pid, signal.SIGKILL)
+
+    with pytest.raises(ServerProcessError):
+        isolated.snapshot()
+
+    isolated.restart()
+    assert isolated.pid != pid
+    assert isolated.driver.period == 512
+    assert isolated._started
+
+
+def test_logs_forwarded(driver: str):
+    on_info = Mock()
+    with IsolatedServer(driver=driver, on_info=on_info) as server:
+        server.start()
+    on_info.assert_called()
+
+
+def test_call_timeout(driver: str):
+    with IsolatedServer(driver=driver, timeout=0.5) as server:
+        assert server.pid
+        os.kill(server.pid, signal.SIGSTOP)
+        with pytest.raises(ServerProcessError, match="didn't respond"):
+            server.snapshot()
+        assert not server.is_alive
+        with pytest.raises(ServerProcessError, match="closed"):
+            server.snapshot()
+
+
+def test_terminate_hung(isolated: IsolatedServer):
+    assert isolated.pid
+    os.kill(isolated.pid, signal.SIGSTOP)
+    isolated._terminate(timeout=0.5)
+    assert not isolated.is_alive
+
+
+def test_restart_restores_slaves_and_internals(isolated: IsolatedServer):
+    isolated.add_slave("loopback")
+    isolated.reconfigure_slave("loopback")
+    isolated.load_internal("profiler")
+    isolated.start()
+    isolated.restart()
+    assert isolated._slaves == {"loopback": {}}
+    assert isolated._internals == {"profiler": {}}
+    # Raises if slave wasn't restored
+    isolated.remove_slave("loopback")
+    isolated.unload_internal("profiler")
+    assert not isolated._slaves
+    assert not isolated._internals
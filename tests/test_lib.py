@@ -1,7 +1,18 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
 import pytest
 
 import jack_server._lib
-from jack_server._lib import _lib_names, get_library_name
+from jack_server._lib import (
+    _lib_names,
+    _library_path_env,
+    get_library_name,
+    load_library,
+    set_library_path,
+)
 
 
 @pytest.mark.parametrize("name", _lib_names)
@@ -21,3 +32,112 @@ def test_get_library_name_not_found(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(jack_server._lib, "find_library", func)
     with pytest.raises(RuntimeError, match="Couldn't find"):
         get_library_name()
+
+
+@pytest.fixture
+def opened(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    opened: List[str] = []
+
+    def cdll(name: str):
+        if name == "broken":
+            raise OSError
+        opened.append(name)
+        return name
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.delenv(_library_path_env, raising=False)
+    monkeypatch.setattr(jack_server._lib, "_cdll", None)
+    monkeypatch.setattr(jack_server._lib, "_library_path", None)
+    monkeypatch.setattr(jack_server._lib, "CDLL", cdll)
+    monkeypatch.setattr(jack_server._lib, "find_library", lambda _: "found")  # type: ignore
+    return opened
+
+
+def test_load_library_is_cached(opened: List[str]):
+    assert load_library() == "found"
+    assert load_library() == "found"
+    assert opened == ["found"]
+
+
+def test_load_library_path_override(opened: List[str]):
+    set_library_path("custom")
+    assert load_library() == "custom"
+
+
+def test_load_library_env_override(opened: List[str], monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(_library_path_env, "from_env")
+    assert load_library() == "from_env"
+
+
+def test_set_library_path_after_load(opened: List[str]):
+    load_library()
+    with pytest.raises(RuntimeError, match="already loaded"):
+        set_library_path("custom")
+
+
+def test_load_library_disk_cache(opened: List[str], monkeypatch: pytest.MonkeyPatch):
+    load_library()
+    monkeypatch.setattr(jack_server._lib, "_cdll", None)
+    monkeypatch.setattr(jack_server._lib, "find_library", lambda _: None)  # type: ignore
+    assert load_library() == "found"
+
+
+def test_load_library_stale_disk_cache(
+    opened: List[str], monkeypatch: pytest.MonkeyPatch
+):
+    jack_server._lib._write_cached_library_name("broken")
+    assert load_library() == "found"
+    assert jack_server._lib._read_cached_library_name() == "found"
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        jack_server._lib.not_existing_function
+
+
+@pytest.fixture
+def no_backend(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv(jack_server._lib._backend_env, raising=False)
+    monkeypatch.delenv(_library_path_env, raising=False)
+    monkeypatch.setattr(jack_server._lib, "_backend", None)
+    monkeypatch.setattr(jack_server._lib, "_library_path", None)
+
+
+@pytest.mark.usefixtures("no_backend")
+def test_default_backend(monkeypatch: pytest.MonkeyPatch):
+    # Compiled backend is used only when requested
+    monkeypatch.setattr(jack_server._lib, "cffi_available", lambda: True)
+    assert jack_server._lib.get_backend() == "ctypes"
+
+
+@pytest.mark.usefixtures("no_backend")
+def test_backend_env_cffi_fallback(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(jack_server._lib, "cffi_available", lambda: False)
+    monkeypatch.setenv(jack_server._lib._backend_env, "cffi")
+    with pytest.warns(UserWarning, match="falling back"):
+        assert jack_server._lib.get_backend() == "ctypes"
+
+
+def test_cffi_not_compiled():
+    # Extension isn't built in this checkout
+    if jack_server._lib.cffi_available():  # pragma: no cover
+        pytest.skip("cffi backend is compiled")
+    with pytest.raises(ValueError, match="not compiled"):
+        jack_server._lib.set_backend("cffi")
+
+
+def test_set_library_path_cffi(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(jack_server._lib, "_cdll", None)
+    monkeypatch.setattr(jack_server._lib, "_backend", "cffi")
+    with pytest.raises(RuntimeError, match="cffi"):
+        set_library_path("custom")
+
+
+def test_import_is_light():
+    code = (
+        "import sys, jack_server; "
+        + "print([m for m in ('asyncio', 'http.server', 'multiprocessing') "
+        + "if m in sys.modules])"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+    assert output.strip() == "[]"
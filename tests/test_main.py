@@ -0,0 +1,63 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import jack_server.__main__
+from jack_server import get_backend
+from jack_server.__main__ import main, notify
+
+
+def test_notify(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    path = str(tmp_path / "notify")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        sock.bind(path)
+        monkeypatch.setenv("NOTIFY_SOCKET", path)
+        notify("READY=1")
+        assert sock.recv(1024) == b"READY=1"
+
+
+def test_usage_errors():
+    assert main([]) == 2
+    assert main(["-n", "myserver"]) == 2
+    assert main(["--ready-file"]) == 2
+
+
+def test_library_not_found(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    def setup_signals():
+        raise RuntimeError("Couldn't find jackserver library")
+
+    monkeypatch.setattr(jack_server.__main__, "setup_signals", setup_signals)
+    assert main(["-n", "myserver", "-d", "dummy"]) == 1
+    assert capsys.readouterr().err == "error: Couldn't find jackserver library\n"
+
+
+def test_daemon(driver: str, tmp_path: Path):
+    ready_file = tmp_path / "ready"
+    # Daemon uses the same backend as tests, even if it was set in code
+    env = {**os.environ, "JACK_SERVER_BACKEND": get_backend()}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "jack_server", "--ready-file", str(ready_file)]
+        + ["-n", "daemon", "-d", driver, "--period", "1024"],
+        env=env,
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while not ready_file.exists():
+            assert process.poll() is None
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        assert ready_file.read_text().strip() == str(process.pid)
+
+        os.kill(process.pid, signal.SIGTERM)
+        assert process.wait(10) == 0
+        assert not ready_file.exists()
+    finally:
+        process.kill()
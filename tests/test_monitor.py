@@ -0,0 +1,66 @@
+import urllib.request
+from typing import Iterator, List
+
+import pytest
+
+from jack_server import Monitor, MonitorNotOpenedError, MonitorSample, Server
+from jack_server._monitor import _escape_label
+
+
+@pytest.fixture
+def monitor(server: Server) -> Iterator[Monitor]:
+    server.start()
+    with Monitor(server, interval=0.05, maxlen=3) as monitor:
+        yield monitor
+
+
+def test_sample(monitor: Monitor):
+    sample = monitor.sample()
+    assert sample.buffer_size == 1024
+    assert sample.sample_rate > 0
+    assert sample.latency == sample.buffer_size / sample.sample_rate
+    assert 0 <= sample.cpu_load <= 100
+    assert monitor.latest is sample
+
+
+def test_time_series_is_bounded(monitor: Monitor):
+    for _ in range(5):
+        monitor.sample()
+    assert len(monitor.samples) == 3
+
+
+def test_prometheus(monitor: Monitor):
+    host, port = monitor.serve(port=0)
+    with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+        body = response.read().decode()
+    assert "# TYPE jack_server_xruns_total counter" in body
+    assert 'jack_server_buffer_size_frames{server="' in body
+
+
+def test_escape_label():
+    assert _escape_label('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+
+
+def test_not_started(server: Server):
+    with pytest.raises(MonitorNotOpenedError):
+        Monitor(server).sample()
+
+
+def test_set_buffer_size(monitor: Monitor):
+    samples: List[MonitorSample] = []
+    monitor.add_listener(samples.append)
+    monitor.set_buffer_size(512)
+    assert monitor.sample().buffer_size == 512
+    assert samples
+    monitor.remove_listener(samples.append)
+
+
+def test_round_trip_latency(monitor: Monitor):
+    latency = monitor.get_round_trip_latency()
+    assert latency is not None
+    assert latency >= 2 * monitor.sample().buffer_size
+
+
+def test_round_trip_latency_not_started(server: Server):
+    with pytest.raises(MonitorNotOpenedError):
+        Monitor(server).get_round_trip_latency()
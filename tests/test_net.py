@@ -0,0 +1,91 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+from jack_server import (
+    NetStatus,
+    ParameterValueError,
+    Server,
+    disable_queued_logging,
+    enable_queued_logging,
+    get_backend,
+)
+from jack_server._output import _callbacks
+
+
+@pytest.mark.parametrize(
+    ("multicast_ip", "port"),
+    (("not-an-ip", 19000), ("127.0.0.1", 19000), ("225.3.19.154", 0)),
+)
+def test_net_params_validation(driver: str, multicast_ip: str, port: int):
+    with pytest.raises(ParameterValueError):
+        Server.net_master(driver=driver, multicast_ip=multicast_ip, port=port)
+
+
+def test_net_status():
+    status = NetStatus()
+    assert status.state == "stopped"
+    status.feed(20, "Waiting for a master...")
+    assert status.state == "waiting"
+    status.feed(20, "Initializing connection with master...")
+    assert status.state == "connecting"
+    status.feed(20, "NetDriver started in async mode without Master's transport sync.")
+    assert status.state == "connected"
+    status.feed(40, "Connection lost.")
+    assert status.state == "waiting"
+    assert status.connections == 0
+
+
+def test_net_master(driver: str):
+    server = Server.net_master(driver=driver)
+    assert server.internals["netmanager"] in server._internals_to_load
+    assert server.net_status
+
+
+def test_net_slave():
+    server = Server.net_slave(name="test_net_slave", latency=5, client_name="slave")
+    try:
+        assert server.driver.name == "net"
+        assert server.driver.params["latency"].value == 5
+        assert server.driver.params["client-name"].value == b"slave"
+        assert server.net_status
+        _callbacks["info"](b"Waiting for a master...")
+        assert server.net_status.state == "waiting"
+    finally:
+        server.close()
+    assert server.net_status is None
+
+
+_slave_code = """
+import time
+from jack_server import Server
+
+server = Server.net_slave(name="test_net_slave", port={port})
+server.start()
+time.sleep({duration})
+server.stop()
+"""
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Needs loopback multicast")
+@pytest.mark.skipif(get_backend() == "fake", reason="Needs real NetJACK")
+def test_net_loopback(driver: str):
+    port = 19123
+    enable_queued_logging()
+    server = Server.net_master(driver=driver, port=port)
+    server.start()
+
+    code = _slave_code.format(port=port, duration=3)
+    slave = subprocess.Popen([sys.executable, "-c", code])
+    try:
+        assert server.net_status
+        deadline = time.monotonic() + 10
+        while server.net_status.state != "connected":
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+    finally:
+        slave.wait()
+        server.stop()
+        disable_queued_logging()
@@ -1,8 +1,20 @@
+import logging
 from unittest.mock import Mock
 
+import pytest
 from _pytest.capture import CaptureFixture
 
-from jack_server import Server, set_error_function, set_info_function
+import jack_server._output
+from jack_server import (
+    Server,
+    add_output_listener,
+    disable_queued_logging,
+    enable_queued_logging,
+    remove_output_listener,
+    set_error_function,
+    set_info_function,
+)
+from jack_server._output import _callbacks, _LogQueue
 
 
 def test_set_output_functions_none(capsys: CaptureFixture[str], server: Server):
@@ -22,3 +34,99 @@ def test_set_output_functions_not_none(server: Server):
     server.start()
     out_mock.assert_called()
     err_mock.assert_called()
+
+
+def test_queued_logging(server: Server, caplog: pytest.LogCaptureFixture):
+    caplog.set_level(logging.INFO, logger="jack_server")
+    enable_queued_logging()
+    server.start()
+    disable_queued_logging()
+    assert caplog.records
+    assert all(r.name == "jack_server" for r in caplog.records)
+
+
+def test_queued_logging_restores_functions(server: Server):
+    callback = Mock()
+    set_error_function(callback)
+    enable_queued_logging()
+    disable_queued_logging()
+    try:
+        jack_server._output._callbacks["error"](b"error message")
+    finally:
+        set_error_function(None)
+    callback.assert_called_once_with("error message")
+
+
+def test_queued_logging_default_printing(
+    monkeypatch: pytest.MonkeyPatch, capsys: CaptureFixture[str]
+):
+    monkeypatch.setattr(jack_server._output, "_callbacks", {})
+    enable_queued_logging()
+    disable_queued_logging()
+    try:
+        jack_server._output._callbacks["info"](b"info message")
+        jack_server._output._callbacks["error"](b"error message")
+    finally:
+        set_info_function(None)
+        set_error_function(None)
+    captured = capsys.readouterr()
+    assert captured.out == "info message\n"
+    assert captured.err == "error message\n"
+
+
+def test_queued_logging_rate_limit(caplog: pytest.LogCaptureFixture):
+    caplog.set_level(logging.INFO, logger="jack_server")
+    queue = _LogQueue(logging.getLogger("jack_server"), 4, 2, 0.01)
+    for _ in range(10):
+        queue.put_error(b"JackEngine::XRun: client was not finished")
+    queue.start()
+    queue.stop()
+    assert [r.levelno for r in caplog.records] == [
+        logging.WARNING,
+        logging.WARNING,
+        logging.WARNING,
+    ]
+    assert "Suppressed 2 JACK messages, dropped 6" in caplog.records[-1].message
+
+
+def test_replaced_callbacks_are_released():
+    set_info_function(None)
+    first = _callbacks["info"]
+    set_info_function(None)
+    assert _callbacks["info"] is not first
+
+
+def test_output_listener_without_queue(
+    monkeypatch: pytest.MonkeyPatch, capsys: CaptureFixture[str]
+):
+    monkeypatch.setattr(jack_server._output, "_callbacks", {})
+    listener = Mock()
+    add_output_listener(listener)
+    try:
+        # Default output is kept
+        jack_server._output._callbacks["info"](b"info message")
+        jack_server._output._callbacks["error"](b"JackEngine::XRun")
+    finally:
+        remove_output_listener(listener)
+        set_info_function(None)
+        set_error_function(None)
+
+    listener.assert_any_call(logging.INFO, "info message")
+    listener.assert_any_call(logging.WARNING, "JackEngine::XRun")
+    captured = capsys.readouterr()
+    assert captured.out == "info message\n"
+    assert captured.err == "JackEngine::XRun\n"
+
+
+def test_output_listener_with_callback():
+    callback = Mock()
+    listener = Mock()
+    set_error_function(callback)
+    add_output_listener(listener)
+    try:
+        jack_server._output._callbacks["error"](b"error message")
+    finally:
+        remove_output_listener(listener)
+        set_error_function(None)
+    callback.assert_called_once_with("error message")
+    listener.assert_called_once_with(logging.ERROR, "error message")
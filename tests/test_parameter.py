@@ -0,0 +1,65 @@
+from unittest.mock import Mock
+
+import pytest
+
+from jack_server import ParameterValueError, Server
+from jack_server._parameter import apply_params
+
+
+def test_constraints_are_read(server: Server):
+    for param in server.params.values():
+        assert param.range is None or len(param.range) == 2
+        assert param.enum is None or isinstance(param.enum, dict)
+        assert isinstance(param.is_strict, bool)
+
+
+def test_validate_range(server: Server):
+    param = server.driver.params["period"]
+    param._constraints = ((16, 4096), None, False)
+    param.validate(16)
+    with pytest.raises(ParameterValueError, match="out of range"):
+        param.value = 8192
+    assert param.value == 1024
+
+
+def test_validate_strict_enum(server: Server):
+    param = server.driver.params["period"]
+    param._constraints = (None, {256: "", 512: ""}, True)
+    param.value = 512
+    with pytest.raises(ParameterValueError, match="is not one of"):
+        param.value = 1024
+
+
+def test_validate_not_strict_enum(server: Server):
+    param = server.driver.params["period"]
+    param._constraints = (None, {256: ""}, False)
+    param.value = 512
+
+
+def test_server_validate(server: Server):
+    server.driver.params["period"]._constraints = ((16, 512), None, False)
+    with pytest.raises(ParameterValueError, match="'period'"):
+        server.start()
+    assert not server._opened
+
+
+def test_rejected_by_jack(server: Server, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        "jack_server._parameter.lib.jackctl_parameter_set_value",
+        Mock(return_value=False),
+    )
+    with pytest.raises(ParameterValueError, match="JACK rejected"):
+        server.driver.period = 256
+
+
+def test_char_param(server: Server):
+    param = server.params["self-connect-mode"]
+    param.value = "A"
+    assert param.value == b"A"
+    # Read back as bytes, so neither str nor bytes is a change
+    assert apply_params(server.params, {"self-connect-mode": "A"}) == []
+    assert apply_params(server.params, {"self-connect-mode": b"A"}) == []
+    assert apply_params(server.params, {"self-connect-mode": "a"}) == [
+        "self-connect-mode"
+    ]
+    assert param.value == b"a"
@@ -0,0 +1,154 @@
+import logging
+import threading
+from typing import Iterator, List
+
+import pytest
+
+from jack_server import (
+    IsolatedServer,
+    JackServerError,
+    PoolClosedError,
+    ServerPool,
+    SessionNotFoundError,
+)
+
+
+@pytest.fixture
+def pool(driver: str) -> Iterator["ServerPool[IsolatedServer]"]:
+    def factory(name: str) -> IsolatedServer:
+        return IsolatedServer(driver=driver, name=name, period=1024, realtime=False)
+
+    with ServerPool(factory, size=1) as pool:
+        yield pool
+
+
+def test_acquire_release(pool: "ServerPool[IsolatedServer]"):
+    assert pool.ready == 1
+    server = pool.acquire("session")
+    assert server._started
+    assert pool.acquire("session") is server
+
+    pool.release("session")
+    assert not server.is_alive
+    assert "session" not in pool.sessions
+
+
+def test_acquire_exhausted(pool: "ServerPool[IsolatedServer]"):
+    first = pool.acquire("first")
+    second = pool.acquire("second")
+    assert first is not second
+    assert first.name != second.name
+
+
+def test_release_unknown(pool: "ServerPool[IsolatedServer]"):
+    with pytest.raises(SessionNotFoundError):
+        pool.release("unknown")
+
+
+def test_close(pool: "ServerPool[IsolatedServer]"):
+    server = pool.acquire("session")
+    pool.close()
+    assert not server.is_alive
+    assert not pool.sessions
+    assert pool.ready == 0
+
+
+def test_acquire_concurrent(pool: "ServerPool[IsolatedServer]"):
+    servers: List[IsolatedServer] = []
+
+    def acquire():
+        servers.append(pool.acquire("session"))
+
+    threads = [threading.Thread(target=acquire) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(servers) == 4
+    assert all(server is servers[0] for server in servers)
+    assert list(pool.sessions) == ["session"]
+
+
+def test_acquire_activate_failed(
+    pool: "ServerPool[IsolatedServer]", monkeypatch: pytest.MonkeyPatch
+):
+    def activate(self: IsolatedServer):
+        raise JackServerError("failed")
+
+    server = pool._ready[0]
+    monkeypatch.setattr(IsolatedServer, "activate", activate)
+    with pytest.raises(JackServerError, match="failed"):
+        pool.acquire("session")
+    assert not server.is_alive
+    assert not pool.sessions
+    assert not pool._pending
+
+
+def test_acquire_closed(pool: "ServerPool[IsolatedServer]"):
+    pool.close()
+    with pytest.raises(PoolClosedError):
+        pool.acquire("session")
+
+
+def test_refill_failed(driver: str, caplog: pytest.LogCaptureFixture):
+    created: List[str] = []
+
+    def factory(name: str) -> IsolatedServer:
+        if created:
+            raise JackServerError("no device")
+        created.append(name)
+        return IsolatedServer(driver=driver, name=name, period=1024, realtime=False)
+
+    with ServerPool(factory, size=1) as pool:
+        with caplog.at_level(logging.ERROR, logger="jack_server"):
+            pool.acquire("session")
+            assert pool._refill_thread
+            pool._refill_thread.join()
+    assert "couldn't be refilled" in caplog.text
+
+
+def test_acquire_prepare_failed(driver: str, monkeypatch: pytest.MonkeyPatch):
+    servers: List[IsolatedServer] = []
+
+    def factory(name: str) -> IsolatedServer:
+        servers.append(IsolatedServer(driver=driver, name=name, realtime=False))
+        return servers[-1]
+
+    def prepare(self: IsolatedServer, *, open: bool = True):
+        raise JackServerError("failed")
+
+    monkeypatch.setattr(IsolatedServer, "prepare", prepare)
+    with ServerPool(factory, size=0) as pool:
+        with pytest.raises(JackServerError, match="failed"):
+            pool.acquire("session")
+    assert not servers[0].is_alive
+
+
+def test_acquire_closed_while_activating(
+    pool: "ServerPool[IsolatedServer]", monkeypatch: pytest.MonkeyPatch
+):
+    server = pool._ready[0]
+    activate = IsolatedServer.activate
+
+    def close_and_activate(self: IsolatedServer):
+        threading.Thread(target=pool.close).start()
+        while not pool._closed:
+            pass
+        activate(self)
+
+    monkeypatch.setattr(IsolatedServer, "activate", close_and_activate)
+    with pytest.raises(PoolClosedError):
+        pool.acquire("session")
+    assert not server.is_alive
+
+
+def test_refill_running(pool: "ServerPool[IsolatedServer]"):
+    event = threading.Event()
+    thread = threading.Thread(target=event.wait)
+    thread.start()
+    pool._refill_thread = thread
+    pool._refill_in_background()
+    assert pool._refill_thread is thread
+    event.set()
+    thread.join()
@@ -0,0 +1,157 @@
+import ctypes
+import errno
+import os
+import sys
+import threading
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+
+import jack_server._realtime
+from jack_server import Server, get_backend
+from jack_server._realtime import (
+    _get_limit,
+    _mlockall,
+    _read_thread,
+    get_jack_thread_ids,
+    get_new_thread_ids,
+    get_task_ids,
+)
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="Linux only"
+)
+
+
+def test_python_threads_excluded():
+    before = get_task_ids()
+    event = threading.Event()
+    thread = threading.Thread(target=event.wait)
+    thread.start()
+    try:
+        assert thread.native_id in get_task_ids()
+        assert not get_new_thread_ids(before)
+    finally:
+        event.set()
+        thread.join()
+
+
+def test_only_server_threads(server: Server):
+    # Native threads started by something else are not JACK ones
+    server._threads = {os.getpid(), 2**30}
+    assert get_jack_thread_ids(server) == [os.getpid()]
+
+
+def test_read_thread():
+    thread = _read_thread(os.getpid())
+    assert thread.name
+    assert thread.cpus == frozenset(os.sched_getaffinity(0))
+
+
+def test_read_thread_gone():
+    thread = _read_thread(2**30)
+    assert thread == (2**30, "", "unknown", 0, None)
+
+
+def test_no_proc(monkeypatch: pytest.MonkeyPatch):
+    def listdir(path: str):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "listdir", listdir)
+    assert get_task_ids() == set()
+
+
+def test_get_limit(monkeypatch: pytest.MonkeyPatch):
+    import resource
+
+    assert _get_limit("RLIMIT_UNKNOWN") is None
+    monkeypatch.setattr(
+        resource, "getrlimit", lambda _: (resource.RLIM_INFINITY,) * 2  # type: ignore
+    )
+    assert _get_limit("RLIMIT_MEMLOCK") == -1
+
+
+class FakeLibc:
+    def __init__(self, result: int) -> None:
+        self.result = result
+
+    def mlockall(self, flags: int) -> int:
+        ctypes.set_errno(errno.ENOMEM)
+        return self.result
+
+
+@pytest.mark.parametrize(
+    ("result", "error"), ((0, None), (-1, os.strerror(errno.ENOMEM)))
+)
+def test_mlockall(monkeypatch: pytest.MonkeyPatch, result: int, error: Any):
+    monkeypatch.setattr(ctypes, "CDLL", lambda *args, **kwargs: FakeLibc(result))  # type: ignore
+    assert _mlockall() == error
+
+
+def test_realtime_priority(server: Server):
+    server.realtime_priority = 20
+    assert server.realtime_priority == 20
+    assert server.params["realtime-priority"].value == 20
+
+
+def test_tune_not_started(server: Server):
+    report = server.tune_realtime()
+    assert not report.ok
+    assert any("not started" in problem for problem in report.problems)
+
+
+@pytest.mark.skipif(get_backend() == "fake", reason="Fake backend has no threads")
+def test_tune_affinity(server: Server):
+    server.start()
+    cpu = min(os.sched_getaffinity(0))
+    report = server.tune_realtime(cpus=[cpu])
+    assert report.threads
+    for thread in report.threads:
+        assert thread.cpus == frozenset([cpu])
+
+
+def test_tune_not_linux(server: Server, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(sys, "platform", "darwin")
+    report = server.tune_realtime()
+    assert report.problems == ["Realtime tuning is supported only on Linux"]
+    assert not report.realtime
+
+
+def test_tune_problems(server: Server, monkeypatch: pytest.MonkeyPatch):
+    def setaffinity(tid: int, cpus: Any) -> None:
+        raise OSError(errno.EPERM, os.strerror(errno.EPERM))
+
+    monkeypatch.setattr(jack_server._realtime, "_get_limit", Mock(return_value=0))
+    monkeypatch.setattr(os, "geteuid", lambda: 1000)
+    monkeypatch.setattr(
+        jack_server._realtime, "get_jack_thread_ids", Mock(return_value=[1])
+    )
+    monkeypatch.setattr(os, "sched_setaffinity", setaffinity)
+    monkeypatch.setattr(jack_server._realtime, "_mlockall", lambda: "No memory")
+
+    report = server.tune_realtime(cpus=[0], mlock=True)
+    problems = "\n".join(report.problems)
+    assert "RLIMIT_RTPRIO is 0" in problems
+    assert "Couldn't pin thread 1: Operation not permitted" in problems
+    assert "mlockall failed: No memory" in problems
+    assert not report.locked
+    assert not report.ok
+    assert report.rtprio_limit == 0
+
+
+def test_tune_mlock(server: Server, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(jack_server._realtime, "_mlockall", lambda: None)
+    report = server.tune_realtime(mlock=True)
+    assert report.locked
+
+
+def test_tune_no_realtime_threads(server: Server, monkeypatch: pytest.MonkeyPatch):
+    # Started realtime server whose threads all run with default policy
+    server.realtime = True
+    monkeypatch.setattr(server, "_state", "started")
+    monkeypatch.setattr(
+        jack_server._realtime, "get_jack_thread_ids", Mock(return_value=[])
+    )
+    report = server.tune_realtime()
+    assert "No JACK thread got realtime scheduling policy" in report.problems
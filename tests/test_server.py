@@ -1,9 +1,13 @@
+import threading
+
 import pytest
 
 import jack_server._server
 from jack_server import (
     DriverNotFoundError,
+    DriverNotSwitchedError,
     Server,
+    ServerClosedError,
     ServerNotOpenedError,
     ServerNotStartedError,
 )
@@ -21,6 +25,59 @@ def test_start_stop(server: Server):
     assert not server._started
 
 
+def test_prepare_activate(server: Server):
+    server.prepare()
+    assert server._opened
+    assert not server._started
+    server.activate()
+    assert server._started
+
+
+def test_state(server: Server):
+    assert server.state == "created"
+    server.prepare(open=False)
+    assert server.state == "configured"
+    server.prepare()
+    assert server.state == "opened"
+    server.activate()
+    assert server.state == "started"
+    server.stop()
+    assert server.state == "configured"
+
+
+def test_close(driver: str):
+    with Server(driver=driver) as server:
+        server.start()
+    assert server.state == "closed"
+    assert not server._created
+    server.stop()
+    server.close()
+    with pytest.raises(ServerClosedError):
+        server.start()
+
+
+def test_concurrent_start_stop(server: Server):
+    def cycle():
+        for _ in range(5):
+            server.start()
+            server.stop()
+
+    threads = [threading.Thread(target=cycle) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert server.state == "configured"
+
+
+def test_prepare_without_open(server: Server):
+    server.prepare(open=False)
+    assert not server._opened
+    server.activate()
+    assert server._opened
+    assert server._started
+
+
 @pytest.mark.parametrize(
     ("name", "value", "param_value"),
     (
@@ -68,3 +125,51 @@ def test_server_not_started(server: Server, monkeypatch: pytest.MonkeyPatch):
 def test_driver_not_found(server: Server):
     with pytest.raises(DriverNotFoundError):
         server._get_driver_by_name("not_existing_driver")
+
+
+def test_snapshot_apply(server: Server):
+    snapshot = server.snapshot()
+    assert snapshot["server"]["sync"] is True
+    assert snapshot["driver"]["period"] == 1024
+
+    changed = server.apply(
+        {"server": {"sync": True, "realtime": True}, "driver": {"period": 512}}
+    )
+    assert changed == {"server": {"realtime": True}, "driver": {"period": 512}}
+    assert server.realtime is True
+    assert server.driver.period == 512
+    assert server.apply(server.snapshot()) == {"server": {}, "driver": {}}
+
+
+def test_apply_unknown_scope(server: Server):
+    with pytest.raises(KeyError, match="Unknown parameter scopes"):
+        server.apply({"client": {}})
+
+
+def test_reconfigure(server: Server):
+    server.start()
+    driver = server.driver
+    server.reconfigure(period=512)
+    assert server.driver is driver
+    assert server.driver.period == 512
+    assert server._started
+
+
+def test_switch_driver_not_opened(server: Server, driver: str):
+    server.switch_driver(driver, period=256)
+    assert server.driver.period == 256
+
+
+def test_switch_driver_failed(server: Server, monkeypatch: pytest.MonkeyPatch):
+    server.start()
+    monkeypatch.setattr(
+        jack_server._server.lib, "jackctl_server_switch_master", returns_false
+    )
+    with pytest.raises(DriverNotSwitchedError):
+        server.reconfigure(period=512)
+    assert server.driver.period == 1024
+
+
+def test_switch_driver_not_found(server: Server):
+    with pytest.raises(DriverNotFoundError):
+        server.switch_driver("not_existing_driver")
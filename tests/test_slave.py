@@ -0,0 +1,101 @@
+import pytest
+
+import jack_server._server
+from jack_server import (
+    Server,
+    ServerNotStartedError,
+    SlaveNotAddedError,
+    SlaveNotRemovedError,
+)
+from tests.test_server import returns_false
+
+
+@pytest.fixture
+def slave(server: Server) -> str:
+    if "loopback" not in server.drivers:  # pragma: no cover
+        pytest.skip("loopback driver is not available")
+    return "loopback"
+
+
+def test_add_remove_slave_before_start(server: Server, slave: str):
+    driver = server.add_slave(slave)
+    assert server.slaves == [driver]
+    server.start()
+    server.remove_slave(slave)
+    assert server.slaves == []
+    assert server._started
+
+
+def test_add_slave_running(server: Server, slave: str):
+    server.start()
+    server.add_slave(slave)
+    assert server._started
+    server.reconfigure_slave(slave)
+    assert server._started
+
+
+def test_add_slave_in_use(server: Server, driver: str, slave: str):
+    with pytest.raises(SlaveNotAddedError):
+        server.add_slave(driver)
+    server.add_slave(slave)
+    with pytest.raises(SlaveNotAddedError):
+        server.add_slave(slave)
+
+
+def test_remove_not_slave(server: Server, slave: str):
+    with pytest.raises(SlaveNotRemovedError):
+        server.remove_slave(slave)
+    with pytest.raises(SlaveNotAddedError):
+        server.reconfigure_slave(slave)
+
+
+def test_slave_not_added(server: Server, slave: str, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        jack_server._server.lib, "jackctl_server_add_slave", returns_false
+    )
+    server.add_slave(slave)
+    with pytest.raises(SlaveNotAddedError):
+        server.start()
+
+
+def test_engine_restarted_after_failure(
+    server: Server, slave: str, monkeypatch: pytest.MonkeyPatch
+):
+    server.start()
+    monkeypatch.setattr(
+        jack_server._server.lib, "jackctl_server_add_slave", returns_false
+    )
+    with pytest.raises(SlaveNotAddedError):
+        server.add_slave(slave)
+    assert server._started
+
+
+def test_engine_not_restarted_keeps_error(
+    server: Server, slave: str, monkeypatch: pytest.MonkeyPatch
+):
+    server.start()
+    monkeypatch.setattr(
+        jack_server._server.lib, "jackctl_server_add_slave", returns_false
+    )
+    monkeypatch.setattr(jack_server._server.lib, "jackctl_server_start", returns_false)
+    with pytest.raises(ServerNotStartedError) as exc_info:
+        server.add_slave(slave)
+    assert isinstance(exc_info.value.__cause__, SlaveNotAddedError)
+    assert not server._started
+
+
+def test_slave_tracked_when_restart_fails(
+    server: Server, slave: str, monkeypatch: pytest.MonkeyPatch
+):
+    server.start()
+    monkeypatch.setattr(jack_server._server.lib, "jackctl_server_start", returns_false)
+    with pytest.raises(ServerNotStartedError):
+        server.add_slave(slave)
+    # JACK has the slave attached, so it has to stay manageable
+    assert [d.name for d in server.slaves] == [slave]
+    with pytest.raises(SlaveNotAddedError):
+        server.add_slave(slave)
+    monkeypatch.undo()
+    server.start()
+    server.remove_slave(slave)
+    assert server.slaves == []
@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+from typing import Generator, List, Tuple
+
+from jack_server import (
+    Server,
+    ServerStats,
+    add_phase_hook,
+    add_timing_hook,
+    remove_phase_hook,
+    remove_timing_hook,
+)
+
+
+def test_server_stats(server: Server):
+    server.start()
+    server.stop()
+    assert set(server.stats.last) == {
+        "create",
+        "init_params",
+        "get_driver",
+        "open",
+        "start",
+        "stop",
+        "close",
+    }
+    assert server.stats.count["open"] == 1
+    assert all(v >= 0 for v in server.stats.total.values())
+
+
+def test_stats_record():
+    stats = ServerStats()
+    stats.record("open", 1)
+    stats.record("open", 2)
+    assert stats.last == {"open": 2}
+    assert stats.total == {"open": 3}
+    assert stats.count == {"open": 2}
+
+
+def test_hooks(driver: str):
+    timings: List[Tuple[str, float]] = []
+    phases: List[str] = []
+
+    def timing_hook(server: Server, phase: str, duration: float):
+        timings.append((phase, duration))
+
+    @contextmanager
+    def phase_hook(server: Server, phase: str) -> Generator[None, None, None]:
+        phases.append(phase)
+        yield
+
+    add_timing_hook(timing_hook)
+    add_phase_hook(phase_hook)
+    try:
+        server = Server(driver=driver)
+    finally:
+        remove_timing_hook(timing_hook)
+        remove_phase_hook(phase_hook)
+
+    assert [p for p, _ in timings] == phases == ["create", "init_params", "get_driver"]
+    server.stop()
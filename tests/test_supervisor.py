@@ -0,0 +1,66 @@
+import logging
+import time
+from typing import Callable
+
+import pytest
+
+import jack_server._server
+from jack_server import Server, Supervisor
+from jack_server._output import _callbacks
+from tests.test_server import returns_false
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_restart_on_notify(server: Server):
+    with Supervisor(server, interval=0.01) as supervisor:
+        supervisor.notify_failure("test")
+        wait_for(lambda: supervisor.restart_count == 1)
+        assert supervisor.last_recovery_time is not None
+        assert server._started
+    assert not server._started
+
+
+def test_restart_on_probe(server: Server):
+    healthy = [False]
+
+    def probe(server: Server):
+        result, healthy[0] = healthy[0], True
+        return result
+
+    with Supervisor(server, probe=probe, interval=0.01) as supervisor:
+        wait_for(lambda: supervisor.restart_count == 1)
+        assert supervisor.last_failure == "Probe failed"
+
+
+def test_restart_on_error_output(server: Server):
+    with Supervisor(server, interval=0.01) as supervisor:
+        supervisor._on_output(logging.INFO, "read error")
+        supervisor._on_output(logging.ERROR, "JackAudioDriver: Read error")
+        wait_for(lambda: supervisor.restart_count == 1)
+        assert supervisor.last_failure == "JackAudioDriver: Read error"
+
+
+def test_restart_backoff(server: Server, monkeypatch: pytest.MonkeyPatch):
+    with Supervisor(
+        server, interval=0.01, min_backoff=0.01, max_backoff=0.02
+    ) as supervisor:
+        with monkeypatch.context() as m:
+            m.setattr(jack_server._server.lib, "jackctl_server_open", returns_false)
+            supervisor.notify_failure("test")
+            time.sleep(0.1)
+            assert supervisor.restart_count == 0
+        wait_for(lambda: supervisor.restart_count == 1)
+
+
+def test_restart_on_jack_error(server: Server):
+    # Without queued logging, message goes through the thunk given to JACK
+    with Supervisor(server, interval=0.01) as supervisor:
+        _callbacks["error"](b"JackAudioDriver: Read error")
+        wait_for(lambda: supervisor.restart_count == 1)
+        assert supervisor.last_failure == "JackAudioDriver: Read error"
@@ -0,0 +1,115 @@
+import json
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from unittest.mock import Mock
+
+import pytest
+
+import jack_server.tune
+from jack_server import Monitor, Server, ServerNotStartedError
+from jack_server._parameter import ValueType
+from jack_server.tune import (
+    TrialResult,
+    get_latency,
+    iter_grid,
+    main,
+    measure_latency,
+    recommend,
+    run_trial,
+)
+
+
+def test_iter_grid():
+    assert list(iter_grid([48000], [256, 512], [None])) == [
+        {"rate": 48000, "period": 256},
+        {"rate": 48000, "period": 512},
+    ]
+    assert list(iter_grid([48000], [256], [2, 3]))[1] == {
+        "rate": 48000,
+        "period": 256,
+        "nperiods": 3,
+    }
+
+
+def _result(period: int, xruns: int = 0, started: bool = True):
+    params: Dict[str, ValueType] = {"rate": 48000, "period": period}
+    return TrialResult(
+        params, started, 0.1, 0.1, get_latency(params), period, 48000, xruns, None
+    )
+
+
+def test_recommend():
+    results = [_result(64, xruns=3), _result(128, started=False), _result(256)]
+    best = recommend(results)
+    assert best and best.params["period"] == 256
+    assert recommend([_result(64, xruns=1)]) is None
+
+
+def test_main(driver: str, tmp_path: Path):
+    output = tmp_path / "profile.json"
+    argv = ["-d", driver, "--rates", "48000", "--periods", "256,512"]
+    assert main([*argv, "--window", "0.1", "-o", str(output), "--json"]) == 0
+    profile = json.loads(output.read_text())
+    assert profile["driver"] == driver
+    assert profile["driver_params"]["period"] == 256
+
+
+def test_trial_counts_xruns(server: Server, monkeypatch: pytest.MonkeyPatch):
+    def set_error_function(callback: Optional[Callable[[str], None]]):
+        # JACK reports errors while the trial is running
+        if callback:
+            callback("JackEngine::XRun: client = system")
+            callback("Cannot open device")
+
+    monkeypatch.setattr(jack_server.tune, "set_error_function", set_error_function)
+    result = run_trial(server, {"rate": 48000, "period": 256}, 0)
+    assert result.started
+    assert result.buffer_size == 256
+    assert result.sample_rate == 48000
+    assert result.latency >= 2 * 256 / 48000
+    assert result.xruns == 1
+    assert not result.stable
+
+
+def test_trial_failed(server: Server, monkeypatch: pytest.MonkeyPatch):
+    def start():
+        raise ServerNotStartedError("Server couldn't be started")
+
+    monkeypatch.setattr(server, "start", start)
+    result = run_trial(server, {"rate": 48000, "period": 256}, 0)
+    assert not result.started
+    assert result.buffer_size is None
+    assert result.latency == get_latency({"rate": 48000, "period": 256})
+    assert result.error == "Server couldn't be started"
+
+
+def test_main_nothing_stable(
+    driver: str,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+):
+    results: List[TrialResult] = []
+
+    def run_trial(server: Server, params: Dict[str, ValueType], window: float):
+        started = len(results) == 0
+        result = TrialResult(params, started, 0.01, 0.01, 0.005, 256, 48000, 1, None)
+        results.append(result)
+        return result
+
+    monkeypatch.setattr(jack_server.tune, "run_trial", run_trial)
+    argv = ["-d", driver, "--rates", "48000", "--periods", "256,512"]
+    assert main(argv) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].endswith("open=10.0ms start=10.0ms xruns=1")
+    assert lines[1].endswith("failed")
+    assert lines[-1] == "recommended: None"
+
+
+def test_measure_latency_without_ports(server: Server, monkeypatch: pytest.MonkeyPatch):
+    server.start()
+    with Monitor(server) as monitor:
+        monkeypatch.setattr(monitor, "get_round_trip_latency", Mock(return_value=None))
+        sample = monitor.sample()
+        latency, buffer_size, sample_rate = measure_latency(monitor, {"nperiods": 2})
+    assert (buffer_size, sample_rate) == (sample.buffer_size, sample.sample_rate)
+    assert latency == 3 * buffer_size / sample_rate